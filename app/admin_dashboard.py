@@ -122,7 +122,7 @@ def get_dashboard_html(posts_data: list, stats: dict, settings, current_status:
                 </details>
             </div>
             <div class="post-actions">
-                <button onclick="regenerateVariants({post['id']})" class="btn btn-primary btn-sm">🔄 Regenerate AI</button>
+                <button onclick="regenerateVariants({post['id']}, this)" class="btn btn-primary btn-sm">🔄 Regenerate AI</button>
                 <button onclick="rejectPost({post['id']})" class="btn btn-danger btn-sm">❌ Reject All</button>
                 <button onclick="deletePost({post['id']})" class="btn btn-danger btn-sm">🗑️ Delete</button>
             </div>
@@ -621,10 +621,11 @@ def get_dashboard_html(posts_data: list, stats: dict, settings, current_status:
                 }}
             }}
             
-            async function regenerateVariants(postId) {{
+            async function regenerateVariants(postId, button) {{
                 if (!confirm('Regenerate AI variants for this post? This will create 3 new variants.')) return;
                 
                 document.body.style.cursor = 'wait';
+                button.disabled = true;
                 
                 try {{
                     const response = await fetch(`/admin/posts/${{postId}}/regenerate`, {{
@@ -632,6 +633,34 @@ def get_dashboard_html(posts_data: list, stats: dict, settings, current_status:
                     }});
                     
                     if (response.ok) {{
+                        // NDJSON: one line per saved variant, then a summary line
+                        const reader = response.body.getReader();
+                        const decoder = new TextDecoder();
+                        let buffer = '';
+                        let outcome = null;
+                        
+                        while (true) {{
+                            const {{ done, value }} = await reader.read();
+                            if (done) break;
+                            
+                            buffer += decoder.decode(value, {{ stream: true }});
+                            const lines = buffer.split('\\n');
+                            buffer = lines.pop();
+                            
+                            for (const line of lines) {{
+                                if (!line.trim()) continue;
+                                const update = JSON.parse(line);
+                                if (update.variant_number) {{
+                                    button.textContent = `🔄 ${{update.variant_number}}/3 variants saved...`;
+                                }} else {{
+                                    outcome = update;
+                                }}
+                            }}
+                        }}
+                        
+                        if (outcome && !outcome.success) {{
+                            alert('❌ Error: ' + (outcome.detail || 'Failed to regenerate'));
+                        }}
                         window.location.reload();
                     }} else {{
                         const error = await response.json();
@@ -641,6 +670,7 @@ def get_dashboard_html(posts_data: list, stats: dict, settings, current_status:
                     alert('❌ Network error: ' + err.message);
                 }} finally {{
                     document.body.style.cursor = 'default';
+                    button.disabled = false;
                 }}
             }}
             
@@ -895,7 +925,8 @@ def get_dashboard_html(posts_data: list, stats: dict, settings, current_status:
                         // Update waiters
                         const waitersEl = document.getElementById('status-waiters');
                         if (status.waiters > 0) {{
-                            waitersEl.textContent = `• ${{status.waiters}} operation(s) waiting`;
+                            const next = status.queue[0];
+                            waitersEl.textContent = `• ${{status.waiters}} operation(s) waiting (next: ${{next.operation}}, ~${{Math.ceil(next.expected_wait_seconds / 60)}}m)`;
                             waitersEl.style.display = 'inline';
                         }} else {{
                             waitersEl.style.display = 'none';
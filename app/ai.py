@@ -1,14 +1,212 @@
 """AI service for generating LinkedIn post variants using GitHub Models."""
+import json
 import logging
-from typing import List, Optional
-import httpx
+import time
+from contextlib import aclosing
+from typing import TYPE_CHECKING, AsyncIterator, List, Optional
 from app.config import get_settings
+from app.http_clients import get_http_client
+from app.ai_cache import get_generation_cache, generation_cache_key
 from app.logging_config import log_operation_start, log_operation_success, log_operation_error, log_api_call
 
+if TYPE_CHECKING:
+    from app.ai_router import AIRouter
+
 logger = logging.getLogger(__name__)
 
+# Completion budget for one post's variants; packed requests scale it per post
+MAX_TOKENS_PER_POST = 2000
+MAX_BATCH_TOKENS = 16000
+
+# Streamed generations stop this long after the first chunk and keep whatever variants completed
+STREAM_TIMEOUT_SECONDS = 60.0
+
+VARIANT_MARKER = "---VARIANT---"
 
-class AIService:
+
+class GeneratedVariant(str):
+    """
+    A generated post variant that remembers where it came from.
+    
+    Behaves as a plain string. model is the model that wrote it and cached
+    is True when it was served from the generation cache instead of the API.
+    """
+    
+    model: Optional[str]
+    cached: bool
+    
+    def __new__(cls, text: str, model: Optional[str] = None, cached: bool = False):
+        variant = super().__new__(cls, text)
+        variant.model = model
+        variant.cached = cached
+        return variant
+
+
+def variant_model(variant: str) -> str:
+    """Model that generated a variant, falling back to the configured AI_MODEL."""
+    return getattr(variant, "model", None) or get_settings().ai_model
+
+
+class VariantGenerationMixin:
+    """
+    Streaming and packed variant generation shared by the AI providers.
+    
+    Providers supply the model name, _create_prompt/_parse_variants and the
+    two transport hooks: _chat_completion(prompt, max_tokens, json_output)
+    and _stream_chat_completion(prompt), which yields content deltas.
+    """
+    
+    model: str
+    
+    # Appended to operation names in the logs (e.g. "_copilot")
+    log_suffix = ""
+    
+    async def stream_variants(
+        self,
+        original_content: str,
+        author_name: str,
+        num_variants: int = 3,
+        relationship: Optional[str] = None,
+        custom_context: Optional[str] = None,
+        bypass_cache: bool = False
+    ) -> AsyncIterator[str]:
+        """
+        Generate post variants, yielding each one as soon as it is complete.
+        
+        The completion is streamed and split on ---VARIANT--- markers as
+        tokens arrive. If the stream fails after at least one variant was
+        yielded, the error is logged and the generator just ends, so callers
+        keep the partial output.
+        
+        Args:
+            Same as generate_variants
+        
+        Yields:
+            Cleaned post variants, in order
+        """
+        prompt = self._create_prompt(original_content, author_name, num_variants, relationship, custom_context)
+        
+        # Identical prompts (crash re-runs, cross-posted content) reuse the stored completion
+        cache = get_generation_cache()
+        cache_key = generation_cache_key(self.model, prompt)
+        if cache and not bypass_cache:
+            cached_variants = cache.get(cache_key)
+            if cached_variants:
+                logger.info(f"🗃️  Using cached variants ({len(cached_variants)})")
+                for variant in cached_variants:
+                    yield GeneratedVariant(variant, self.model, cached=True)
+                return
+        
+        variants: List[str] = []
+        parser = VariantStreamParser()
+        # Starts at the first chunk: rate-limit waits before the response don't count
+        deadline = None
+        
+        try:
+            # aclosing() releases the connection as soon as we stop reading
+            async with aclosing(self._stream_chat_completion(prompt)) as chunks:
+                async for text in chunks:
+                    if deadline is None:
+                        deadline = time.monotonic() + STREAM_TIMEOUT_SECONDS
+                    
+                    for raw_variant in parser.feed(text):
+                        for variant in self._parse_variants(raw_variant, 1):
+                            variant = GeneratedVariant(variant, self.model)
+                            variants.append(variant)
+                            yield variant
+                    
+                    if len(variants) >= num_variants:
+                        break
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Generation exceeded {STREAM_TIMEOUT_SECONDS:.0f}s")
+                else:
+                    # The text after the last marker is only complete once the stream ends
+                    for variant in self._parse_variants(parser.finish(), 1):
+                        variant = GeneratedVariant(variant, self.model)
+                        variants.append(variant)
+                        yield variant
+                        
+        except Exception as e:
+            if not variants:
+                raise
+            logger.warning(f"⚠️  Stream ended after {len(variants)} variants ({e}), keeping partial output")
+            return
+        
+        if cache and len(variants) == num_variants:
+            cache.put(cache_key, self.model, variants)
+    
+    async def generate_variants_multi(self, requests: list) -> List[Optional[List[str]]]:
+        """
+        Generate variants for several posts in a single chat completion.
+        
+        Each post's regular prompt is packed into one request that asks for
+        structured JSON output, and the answer is fanned back out per post.
+        Cached posts are answered from the generation cache and left out of
+        the request.
+        
+        Args:
+            requests: GenerationRequest objects (see app.ai_batch)
+        
+        Returns:
+            Variants per request in request order, or None where the response
+            had no usable entry for that post
+        """
+        operation = f"generate_variants_multi{self.log_suffix}"
+        log_operation_start(logger, operation, posts=len(requests))
+        
+        try:
+            cache = get_generation_cache()
+            results: List[Optional[List[str]]] = [None] * len(requests)
+            pending = []
+            
+            for i, request in enumerate(requests):
+                prompt = self._create_prompt(
+                    request.original_content,
+                    request.author_name,
+                    request.num_variants,
+                    request.relationship,
+                    request.custom_context
+                )
+                cache_key = generation_cache_key(self.model, prompt)
+                if cache and not request.bypass_cache:
+                    cached_variants = cache.get(cache_key)
+                    if cached_variants:
+                        results[i] = [GeneratedVariant(v, self.model, cached=True) for v in cached_variants]
+                if results[i] is None:
+                    pending.append((i, prompt, cache_key))
+            
+            if pending:
+                content = await self._chat_completion(
+                    create_batch_prompt([prompt for _, prompt, _ in pending]),
+                    max_tokens=min(MAX_TOKENS_PER_POST * len(pending), MAX_BATCH_TOKENS),
+                    json_output=True
+                )
+                parsed = parse_batch_variants(content, [requests[i].num_variants for i, _, _ in pending])
+                
+                for (i, _, cache_key), variants in zip(pending, parsed):
+                    if variants:
+                        variants = [GeneratedVariant(v, self.model) for v in variants]
+                    results[i] = variants
+                    if cache and variants and len(variants) == requests[i].num_variants:
+                        cache.put(cache_key, self.model, variants)
+            
+            log_operation_success(
+                logger,
+                operation,
+                posts=len(requests),
+                requested=len(pending),
+                answered=sum(1 for variants in results if variants),
+                model=self.model
+            )
+            
+            return results
+            
+        except Exception as e:
+            log_operation_error(logger, operation, e)
+            raise
+
+
+class AIService(VariantGenerationMixin):
     """
     Service for generating LinkedIn post variants using GitHub Models API.
     
@@ -40,7 +238,8 @@ class AIService:
         author_name: str,
         num_variants: int = 3,
         relationship: Optional[str] = None,
-        custom_context: Optional[str] = None
+        custom_context: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> List[str]:
         """
         Generate alternative versions of a LinkedIn post.
@@ -49,6 +248,9 @@ class AIService:
             original_content: The original post content
             author_name: Name of the original post author
             num_variants: Number of variants to generate (default: 3)
+            relationship: Type of relationship with the author (e.g., "mentor", "colleague")
+            custom_context: Additional context about the author
+            bypass_cache: Skip the generation cache lookup (fresh output, result still cached)
         
         Returns:
             List of generated post variants
@@ -65,73 +267,125 @@ class AIService:
         )
         
         try:
-            prompt = self._create_prompt(original_content, author_name, num_variants, relationship, custom_context)
+            variants = [
+                variant async for variant in self.stream_variants(
+                    original_content, author_name, num_variants, relationship, custom_context, bypass_cache
+                )
+            ]
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
+            if len(variants) != num_variants:
+                logger.warning(
+                    f"⚠️  Expected {num_variants} variants, got {len(variants)}. "
+                    "Using what we have."
+                )
             
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert LinkedIn content creator who specializes in creating engaging, professional posts."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.8,
-                "max_tokens": 2000,
-                "top_p": 0.9
-            }
+            log_operation_success(
+                logger,
+                "generate_variants",
+                variants_count=len(variants),
+                model=self.model
+            )
+            
+            return variants
             
-            async with httpx.AsyncClient() as client:
-                log_api_call(logger, "POST", self.api_url, "GitHub Models API")
-                
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
-                
-                logger.info(f"🌐 API POST {self.api_url} → {response.status_code} ")
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Extract the generated content
-                if "choices" not in result or len(result["choices"]) == 0:
-                    raise ValueError("No choices in API response")
-                
-                content = result["choices"][0]["message"]["content"]
-                
-                # Parse the variants from the response
-                variants = self._parse_variants(content, num_variants)
-                
-                if len(variants) != num_variants:
-                    logger.warning(
-                        f"⚠️  Expected {num_variants} variants, got {len(variants)}. "
-                        "Using what we have."
-                    )
-                
-                log_operation_success(
-                    logger,
-                    "generate_variants",
-                    variants_count=len(variants),
-                    model=self.model
-                )
-                
-                return variants
-                
         except Exception as e:
             log_operation_error(logger, "generate_variants", e)
             raise
     
+    def _headers(self) -> dict:
+        """HTTP headers for GitHub Models requests."""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {self.api_key}"
+        }
+    
+    def _build_payload(self, prompt: str, max_tokens: int, stream: bool = False, json_output: bool = False) -> dict:
+        """Chat completion request body."""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert LinkedIn content creator who specializes in creating engaging, professional posts."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.8,
+            "max_tokens": max_tokens,
+            "top_p": 0.9,
+            "stream": stream
+        }
+        if json_output:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+    
+    async def _chat_completion(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_POST, json_output: bool = False) -> str:
+        """
+        Send one chat completion request and return the message content.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token limit
+            json_output: Ask the model for a JSON object response
+        
+        Returns:
+            Raw content of the first choice
+        """
+        client = get_http_client("github_models")
+        log_api_call(logger, "POST", self.api_url, "GitHub Models API")
+        
+        response = await client.post(
+            self.api_url,
+            headers=self._headers(),
+            json=self._build_payload(prompt, max_tokens, json_output=json_output),
+            timeout=120.0 if json_output else 60.0
+        )
+        
+        logger.info(f"🌐 API POST {self.api_url} → {response.status_code} ")
+        response.raise_for_status()
+        
+        result = response.json()
+        
+        # Extract the generated content
+        if "choices" not in result or len(result["choices"]) == 0:
+            raise ValueError("No choices in API response")
+        
+        return result["choices"][0]["message"]["content"]
+    
+    async def _stream_chat_completion(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_POST) -> AsyncIterator[str]:
+        """
+        Send a streaming chat completion request.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token limit
+        
+        Yields:
+            Content deltas as they arrive
+        """
+        client = get_http_client("github_models")
+        log_api_call(logger, "POST", self.api_url, "GitHub Models API (stream)")
+        
+        async with client.stream(
+            "POST",
+            self.api_url,
+            headers=self._headers(),
+            json=self._build_payload(prompt, max_tokens, stream=True),
+            timeout=60.0
+        ) as response:
+            logger.info(f"🌐 API POST {self.api_url} → {response.status_code} (stream)")
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            
+            async for line in response.aiter_lines():
+                content = parse_stream_line(line)
+                if content:
+                    yield content
+    
     def _create_prompt(self, original_content: str, author_name: str, num_variants: int, relationship: Optional[str] = None, custom_context: Optional[str] = None) -> str:
         """
         Create the prompt for generating post variants.
@@ -216,7 +470,7 @@ Now generate the {num_variants} variants:"""
             List of parsed variants
         """
         # Split by the variant marker
-        variants = content.split("---VARIANT---")
+        variants = content.split(VARIANT_MARKER)
         
         # Clean up each variant
         cleaned_variants = []
@@ -239,24 +493,124 @@ Now generate the {num_variants} variants:"""
         return cleaned_variants[:expected_count]  # Ensure we don't return too many
 
 
-def get_ai_service() -> AIService:
+class VariantStreamParser:
+    """Split streamed completion text into variants as ---VARIANT--- markers arrive."""
+    
+    def __init__(self):
+        self._buffer = ""
+    
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text; return the raw variants completed by it."""
+        self._buffer += text
+        *completed, self._buffer = self._buffer.split(VARIANT_MARKER)
+        return completed
+    
+    def finish(self) -> str:
+        """Return the text after the last marker (the final variant)."""
+        tail, self._buffer = self._buffer, ""
+        return tail
+
+
+def parse_stream_line(line: str) -> Optional[str]:
     """
-    Get a configured AI service instance.
+    Extract the content delta from one server-sent event line.
     
-    Tries to use GitHub Copilot first (higher rate limits), falls back to GitHub Models.
+    Args:
+        line: A line of an OpenAI-compatible streaming response
+    
+    Returns:
+        The delta text, or None for keep-alives, role-only deltas and [DONE]
+    """
+    if not line.startswith("data:"):
+        return None
+    
+    data = line[len("data:"):].strip()
+    if not data or data == "[DONE]":
+        return None
+    
+    choices = json.loads(data).get("choices") or []
+    if not choices:
+        return None
+    return (choices[0].get("delta") or {}).get("content")
+
+
+def create_batch_prompt(post_prompts: List[str]) -> str:
     """
-    # Try GitHub Copilot first if configured
+    Pack several single-post prompts into one JSON-output prompt.
+    
+    Each task keeps its own full instructions; only the output format is
+    replaced, so packed and single-post generations follow the same rules.
+    
+    Args:
+        post_prompts: Prompts from _create_prompt, one per post
+    
+    Returns:
+        The combined prompt
+    """
+    tasks = "\n\n".join(
+        f"=== TASK {i} ===\n{prompt}\n=== END TASK {i} ==="
+        for i, prompt in enumerate(post_prompts, 1)
+    )
+    
+    return f"""Complete the following {len(post_prompts)} independent tasks. Each task is about a different LinkedIn post. Follow each task's instructions on their own - never mix content between tasks.
+
+{tasks}
+
+OUTPUT FORMAT (this replaces the output format given inside the tasks):
+Return a single JSON object and nothing else:
+{{"posts": [{{"task": 1, "variants": ["first variant text", "second variant text"]}}, {{"task": 2, "variants": ["..."]}}]}}
+- Exactly one entry per task, in task order
+- "variants" contains just the post texts the task asked for - no ---VARIANT--- markers, labels or commentary"""
+
+
+def parse_batch_variants(content: str, expected_counts: List[int]) -> List[Optional[List[str]]]:
+    """
+    Fan a packed JSON response back out per post.
+    
+    Args:
+        content: The raw AI response content
+        expected_counts: Expected number of variants per task, in task order
+    
+    Returns:
+        Variants per task, or None for tasks missing from the response
+    
+    Raises:
+        ValueError: If the response is not the expected JSON object
+    """
+    content = content.strip()
+    if content.startswith("```"):
+        # Strip a markdown code fence around the JSON
+        content = content.split("\n", 1)[-1].rsplit("```", 1)[0]
+    
     try:
-        from app.ai_copilot import get_copilot_ai_service
-        copilot_service = get_copilot_ai_service()
-        if copilot_service:
-            logger.info("✅ Using GitHub Copilot AI service")
-            return copilot_service
-    except ImportError:
-        pass
-    except Exception as e:
-        logger.warning(f"⚠️  Could not load Copilot service, using GitHub Models: {e}")
-    
-    # Fall back to GitHub Models
-    logger.info("✅ Using GitHub Models AI service")
-    return AIService()
+        entries = json.loads(content)["posts"]
+    except (json.JSONDecodeError, KeyError, TypeError) as e:
+        raise ValueError(f"Invalid batch response: {e}")
+    
+    results: List[Optional[List[str]]] = [None] * len(expected_counts)
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("variants"), list):
+            continue
+        
+        # Prefer the task number the model echoed back, fall back to position
+        task = entry.get("task")
+        index = task - 1 if isinstance(task, int) else position
+        if not 0 <= index < len(expected_counts) or results[index] is not None:
+            continue
+        
+        variants = [v.strip() for v in entry["variants"] if isinstance(v, str) and v.strip()]
+        results[index] = variants[:expected_counts[index]] or None
+    
+    return results
+
+
+def get_ai_service() -> "AIRouter":
+    """
+    Get the AI service used for variant generation.
+    
+    Returns the shared AIRouter, which sends each request to the healthiest of
+    GitHub Copilot (higher rate limits, preferred until latency data exists)
+    and GitHub Models, failing over between them.
+    """
+    from app.ai_router import get_ai_router
+    return get_ai_router()
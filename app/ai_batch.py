@@ -0,0 +1,246 @@
+"""Concurrent AI variant generation under a rate-aware adaptive semaphore."""
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Awaitable, Callable, List, Optional, TypeVar, Union
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Consecutive successes needed before allowing one more concurrent request
+SUCCESSES_PER_INCREASE = 5
+
+# Backoff when a 429 carries no Retry-After header
+DEFAULT_RATE_LIMIT_BACKOFF_SECONDS = 5.0
+
+
+class AdaptiveSemaphore:
+    """
+    Semaphore whose limit shrinks on rate limiting and grows on sustained success.
+    
+    AIMD: a 429 halves the limit (never below min_limit); every
+    SUCCESSES_PER_INCREASE consecutive successes raise it by one (never above
+    max_limit). In-flight requests above a freshly lowered limit finish
+    normally - new ones just wait until the count drops.
+    """
+    
+    def __init__(self, initial_limit: int, min_limit: int = 1, max_limit: Optional[int] = None):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit or initial_limit)
+        self.limit = min(max(initial_limit, self.min_limit), self.max_limit)
+        self.active = 0
+        self._successes = 0
+        self._condition = asyncio.Condition()
+    
+    async def acquire(self) -> None:
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.active < self.limit)
+            self.active += 1
+    
+    async def release(self) -> None:
+        async with self._condition:
+            self.active -= 1
+            self._condition.notify_all()
+    
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.release()
+    
+    async def record_success(self) -> None:
+        """Count a success; widen the limit after a streak."""
+        async with self._condition:
+            self._successes += 1
+            if self._successes >= SUCCESSES_PER_INCREASE and self.limit < self.max_limit:
+                self.limit += 1
+                self._successes = 0
+                logger.info(f"🚦 AI concurrency raised to {self.limit}")
+                self._condition.notify_all()
+    
+    async def record_rate_limited(self) -> None:
+        """Halve the limit after a 429."""
+        async with self._condition:
+            self._successes = 0
+            new_limit = max(self.min_limit, self.limit // 2)
+            if new_limit != self.limit:
+                logger.warning(f"🚦 AI rate limited - concurrency lowered {self.limit} → {new_limit}")
+                self.limit = new_limit
+    
+    def get_status_dict(self) -> dict:
+        """Current limit and usage for status endpoints."""
+        return {
+            "limit": self.limit,
+            "active": self.active,
+            "min_limit": self.min_limit,
+            "max_limit": self.max_limit,
+        }
+
+
+@dataclass
+class GenerationRequest:
+    """Arguments for one generate_variants call in a batch."""
+    original_content: str
+    author_name: str
+    num_variants: int = 3
+    relationship: Optional[str] = None
+    custom_context: Optional[str] = None
+    bypass_cache: bool = False
+
+
+def _retry_after_seconds(error: httpx.HTTPStatusError) -> float:
+    """Seconds to wait from a 429's Retry-After header (falls back to a fixed backoff)."""
+    retry_after = error.response.headers.get("retry-after")
+    try:
+        return max(0.0, float(retry_after))
+    except (TypeError, ValueError):
+        return DEFAULT_RATE_LIMIT_BACKOFF_SECONDS
+
+
+async def _run_limited(call: Callable[[], Awaitable[T]]) -> T:
+    """
+    Run one AI request under the shared adaptive semaphore.
+    
+    Retries 429 responses (up to ai_rate_limit_retries) after the server's
+    Retry-After delay, shrinking concurrency each time.
+    
+    Args:
+        call: Zero-argument coroutine factory making the request
+    
+    Returns:
+        Whatever the request returned
+    """
+    settings = get_settings()
+    semaphore = get_ai_semaphore()
+    
+    for attempt in range(settings.ai_rate_limit_retries + 1):
+        try:
+            async with semaphore:
+                result = await call()
+            await semaphore.record_success()
+            return result
+            
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code != 429 or attempt >= settings.ai_rate_limit_retries:
+                raise
+            
+            await semaphore.record_rate_limited()
+            delay = _retry_after_seconds(e)
+            logger.warning(f"⏳ AI rate limited, retrying in {delay:.1f}s (attempt {attempt + 1})")
+            await asyncio.sleep(delay)
+
+
+async def generate_variants_limited(ai_service, request: GenerationRequest) -> List[str]:
+    """
+    Run one generate_variants call under the shared adaptive semaphore.
+    
+    Args:
+        ai_service: AIService or GitHubCopilotAIService
+        request: Generation arguments
+    
+    Returns:
+        List of generated variants
+    """
+    return await _run_limited(lambda: ai_service.generate_variants(
+        original_content=request.original_content,
+        author_name=request.author_name,
+        num_variants=request.num_variants,
+        relationship=request.relationship,
+        custom_context=request.custom_context,
+        bypass_cache=request.bypass_cache
+    ))
+
+
+async def _generate_packed(
+    ai_service,
+    requests: List[GenerationRequest]
+) -> List[Union[List[str], Exception]]:
+    """
+    Generate variants for a chunk of posts with one packed request.
+    
+    Posts the packed response didn't fully answer are retried one by one,
+    so a single malformed entry doesn't fail the whole chunk.
+    """
+    if len(requests) == 1:
+        return await asyncio.gather(generate_variants_limited(ai_service, requests[0]), return_exceptions=True)
+    
+    try:
+        packed = await _run_limited(lambda: ai_service.generate_variants_multi(requests))
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code == 429:
+            # Still rate limited after retries - one request per post would only make it worse
+            return [e] * len(requests)
+        logger.warning(f"⚠️  Packed generation for {len(requests)} posts failed ({e}), generating individually")
+        packed = [None] * len(requests)
+    except Exception as e:
+        logger.warning(f"⚠️  Packed generation for {len(requests)} posts failed ({e}), generating individually")
+        packed = [None] * len(requests)
+    
+    incomplete = [
+        i for i, (request, variants) in enumerate(zip(requests, packed))
+        if not variants or len(variants) != request.num_variants
+    ]
+    if incomplete:
+        logger.info(f"🔁 Packed response incomplete for {len(incomplete)}/{len(requests)} posts, generating individually")
+        retried = await asyncio.gather(
+            *(generate_variants_limited(ai_service, requests[i]) for i in incomplete),
+            return_exceptions=True
+        )
+        for i, result in zip(incomplete, retried):
+            packed[i] = result
+    
+    return packed
+
+
+async def generate_variants_batch(
+    ai_service,
+    requests: List[GenerationRequest]
+) -> List[Union[List[str], Exception]]:
+    """
+    Generate variants for many posts concurrently.
+    
+    Posts are packed ai_batch_size to a request (GitHub Models limits
+    requests per minute long before tokens), and the packed requests run
+    under the shared adaptive semaphore, so a batch started alongside the
+    scrape pipeline doesn't double the request rate.
+    
+    Args:
+        ai_service: AIService or GitHubCopilotAIService
+        requests: One GenerationRequest per post
+    
+    Returns:
+        Results in request order - a list of variants, or the exception raised
+    """
+    batch_size = max(1, get_settings().ai_batch_size)
+    chunks = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+    
+    logger.info(
+        f"🤖 Generating variants for {len(requests)} posts in {len(chunks)} requests "
+        f"(concurrency {get_ai_semaphore().limit})"
+    )
+    
+    chunk_results = await asyncio.gather(*(_generate_packed(ai_service, chunk) for chunk in chunks))
+    return [result for results in chunk_results for result in results]
+
+
+# Global singleton instance
+_ai_semaphore: Optional[AdaptiveSemaphore] = None
+
+
+def get_ai_semaphore() -> AdaptiveSemaphore:
+    """Get the global AI concurrency semaphore."""
+    global _ai_semaphore
+    if _ai_semaphore is None:
+        settings = get_settings()
+        _ai_semaphore = AdaptiveSemaphore(
+            initial_limit=settings.ai_max_concurrency,
+            min_limit=settings.ai_min_concurrency,
+            max_limit=settings.ai_max_concurrency
+        )
+    return _ai_semaphore
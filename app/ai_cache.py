@@ -0,0 +1,160 @@
+"""Persistent content-addressed cache for AI variant generations."""
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stored next to the main SQLite database (see app/database.py)
+DEFAULT_CACHE_PATH = Path("./data/ai_generation_cache.db")
+
+
+def generation_cache_key(model: str, prompt: str) -> str:
+    """
+    Hash everything that determines a completion.
+    
+    The rendered prompt already embeds the template, original content,
+    relationship, custom context and variant count, so editing the prompt
+    template invalidates old entries without a separate version number.
+    
+    Args:
+        model: Model name
+        prompt: Fully rendered user prompt
+    
+    Returns:
+        64-character hex digest
+    """
+    material = json.dumps({"model": model, "prompt": prompt}, sort_keys=True)
+    return hashlib.sha256(material.encode('utf-8')).hexdigest()
+
+
+class GenerationCache:
+    """
+    SQLite-backed cache of generated variants, evicted by TTL and LRU.
+    
+    Entries older than ttl_seconds are ignored and purged; when the cache
+    grows past max_entries the least recently used rows are dropped.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        ttl_seconds: float = 30 * 24 * 3600,
+        max_entries: int = 5000,
+    ):
+        self.path = Path(path) if path else DEFAULT_CACHE_PATH
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS generations (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                variants TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_generations_last_used
+                ON generations (last_used_at);
+        """)
+        self._conn.commit()
+        self.purge_expired()
+        
+        logger.info(f"🗃️  AI generation cache ready: {self.path} ({self.count()} entries)")
+    
+    def get(self, cache_key: str) -> Optional[List[str]]:
+        """Return cached variants (and mark them recently used), or None."""
+        row = self._conn.execute(
+            "SELECT variants, created_at FROM generations WHERE cache_key = ?",
+            (cache_key,)
+        ).fetchone()
+        
+        now = time.time()
+        if row is None or now - row[1] > self.ttl_seconds:
+            self.misses += 1
+            return None
+        
+        with self._conn:
+            self._conn.execute(
+                "UPDATE generations SET last_used_at = ? WHERE cache_key = ?",
+                (now, cache_key)
+            )
+        
+        self.hits += 1
+        return json.loads(row[0])
+    
+    def put(self, cache_key: str, model: str, variants: List[str]) -> None:
+        """Store variants for a key, evicting LRU entries past max_entries."""
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO generations (cache_key, model, variants, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (cache_key, model, json.dumps(variants), now, now)
+            )
+            self._conn.execute(
+                """
+                DELETE FROM generations WHERE cache_key IN (
+                    SELECT cache_key FROM generations
+                    ORDER BY last_used_at DESC
+                    LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            )
+    
+    def purge_expired(self) -> int:
+        """Delete entries past their TTL. Returns count removed."""
+        with self._conn:
+            cursor = self._conn.execute(
+                "DELETE FROM generations WHERE created_at < ?",
+                (time.time() - self.ttl_seconds,)
+            )
+        return cursor.rowcount
+    
+    def count(self) -> int:
+        """Number of cached generations."""
+        return self._conn.execute("SELECT COUNT(*) FROM generations").fetchone()[0]
+    
+    def get_status_dict(self) -> dict:
+        """Size and hit rate for status endpoints."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self.count(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+    
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+
+# Global singleton instance
+_generation_cache: Optional[GenerationCache] = None
+
+
+def get_generation_cache() -> Optional[GenerationCache]:
+    """Get the global generation cache, or None when caching is disabled."""
+    global _generation_cache
+    
+    from app.config import get_settings
+    settings = get_settings()
+    if not settings.ai_cache_enabled:
+        return None
+    
+    if _generation_cache is None:
+        _generation_cache = GenerationCache(
+            ttl_seconds=settings.ai_cache_ttl_days * 24 * 3600,
+            max_entries=settings.ai_cache_max_entries
+        )
+    return _generation_cache
@@ -1,20 +1,29 @@
 """GitHub Copilot AI service for generating LinkedIn post variants."""
 import logging
-from typing import List, Optional
-import httpx
+from typing import AsyncIterator, List, Optional
 from app.config import get_settings
+from app.http_clients import get_http_client
+from app.ai import (
+    MAX_TOKENS_PER_POST,
+    VARIANT_MARKER,
+    VariantGenerationMixin,
+    parse_stream_line,
+)
+from app.copilot_token import CopilotTokenManager
 from app.logging_config import log_operation_start, log_operation_success, log_operation_error, log_api_call
 
 logger = logging.getLogger(__name__)
 
 
-class GitHubCopilotAIService:
+class GitHubCopilotAIService(VariantGenerationMixin):
     """
     AI service using GitHub Copilot API for higher rate limits.
     
     Uses GitHub Copilot's chat completions API with token exchange.
     """
     
+    log_suffix = "_copilot"
+    
     def __init__(self, access_token: Optional[str] = None, refresh_token: Optional[str] = None):
         """
         Initialize the GitHub Copilot AI service.
@@ -29,61 +38,40 @@ class GitHubCopilotAIService:
         self.api_url = "https://api.githubcopilot.com/chat/completions"
         self.token_url = "https://api.github.com/copilot_internal/v2/token"
         self.model = "gpt-4o"
-        self.bearer_token = None
         
         if not self.session_token and not self.refresh_token:
             raise ValueError("GitHub Copilot tokens not configured")
         
+        # Bearer tokens are only obtainable from a ghu_* refresh token
+        self.token_manager = None
+        if self.refresh_token and self.refresh_token.startswith('ghu_'):
+            self.token_manager = CopilotTokenManager(self.refresh_token, self.token_url)
+        
         logger.info("🤖 GitHub Copilot AI Service initialized")
         logger.info(f"   Model: {self.model}")
         logger.info(f"   API: GitHub Copilot")
     
     async def _get_bearer_token(self) -> str:
         """
-        Exchange the refresh token for a Copilot API bearer token.
+        Get a Copilot API bearer token.
         
-        The refresh token (ghu_*) can be used to get a time-limited bearer token
-        for the Copilot API.
+        The refresh token (ghu_*) is exchanged for a time-limited bearer token
+        by the token manager, which refreshes it before it expires. Falls back
+        to the session token when no exchange is possible.
         """
-        if self.bearer_token:
-            return self.bearer_token
+        if self.token_manager:
+            bearer_token = await self.token_manager.get_token()
+            if bearer_token:
+                return bearer_token
         
-        try:
-            # Try to get a bearer token using the refresh token (ghu_* token)
-            if self.refresh_token and self.refresh_token.startswith('ghu_'):
-                logger.info("   Exchanging refresh token for Copilot API bearer token...")
-                
-                headers = {
-                    "Authorization": f"token {self.refresh_token}",
-                    "Accept": "application/json",
-                    "User-Agent": "GitHubCopilotChat/0.11.1"
-                }
-                
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        self.token_url,
-                        headers=headers,
-                        timeout=30.0
-                    )
-                    
-                    logger.info(f"   Token exchange: {response.status_code}")
-                    
-                    if response.status_code == 200:
-                        data = response.json()
-                        if 'token' in data:
-                            self.bearer_token = data['token']
-                            logger.info(f"   ✅ Got Copilot API bearer token (expires: {data.get('expires_at', 'unknown')})")
-                            return self.bearer_token
-                    else:
-                        logger.warning(f"   Token exchange failed: {response.text[:200]}")
-            
-            # Fallback: try using session_token as-is
-            logger.info("   Using session token as-is...")
-            return self.session_token
-            
-        except Exception as e:
-            logger.warning(f"   Token exchange error: {e}, using session token")
-            return self.session_token
+        # Fallback: try using session_token as-is
+        logger.info("   Using session token as-is...")
+        return self.session_token
+    
+    def _check_auth(self, response) -> None:
+        """Drop the cached bearer token when the API rejects it."""
+        if response.status_code == 401 and self.token_manager:
+            self.token_manager.invalidate()
     
     async def generate_variants(
         self,
@@ -91,7 +79,8 @@ class GitHubCopilotAIService:
         author_name: str,
         num_variants: int = 3,
         relationship: Optional[str] = None,
-        custom_context: Optional[str] = None
+        custom_context: Optional[str] = None,
+        bypass_cache: bool = False
     ) -> List[str]:
         """
         Generate alternative versions of a LinkedIn post using GitHub Copilot.
@@ -102,6 +91,7 @@ class GitHubCopilotAIService:
             num_variants: Number of variants to generate (default: 3)
             relationship: Type of relationship with the author (e.g., "mentor", "colleague")
             custom_context: Additional context about the author
+            bypass_cache: Skip the generation cache lookup (fresh output, result still cached)
         
         Returns:
             List of generated post variants
@@ -118,85 +108,140 @@ class GitHubCopilotAIService:
         )
         
         try:
-            prompt = self._create_prompt(original_content, author_name, num_variants, relationship, custom_context)
+            variants = [
+                variant async for variant in self.stream_variants(
+                    original_content, author_name, num_variants, relationship, custom_context, bypass_cache
+                )
+            ]
             
-            # Get a valid bearer token (exchange refresh token if needed)
-            bearer_token = await self._get_bearer_token()
+            if len(variants) != num_variants:
+                logger.warning(
+                    f"⚠️  Expected {num_variants} variants, got {len(variants)}. "
+                    "Using what we have."
+                )
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {bearer_token}",
-                "Editor-Version": "vscode/1.85.0",
-                "Editor-Plugin-Version": "copilot-chat/0.11.1",
-                "User-Agent": "GitHubCopilotChat/0.11.1",
-                "Openai-Organization": "github-copilot",
-                "Openai-Intent": "conversation-panel",
-                "VScode-SessionId": "session-001",
-                "VScode-MachineId": "machine-001"
-            }
+            log_operation_success(
+                logger,
+                "generate_variants_copilot",
+                variants_count=len(variants),
+                model=self.model
+            )
             
-            payload = {
-                "model": self.model,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": "You are an expert LinkedIn content creator who specializes in creating engaging, professional posts."
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt
-                    }
-                ],
-                "temperature": 0.8,
-                "max_tokens": 2000,
-                "top_p": 0.9,
-                "n": 1,
-                "stream": False
-            }
+            return variants
             
-            async with httpx.AsyncClient() as client:
-                log_api_call(logger, "POST", self.api_url, "GitHub Copilot API")
-                
-                response = await client.post(
-                    self.api_url,
-                    headers=headers,
-                    json=payload,
-                    timeout=60.0
-                )
-                
-                logger.info(f"🌐 API POST {self.api_url} → {response.status_code}")
-                response.raise_for_status()
-                
-                result = response.json()
-                
-                # Extract the generated content
-                if "choices" not in result or len(result["choices"]) == 0:
-                    raise ValueError("No choices in API response")
-                
-                content = result["choices"][0]["message"]["content"]
-                
-                # Parse the variants from the response
-                variants = self._parse_variants(content, num_variants)
-                
-                if len(variants) != num_variants:
-                    logger.warning(
-                        f"⚠️  Expected {num_variants} variants, got {len(variants)}. "
-                        "Using what we have."
-                    )
-                
-                log_operation_success(
-                    logger,
-                    "generate_variants_copilot",
-                    variants_count=len(variants),
-                    model=self.model
-                )
-                
-                return variants
-                
         except Exception as e:
             log_operation_error(logger, "generate_variants_copilot", e)
             raise
     
+    async def _headers(self) -> dict:
+        """HTTP headers for Copilot requests (exchanges the refresh token if needed)."""
+        bearer_token = await self._get_bearer_token()
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {bearer_token}",
+            "Editor-Version": "vscode/1.85.0",
+            "Editor-Plugin-Version": "copilot-chat/0.11.1",
+            "User-Agent": "GitHubCopilotChat/0.11.1",
+            "Openai-Organization": "github-copilot",
+            "Openai-Intent": "conversation-panel",
+            "VScode-SessionId": "session-001",
+            "VScode-MachineId": "machine-001"
+        }
+    
+    def _build_payload(self, prompt: str, max_tokens: int, stream: bool = False, json_output: bool = False) -> dict:
+        """Chat completion request body."""
+        payload = {
+            "model": self.model,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": "You are an expert LinkedIn content creator who specializes in creating engaging, professional posts."
+                },
+                {
+                    "role": "user",
+                    "content": prompt
+                }
+            ],
+            "temperature": 0.8,
+            "max_tokens": max_tokens,
+            "top_p": 0.9,
+            "n": 1,
+            "stream": stream
+        }
+        if json_output:
+            payload["response_format"] = {"type": "json_object"}
+        return payload
+    
+    async def _chat_completion(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_POST, json_output: bool = False) -> str:
+        """
+        Send one chat completion request and return the message content.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token limit
+            json_output: Ask the model for a JSON object response
+        
+        Returns:
+            Raw content of the first choice
+        """
+        headers = await self._headers()
+        
+        client = get_http_client("copilot")
+        log_api_call(logger, "POST", self.api_url, "GitHub Copilot API")
+        
+        response = await client.post(
+            self.api_url,
+            headers=headers,
+            json=self._build_payload(prompt, max_tokens, json_output=json_output),
+            timeout=120.0 if json_output else 60.0
+        )
+        
+        logger.info(f"🌐 API POST {self.api_url} → {response.status_code}")
+        self._check_auth(response)
+        response.raise_for_status()
+        
+        result = response.json()
+        
+        # Extract the generated content
+        if "choices" not in result or len(result["choices"]) == 0:
+            raise ValueError("No choices in API response")
+        
+        return result["choices"][0]["message"]["content"]
+    
+    async def _stream_chat_completion(self, prompt: str, max_tokens: int = MAX_TOKENS_PER_POST) -> AsyncIterator[str]:
+        """
+        Send a streaming chat completion request.
+        
+        Args:
+            prompt: User prompt
+            max_tokens: Completion token limit
+        
+        Yields:
+            Content deltas as they arrive
+        """
+        headers = await self._headers()
+        
+        client = get_http_client("copilot")
+        log_api_call(logger, "POST", self.api_url, "GitHub Copilot API (stream)")
+        
+        async with client.stream(
+            "POST",
+            self.api_url,
+            headers=headers,
+            json=self._build_payload(prompt, max_tokens, stream=True),
+            timeout=60.0
+        ) as response:
+            logger.info(f"🌐 API POST {self.api_url} → {response.status_code} (stream)")
+            self._check_auth(response)
+            if response.is_error:
+                await response.aread()
+            response.raise_for_status()
+            
+            async for line in response.aiter_lines():
+                content = parse_stream_line(line)
+                if content:
+                    yield content
+    
     def _create_prompt(self, original_content: str, author_name: str, num_variants: int, relationship: Optional[str] = None, custom_context: Optional[str] = None) -> str:
         """
         Create the prompt for generating post variants.
@@ -294,7 +339,7 @@ Now generate {num_variants} authentic variants:"""
         Uses the same parsing logic as the GitHub Models service.
         """
         # Split by the variant marker
-        variants = content.split("---VARIANT---")
+        variants = content.split(VARIANT_MARKER)
         
         # Clean up each variant
         cleaned_variants = []
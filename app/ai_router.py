@@ -0,0 +1,345 @@
+"""Latency-aware routing between the GitHub Copilot and GitHub Models AI services."""
+import asyncio
+import logging
+import time
+from collections import deque
+from contextlib import aclosing
+from typing import AsyncIterator, Awaitable, Callable, Deque, List, Optional, Tuple, TypeVar
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Recent requests kept per provider for percentiles and error rate
+STATS_WINDOW = 50
+
+# Latency assumed for a provider with no successful samples yet
+DEFAULT_LATENCY_ESTIMATE_SECONDS = 10.0
+
+# Samples needed before a provider's p95 is trusted as a hedging threshold
+MIN_SAMPLES_FOR_HEDGE = 10
+
+# How long a provider is deprioritised after a 429/5xx without Retry-After
+DEFAULT_COOLDOWN_SECONDS = 30.0
+
+
+def is_failover_error(error: Exception) -> bool:
+    """429s, 5xx responses, transport errors and timeouts are worth retrying on another provider."""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return isinstance(error, (httpx.TransportError, TimeoutError))
+
+
+def _served_from_cache(result) -> bool:
+    """True when every variant came from the generation cache (no provider work to time)."""
+    return bool(result) and all(getattr(variant, "cached", False) for variant in result)
+
+
+def _cooldown_seconds(error: Exception) -> float:
+    """How long to deprioritise a provider after an error (Retry-After when given)."""
+    if not is_failover_error(error):
+        return 0.0
+    if isinstance(error, httpx.HTTPStatusError):
+        try:
+            return max(0.0, float(error.response.headers.get("retry-after")))
+        except (TypeError, ValueError):
+            pass
+    return DEFAULT_COOLDOWN_SECONDS
+
+
+class ProviderStats:
+    """Rolling latency samples and outcomes for one provider."""
+    
+    def __init__(self, window: int = STATS_WINDOW):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.outcomes: Deque[bool] = deque(maxlen=window)
+        self.cooldown_until = 0.0
+    
+    def record_success(self, latency: Optional[float]) -> None:
+        self.outcomes.append(True)
+        if latency is not None:
+            self.latencies.append(latency)
+    
+    def record_failure(self, cooldown_seconds: float = 0.0) -> None:
+        self.outcomes.append(False)
+        if cooldown_seconds:
+            self.cooldown_until = max(self.cooldown_until, time.monotonic() + cooldown_seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Latency percentile over the window (nearest rank), or None without samples."""
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+    
+    @property
+    def p50(self) -> Optional[float]:
+        return self.percentile(50)
+    
+    @property
+    def p95(self) -> Optional[float]:
+        return self.percentile(95)
+    
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return self.outcomes.count(False) / len(self.outcomes)
+    
+    @property
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+    
+    def score(self) -> float:
+        """Expected cost of sending a request here (lower is better)."""
+        latency = self.p50 if self.p50 is not None else DEFAULT_LATENCY_ESTIMATE_SECONDS
+        return latency * (1 + 4 * self.error_rate)
+    
+    def get_status_dict(self) -> dict:
+        return {
+            "samples": len(self.outcomes),
+            "p50_seconds": round(self.p50, 2) if self.p50 is not None else None,
+            "p95_seconds": round(self.p95, 2) if self.p95 is not None else None,
+            "error_rate": round(self.error_rate, 3),
+            "cooling_down": self.cooling_down,
+        }
+
+
+class AIRouter:
+    """
+    Routes AI generation calls to the healthiest configured provider.
+    
+    Providers are ranked by rolling p50 latency weighted by error rate;
+    providers in a 429/5xx cooldown go last. Failed calls with a 429, 5xx or
+    transport error are retried on the next provider. With hedging enabled,
+    a generate_variants call still running after the primary's p95 gets a
+    second request on the next provider, and whichever finishes first wins.
+    
+    Has the same generate_variants / stream_variants / generate_variants_multi
+    interface as the individual services, so callers don't change.
+    """
+    
+    def __init__(self, providers: List[Tuple[str, object]], hedging_enabled: bool = False):
+        """
+        Initialize the router.
+        
+        Args:
+            providers: (name, service) pairs in preference order for ties
+            hedging_enabled: Send hedged requests for slow generate_variants calls
+        """
+        self.providers = providers
+        self.stats = {name: ProviderStats() for name, _ in providers}
+        self.hedging_enabled = hedging_enabled
+        self.hedged_requests = 0
+        self.hedge_wins = 0
+        
+        logger.info(f"🔀 AI router initialized: {', '.join(name for name, _ in providers)} (hedging: {hedging_enabled})")
+    
+    def ranked(self) -> List[Tuple[str, object]]:
+        """Providers ordered best first."""
+        order = {name: i for i, (name, _) in enumerate(self.providers)}
+        return sorted(
+            self.providers,
+            key=lambda provider: (
+                self.stats[provider[0]].cooling_down,
+                self.stats[provider[0]].score(),
+                order[provider[0]]
+            )
+        )
+    
+    @property
+    def model(self) -> str:
+        """Model of the provider currently ranked first."""
+        return self.ranked()[0][1].model
+    
+    def _record_failure(self, name: str, error: Exception) -> None:
+        cooldown = _cooldown_seconds(error)
+        self.stats[name].record_failure(cooldown)
+        if cooldown:
+            logger.warning(f"🔀 AI provider {name} failed ({error}), deprioritised for {cooldown:.0f}s")
+    
+    async def _fail_over(self, operation: str, name: str, error: Exception) -> None:
+        """Note a failover, reporting 429s to the shared AI semaphore first."""
+        if isinstance(error, httpx.HTTPStatusError) and error.response.status_code == 429:
+            # The next provider may well succeed, so the caller never sees this 429
+            from app.ai_batch import get_ai_semaphore
+            await get_ai_semaphore().record_rate_limited()
+        logger.warning(f"🔀 {operation} failed on {name}, trying next provider")
+    
+    async def _call(self, name: str, call: Callable[[], Awaitable[T]], record_latency: bool = True) -> T:
+        """Run one provider call and record its outcome."""
+        started = time.monotonic()
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            # A cancelled hedge loser was at least this slow
+            if record_latency:
+                self.stats[name].latencies.append(time.monotonic() - started)
+            raise
+        except Exception as e:
+            self._record_failure(name, e)
+            raise
+        
+        # A ~0ms cache hit would drag down p50 and the p95 hedge threshold
+        if _served_from_cache(result):
+            return result
+        
+        self.stats[name].record_success(time.monotonic() - started if record_latency else None)
+        return result
+    
+    async def _with_failover(
+        self,
+        operation: str,
+        make_call: Callable[[object], Awaitable[T]],
+        providers: Optional[List[Tuple[str, object]]] = None,
+        record_latency: bool = True
+    ) -> T:
+        """Try providers in order until one succeeds or an error isn't worth failing over."""
+        providers = providers if providers is not None else self.ranked()
+        
+        for name, service in providers:
+            try:
+                return await self._call(name, lambda: make_call(service), record_latency)
+            except Exception as e:
+                if not is_failover_error(e) or name == providers[-1][0]:
+                    # The last error reaches the caller (and its own 429 handling) as-is
+                    raise
+                await self._fail_over(operation, name, e)
+    
+    async def _hedged(
+        self,
+        ranked: List[Tuple[str, object]],
+        hedge_after: float,
+        make_call: Callable[[object], Awaitable[T]]
+    ) -> T:
+        """Race a backup request against a primary that has passed its p95."""
+        (primary_name, primary), (backup_name, backup) = ranked[0], ranked[1]
+        primary_task = asyncio.create_task(self._call(primary_name, lambda: make_call(primary)))
+        
+        done, _ = await asyncio.wait({primary_task}, timeout=hedge_after)
+        if done:
+            try:
+                return primary_task.result()
+            except Exception as e:
+                if not is_failover_error(e):
+                    raise
+                await self._fail_over("generate_variants", primary_name, e)
+                return await self._with_failover("generate_variants", make_call, ranked[1:])
+        
+        self.hedged_requests += 1
+        logger.info(f"🪁 {primary_name} passed its p95 ({hedge_after:.1f}s), hedging on {backup_name}")
+        backup_task = asyncio.create_task(self._call(backup_name, lambda: make_call(backup)))
+        
+        pending = {primary_task, backup_task}
+        errors: List[Exception] = []
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is backup_task:
+                            self.hedge_wins += 1
+                        return task.result()
+                    errors.append(task.exception())
+            raise errors[0]
+        finally:
+            # Cancel the loser (closes its HTTP stream)
+            for task in pending:
+                task.cancel()
+    
+    async def generate_variants(self, *args, **kwargs) -> List[str]:
+        """Generate variants on the best provider (see AIService.generate_variants)."""
+        def make_call(service):
+            return service.generate_variants(*args, **kwargs)
+        
+        ranked = self.ranked()
+        if self.hedging_enabled and len(ranked) > 1:
+            primary_stats = self.stats[ranked[0][0]]
+            if len(primary_stats.latencies) >= MIN_SAMPLES_FOR_HEDGE:
+                return await self._hedged(ranked, primary_stats.p95, make_call)
+        
+        return await self._with_failover("generate_variants", make_call, ranked)
+    
+    async def generate_variants_multi(self, requests: list) -> List[Optional[List[str]]]:
+        """
+        Packed generation on the best provider (see AIService.generate_variants_multi).
+        
+        Packed requests take longer than single posts, so only their outcome
+        is recorded - their latency would skew the per-post percentiles.
+        """
+        return await self._with_failover(
+            "generate_variants_multi",
+            lambda service: service.generate_variants_multi(requests),
+            record_latency=False
+        )
+    
+    async def stream_variants(self, *args, **kwargs) -> AsyncIterator[str]:
+        """
+        Stream variants from the best provider (see AIService.stream_variants).
+        
+        Fails over only before the first variant is yielded; after that the
+        caller already has output from this provider.
+        """
+        ranked = self.ranked()
+        
+        for name, service in ranked:
+            started = time.monotonic()
+            yielded = []
+            try:
+                async with aclosing(service.stream_variants(*args, **kwargs)) as variants:
+                    async for variant in variants:
+                        yielded.append(variant)
+                        yield variant
+            except Exception as e:
+                self._record_failure(name, e)
+                if yielded or not is_failover_error(e) or name == ranked[-1][0]:
+                    raise
+                await self._fail_over("stream_variants", name, e)
+                continue
+            
+            if not _served_from_cache(yielded):
+                self.stats[name].record_success(time.monotonic() - started)
+            return
+    
+    def get_status_dict(self) -> dict:
+        """Per-provider latency/error stats and hedging counters for status endpoints."""
+        return {
+            "providers": {name: self.stats[name].get_status_dict() for name, _ in self.providers},
+            "preferred": self.ranked()[0][0],
+            "hedging_enabled": self.hedging_enabled,
+            "hedged_requests": self.hedged_requests,
+            "hedge_wins": self.hedge_wins,
+        }
+
+
+# Global singleton instance
+_ai_router: Optional[AIRouter] = None
+
+
+def get_ai_router() -> AIRouter:
+    """
+    Get the global AI router.
+    
+    Copilot (higher rate limits) is listed first, so it wins ties until the
+    router has latency data; GitHub Models is always available as a fallback.
+    """
+    global _ai_router
+    if _ai_router is None:
+        from app.ai import AIService
+        from app.ai_copilot import get_copilot_ai_service
+        
+        settings = get_settings()
+        providers = []
+        
+        copilot_service = get_copilot_ai_service()
+        if copilot_service:
+            providers.append(("copilot", copilot_service))
+        providers.append(("github_models", AIService()))
+        
+        _ai_router = AIRouter(providers, hedging_enabled=settings.ai_hedge_requests)
+    return _ai_router
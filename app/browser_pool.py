@@ -0,0 +1,276 @@
+"""Warm, long-lived Playwright Chromium shared by LinkedIn automation sessions."""
+import asyncio
+import logging
+import os
+from typing import Dict, Optional
+
+from playwright.async_api import async_playwright, Browser
+
+from app.browser_watchdog import chromium_rss_mb
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Launch flags shared by pooled and standalone browsers (evasion + container friendly)
+CHROMIUM_LAUNCH_ARGS = [
+    '--no-sandbox',
+    '--disable-setuid-sandbox',
+    '--disable-dev-shm-usage',
+    '--disable-blink-features=AutomationControlled',
+    '--disable-features=IsolateOrigins,site-per-process',
+    '--disable-site-isolation-trials',
+    '--disable-web-security',
+]
+
+# Liveness probe (open + close a context) must finish within this
+PROBE_TIMEOUT_SECONDS = 10
+
+
+async def launch_chromium(playwright, headless: bool) -> Browser:
+    """Launch Chromium with the standard flags."""
+    return await playwright.chromium.launch(
+        headless=headless,
+        args=CHROMIUM_LAUNCH_ARGS,
+        chromium_sandbox=False,
+    )
+
+
+class BrowserPool:
+    """
+    Keeps one Chromium process warm and lends it to LinkedInAutomation sessions.
+    
+    Each session opens its own context (fresh storage state) on the shared
+    browser, so a checkout costs a context instead of a full browser launch.
+    The browser is probed before every checkout and relaunched if dead, and
+    recycled once idle after max_operations checkouts or when its process
+    tree grows past max_memory_mb. A browser flagged for recycling while
+    still lent out is no longer handed out: new checkouts get a fresh one
+    and the old one is closed when its last user checks in.
+    """
+    
+    def __init__(self, headless: bool, max_operations: int = 50, max_memory_mb: int = 1500):
+        """
+        Initialize the pool (the browser launches on warm() or first checkout).
+        
+        Args:
+            headless: Launch mode for the pooled browser
+            max_operations: Recycle after this many checkouts
+            max_memory_mb: Recycle when Chromium RSS exceeds this (0 = never)
+        """
+        self.headless = headless
+        self.max_operations = max_operations
+        self.max_memory_mb = max_memory_mb
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self.in_use = 0
+        # Replaced browsers still lent out -> how many users they have left
+        self._retiring: Dict[Browser, int] = {}
+        self.operations = 0
+        self.launches = 0
+        self.recycles = 0
+        self._recycle_requested = False
+        self._warm_task: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+    
+    async def _launch(self) -> None:
+        """Launch a fresh browser, restarting the Playwright driver if it died too."""
+        for attempt in range(2):
+            try:
+                if self.playwright is None:
+                    self.playwright = await async_playwright().start()
+                self.browser = await launch_chromium(self.playwright, self.headless)
+                break
+            except Exception:
+                if attempt:
+                    raise
+                logger.warning("⚠️  Browser launch failed, restarting Playwright driver")
+                await self._stop_playwright()
+        
+        self.operations = 0
+        self._recycle_requested = False
+        self.launches += 1
+        logger.info(f"🔥 Pooled browser launched (headless: {self.headless}, launch #{self.launches})")
+    
+    async def _close(self, browser: Browser) -> None:
+        try:
+            await browser.close()
+        except Exception as e:
+            logger.warning(f"⚠️  Error closing pooled browser: {e}")
+    
+    async def _close_browser(self) -> None:
+        if self.browser:
+            await self._close(self.browser)
+            self.browser = None
+    
+    async def _replace_browser(self) -> None:
+        """Drop the current browser: close it now if idle, else once its last user checks in."""
+        if self.browser and self.in_use:
+            self._retiring[self.browser] = self.in_use
+            self.browser = None
+            self.in_use = 0
+        else:
+            await self._close_browser()
+    
+    async def _stop_playwright(self) -> None:
+        if self.playwright:
+            try:
+                await self.playwright.stop()
+            except Exception as e:
+                logger.warning(f"⚠️  Error stopping Playwright: {e}")
+            self.playwright = None
+    
+    async def _is_alive(self) -> bool:
+        """Probe the browser with a real round trip (open and close a context)."""
+        if not self.browser or not self.browser.is_connected():
+            return False
+        try:
+            context = await asyncio.wait_for(self.browser.new_context(), PROBE_TIMEOUT_SECONDS)
+            await context.close()
+            return True
+        except Exception as e:
+            logger.warning(f"⚠️  Pooled browser failed liveness probe: {e}")
+            return False
+    
+    def _recycle_reason(self) -> Optional[str]:
+        """Why the browser should be replaced, or None if it's fine."""
+        if self._recycle_requested:
+            return "restart requested"
+        if self.max_operations and self.operations >= self.max_operations:
+            return f"{self.operations} operations"
+        # A retiring browser's memory counts towards the total until it closes
+        if self.max_memory_mb and not self._retiring:
+            rss_mb = chromium_rss_mb()
+            if rss_mb and rss_mb > self.max_memory_mb:
+                return f"{rss_mb:.0f} MB RSS > {self.max_memory_mb} MB"
+        return None
+    
+    async def warm(self) -> None:
+        """Launch the browser ahead of the first checkout. Never raises."""
+        try:
+            async with self._lock:
+                if not self.browser or not self.browser.is_connected():
+                    await self._launch()
+        except Exception as e:
+            logger.warning(f"⚠️  Could not warm browser pool: {e}")
+    
+    def warm_in_background(self) -> None:
+        """Start warm() as a task the pool keeps a reference to (close() cancels it)."""
+        if self._warm_task is None or self._warm_task.done():
+            self._warm_task = asyncio.create_task(self.warm())
+    
+    async def checkout(self) -> Browser:
+        """
+        Borrow the pooled browser (launching or relaunching it as needed).
+        
+        Every checkout must be paired with checkin().
+        """
+        async with self._lock:
+            if self.browser and self.in_use == 0:
+                reason = self._recycle_reason()
+                if reason:
+                    logger.info(f"♻️  Recycling pooled browser ({reason})")
+                    self.recycles += 1
+                    await self._close_browser()
+            elif self.browser and self._recycle_requested:
+                # Don't lend it out again; its current users finish on it
+                logger.info(f"♻️  Recycling pooled browser once its {self.in_use} current user(s) check in")
+                self.recycles += 1
+                await self._replace_browser()
+            
+            if not await self._is_alive():
+                await self._replace_browser()
+                await self._launch()
+            
+            self.in_use += 1
+            return self.browser
+    
+    async def checkin(self, browser: Browser, recycle: bool = False) -> None:
+        """
+        Return a borrowed browser; recycles it if due and nobody else is using it.
+        
+        Args:
+            browser: The browser returned by checkout()
+            recycle: Stop lending this browser out and replace it (e.g. memory watchdog)
+        """
+        async with self._lock:
+            if browser in self._retiring:
+                self._retiring[browser] -= 1
+                if not self._retiring[browser]:
+                    del self._retiring[browser]
+                    await self._close(browser)
+                    logger.info("♻️  Closed recycled browser after its last user checked in")
+                return
+            if browser is not self.browser:
+                return
+            
+            self.in_use = max(0, self.in_use - 1)
+            self.operations += 1
+            if recycle:
+                self._recycle_requested = True
+            if self.in_use:
+                return
+            
+            reason = self._recycle_reason()
+            if reason:
+                logger.info(f"♻️  Recycling pooled browser ({reason})")
+                self.recycles += 1
+                await self._close_browser()
+        
+        if reason:
+            # Relaunch in the background so the next checkout is warm again
+            self.warm_in_background()
+    
+    async def close(self) -> None:
+        """Close the browser and Playwright driver (FastAPI lifespan shutdown)."""
+        if self._warm_task and not self._warm_task.done():
+            self._warm_task.cancel()
+            try:
+                await self._warm_task
+            except asyncio.CancelledError:
+                pass
+        
+        async with self._lock:
+            for browser in self._retiring:
+                await self._close(browser)
+            self._retiring.clear()
+            await self._close_browser()
+            await self._stop_playwright()
+        logger.info("✅ Browser pool closed")
+    
+    def get_status_dict(self) -> dict:
+        """Pool state for status endpoints."""
+        rss_mb = chromium_rss_mb() if self.browser else None
+        return {
+            "browser_running": bool(self.browser and self.browser.is_connected()),
+            "headless": self.headless,
+            "in_use": self.in_use + sum(self._retiring.values()),
+            "retiring_browsers": len(self._retiring),
+            "operations_since_launch": self.operations,
+            "max_operations": self.max_operations,
+            "chromium_rss_mb": round(rss_mb, 1) if rss_mb is not None else None,
+            "max_memory_mb": self.max_memory_mb,
+            "launches": self.launches,
+            "recycles": self.recycles,
+        }
+
+
+# Global singleton instance
+_browser_pool: Optional[BrowserPool] = None
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """Get the global browser pool, or None when pooling is disabled."""
+    global _browser_pool
+    
+    settings = get_settings()
+    if not settings.browser_pool_enabled:
+        return None
+    
+    if _browser_pool is None:
+        _browser_pool = BrowserPool(
+            # Same rule as LinkedInAutomation: a DISPLAY (VNC) means headed
+            headless=not os.environ.get('DISPLAY'),
+            max_operations=settings.browser_pool_max_operations,
+            max_memory_mb=settings.browser_max_memory_mb
+        )
+    return _browser_pool
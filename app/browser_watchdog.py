@@ -0,0 +1,186 @@
+"""Chromium memory watchdog: samples browser RSS and flags when a recycle is due."""
+import asyncio
+import logging
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Process names counted as Chromium when measuring memory
+CHROMIUM_PROCESS_NAMES = ("chrome", "chromium", "headless_shell")
+
+
+def _process_table() -> Dict[int, tuple]:
+    """Map pid -> (parent pid, process name) from /proc (empty off Linux)."""
+    table = {}
+    for entry in Path("/proc").glob("[0-9]*/stat"):
+        try:
+            stat = entry.read_text()
+            # Name is parenthesised and may contain spaces: "pid (name) state ppid ..."
+            name = stat[stat.index("(") + 1:stat.rindex(")")]
+            ppid = int(stat[stat.rindex(")") + 2:].split()[1])
+            table[int(entry.parent.name)] = (ppid, name)
+        except (OSError, ValueError, IndexError):
+            continue
+    return table
+
+
+def chromium_rss_mb(root_pid: Optional[int] = None) -> Optional[float]:
+    """
+    Resident memory of all Chromium processes descended from root_pid.
+    
+    Args:
+        root_pid: Process whose tree is measured (default: this process)
+    
+    Returns:
+        Total RSS in MB, or None where /proc is unavailable
+    """
+    if not Path("/proc/self/statm").exists():
+        return None
+    
+    table = _process_table()
+    children: Dict[int, List[int]] = {}
+    for pid, (ppid, _) in table.items():
+        children.setdefault(ppid, []).append(pid)
+    
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total_bytes = 0
+    stack = list(children.get(root_pid or os.getpid(), []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        if not table[pid][1].lower().startswith(CHROMIUM_PROCESS_NAMES):
+            continue
+        try:
+            total_bytes += int(Path(f"/proc/{pid}/statm").read_text().split()[1]) * page_size
+        except (OSError, ValueError, IndexError):
+            continue
+    
+    return total_bytes / (1024 * 1024)
+
+
+class BrowserMemoryWatchdog:
+    """
+    Samples the RSS of the Chromium process trees this app has started.
+    
+    Covers Playwright (LinkedInAutomation.start) and Selenium
+    (LinkedInSeleniumAutomation._start_driver) browsers alike. Nothing is
+    killed from here - a browser mid-navigation can't be restarted safely.
+    Instead, sessions call over_limit() at their safe points (between
+    handles, before a repost) and restart their own browser when it says so,
+    long before the container's OOM killer takes the whole app down.
+    """
+    
+    def __init__(self, max_memory_mb: int, interval_seconds: float = 30):
+        """
+        Initialize the watchdog (sampling starts with start()).
+        
+        Args:
+            max_memory_mb: RSS ceiling for a browser's process tree (0 = no limit)
+            interval_seconds: Background sampling interval
+        """
+        self.max_memory_mb = max_memory_mb
+        self.interval_seconds = interval_seconds
+        self.rss_mb: Optional[float] = None
+        self.peak_mb = 0.0
+        self.sampled_at: Optional[datetime] = None
+        self.recycles = 0
+        self._warned = False
+        self._task: Optional[asyncio.Task] = None
+    
+    def sample(self, root_pid: Optional[int] = None) -> Optional[float]:
+        """
+        Measure Chromium RSS now.
+        
+        Args:
+            root_pid: Measure only this process's tree (default: every Chromium this app started)
+        
+        Returns:
+            RSS in MB, or None where /proc is unavailable
+        """
+        rss_mb = chromium_rss_mb(root_pid)
+        if root_pid is None and rss_mb is not None:
+            self.rss_mb = rss_mb
+            self.peak_mb = max(self.peak_mb, rss_mb)
+            self.sampled_at = datetime.now()
+        return rss_mb
+    
+    def over_limit(self, root_pid: Optional[int] = None) -> bool:
+        """Fresh check of a browser's tree against the ceiling (call at safe points)."""
+        if not self.max_memory_mb:
+            return False
+        rss_mb = self.sample(root_pid)
+        return rss_mb is not None and rss_mb > self.max_memory_mb
+    
+    def record_recycle(self, session: str) -> None:
+        """Count a browser restart triggered by over_limit()."""
+        self.recycles += 1
+        self._warned = False
+        logger.warning(f"♻️  {session}: restarting browser over the {self.max_memory_mb} MB memory ceiling (restart #{self.recycles})")
+    
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval_seconds)
+            try:
+                rss_mb = self.sample()
+            except Exception as e:
+                logger.debug(f"Chromium memory sample failed: {e}")
+                continue
+            
+            if rss_mb is not None and self.max_memory_mb and rss_mb > self.max_memory_mb:
+                if not self._warned:
+                    logger.warning(
+                        f"🐘 Chromium using {rss_mb:.0f} MB (ceiling {self.max_memory_mb} MB) - "
+                        f"recycling at the next safe point"
+                    )
+                    self._warned = True
+            else:
+                self._warned = False
+    
+    def start(self) -> None:
+        """Start background sampling (FastAPI lifespan startup)."""
+        if self._task is None and Path("/proc/self/statm").exists():
+            self._task = asyncio.create_task(self._run())
+            logger.info(f"🐕 Browser memory watchdog started (ceiling: {self.max_memory_mb} MB, every {self.interval_seconds}s)")
+    
+    async def stop(self) -> None:
+        """Stop background sampling (FastAPI lifespan shutdown)."""
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+    
+    def get_status_dict(self) -> dict:
+        """Latest sample and restart count for status endpoints."""
+        return {
+            "running": self._task is not None,
+            "chromium_rss_mb": round(self.rss_mb, 1) if self.rss_mb is not None else None,
+            "peak_rss_mb": round(self.peak_mb, 1),
+            "max_memory_mb": self.max_memory_mb,
+            "over_limit": bool(self.rss_mb and self.max_memory_mb and self.rss_mb > self.max_memory_mb),
+            "sampled_at": self.sampled_at.isoformat() if self.sampled_at else None,
+            "recycles": self.recycles,
+        }
+
+
+# Global singleton instance
+_browser_watchdog: Optional[BrowserMemoryWatchdog] = None
+
+
+def get_browser_watchdog() -> BrowserMemoryWatchdog:
+    """Get the global browser memory watchdog."""
+    global _browser_watchdog
+    if _browser_watchdog is None:
+        settings = get_settings()
+        _browser_watchdog = BrowserMemoryWatchdog(
+            max_memory_mb=settings.browser_max_memory_mb,
+            interval_seconds=settings.browser_watchdog_interval_seconds
+        )
+    return _browser_watchdog
@@ -1,12 +1,91 @@
 """Chrome operation lock manager for preventing concurrent browser access."""
 import asyncio
 import logging
-from datetime import datetime
-from typing import Optional, Dict, Any
+from bisect import bisect_left
+from collections import deque
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from enum import IntEnum
+from typing import Optional, Dict, Any, Awaitable, Deque, List, Tuple, TypeVar
 from dataclasses import dataclass, field
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
+# Hold time assumed for an operation that has never held the lock
+DEFAULT_HOLD_ESTIMATE_SECONDS = 60.0
+
+# Recent hold durations kept per operation for wait estimates
+HOLD_HISTORY_SIZE = 20
+
+# Upper bounds (seconds) of the wait/hold histogram buckets; one more bucket catches the rest
+HISTOGRAM_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800)
+
+# How long hourly lock summaries are kept in the database
+TELEMETRY_RETENTION_DAYS = 30
+
+
+class LockPriority(IntEnum):
+    """Who gets Chrome first when several operations are waiting (higher wins)."""
+    SCRAPE = 1    # Scheduled scraping - long, and can wait
+    MANUAL = 2    # Admin-triggered work (test scrapes, logins)
+    PUBLISH = 3   # Posting - golden-hour posts lose value by the minute
+
+
+class ChromeLockTimeout(TimeoutError):
+    """Raised when a waiter's deadline passes before it gets the Chrome lock."""
+
+
+class DurationHistogram:
+    """Fixed-bucket histogram of durations (constant memory however many samples)."""
+    
+    def __init__(self, buckets: Tuple[float, ...] = HISTOGRAM_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+    
+    def record(self, seconds: float) -> None:
+        self.counts[bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+    
+    def percentile(self, pct: float) -> Optional[float]:
+        """Upper bound of the bucket holding the pct-th sample (capped at the max seen)."""
+        if not self.count:
+            return None
+        rank = max(1, pct / 100 * self.count)
+        cumulative = 0
+        for i, bucket_count in enumerate(self.counts):
+            cumulative += bucket_count
+            if cumulative >= rank:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+    
+    def get_status_dict(self) -> dict:
+        labels = [f"<={bound}s" for bound in self.buckets] + [f">{self.buckets[-1]}s"]
+        p50, p95 = self.percentile(50), self.percentile(95)
+        return {
+            "count": self.count,
+            "total_seconds": round(self.total, 1),
+            "mean_seconds": round(self.total / self.count, 1) if self.count else None,
+            "p50_seconds": round(p50, 1) if p50 is not None else None,
+            "p95_seconds": round(p95, 1) if p95 is not None else None,
+            "max_seconds": round(self.max, 1),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+@dataclass
+class _OperationTelemetry:
+    """In-memory wait/hold histograms for one operation type (since startup)."""
+    wait: DurationHistogram = field(default_factory=DurationHistogram)
+    hold: DurationHistogram = field(default_factory=DurationHistogram)
+    timeouts: int = 0
+
 
 @dataclass
 class ChromeLockStatus:
@@ -16,7 +95,21 @@ class ChromeLockStatus:
     started_at: Optional[datetime] = None
     current_progress: Optional[str] = None  # e.g., "Processing @handle 3/10"
     locked_by: Optional[str] = None  # Task/request ID for debugging
-    
+    priority: Optional[LockPriority] = None
+
+
+@dataclass
+class _Waiter:
+    """One queued acquire() call."""
+    operation: str
+    locked_by: str
+    priority: LockPriority
+    seq: int
+    future: asyncio.Future
+    task: Optional[asyncio.Task]
+    enqueued_at: datetime
+    deadline: Optional[datetime] = None
+
 
 class ChromeLockManager:
     """
@@ -28,14 +121,27 @@ class ChromeLockManager:
     - Manual login attempts
     - Email approval actions
     
-    Uses asyncio.Lock for thread-safe operation coordination.
+    Waiters are served by priority (publish > manual > scrape), FIFO within
+    a class, and may give up after a deadline. The lock is handed directly
+    to the next waiter on release, so nothing can barge in between. Long
+    holders call yield_point() at safe points (or run their work under a
+    SharedHold) to let higher-priority waiters run.
     Provides status tracking for admin dashboard visibility.
     """
     
     def __init__(self):
-        self._lock = asyncio.Lock()
+        self._held = False
         self._status = ChromeLockStatus()
-        self._waiters = 0  # Number of tasks waiting for lock
+        self._queue: List[_Waiter] = []
+        self._seq = 0
+        self._acquired_at: Optional[datetime] = None
+        self._owner: Optional[asyncio.Task] = None
+        self._hold_history: Dict[str, Deque[float]] = {}
+        self._telemetry: Dict[str, _OperationTelemetry] = {}
+        # Hourly totals not yet written to the database, keyed by (operation, UTC hour)
+        self._pending_summary: Dict[Tuple[str, datetime], Dict[str, float]] = {}
+        # Set while a queued waiter outranks the holder
+        self._preempt_requested = asyncio.Event()
         
     @property
     def status(self) -> ChromeLockStatus:
@@ -45,51 +151,180 @@ class ChromeLockManager:
             operation=self._status.operation,
             started_at=self._status.started_at,
             current_progress=self._status.current_progress,
-            locked_by=self._status.locked_by
+            locked_by=self._status.locked_by,
+            priority=self._status.priority
         )
     
     @property
     def waiters_count(self) -> int:
         """Get number of tasks waiting for the lock."""
-        return self._waiters
+        return len(self._queue)
+    
+    def _ordered_queue(self) -> List[_Waiter]:
+        """Waiters in the order they will get the lock."""
+        return sorted(self._queue, key=lambda w: (-w.priority, w.seq))
     
-    async def acquire(self, operation: str, locked_by: str = "unknown") -> None:
+    def _update_preempt_flag(self) -> None:
+        if self._held and any(w.priority > self._status.priority for w in self._queue):
+            self._preempt_requested.set()
+        else:
+            self._preempt_requested.clear()
+    
+    def _grant(self, operation: str, locked_by: str, priority: LockPriority, owner: Optional[asyncio.Task]) -> None:
+        """Mark the lock as held by an operation."""
+        self._held = True
+        self._owner = owner
+        self._acquired_at = datetime.now()
+        self._status.is_locked = True
+        self._status.operation = operation
+        self._status.started_at = self._acquired_at
+        self._status.current_progress = None
+        self._status.locked_by = locked_by
+        self._status.priority = priority
+        self._update_preempt_flag()
+    
+    async def acquire(
+        self,
+        operation: str,
+        locked_by: str = "unknown",
+        priority: LockPriority = LockPriority.MANUAL,
+        timeout: Optional[float] = None
+    ) -> None:
         """
         Acquire the Chrome lock for an operation.
         
         Args:
             operation: Description of operation (e.g., "scraping", "posting")
             locked_by: Identifier for debugging (task ID, endpoint name, etc.)
+            priority: Queue class - higher priorities are served first
+            timeout: Give up after this many seconds of waiting (None = wait forever)
+        
+        Raises:
+            ChromeLockTimeout: The deadline passed while still queued
         """
-        self._waiters += 1
-        try:
-            logger.info(f"🔒 [{locked_by}] Waiting for Chrome lock... ({self._waiters} waiting)")
-            await self._lock.acquire()
-            
-            self._status.is_locked = True
-            self._status.operation = operation
-            self._status.started_at = datetime.now()
-            self._status.current_progress = None
-            self._status.locked_by = locked_by
-            
+        if not self._held and not self._queue:
+            self._grant(operation, locked_by, priority, asyncio.current_task())
+            self._record_wait(operation, 0.0)
             logger.info(f"✅ [{locked_by}] Chrome lock acquired for: {operation}")
-        finally:
-            self._waiters -= 1
+            return
+        
+        self._seq += 1
+        now = datetime.now()
+        waiter = _Waiter(
+            operation=operation,
+            locked_by=locked_by,
+            priority=priority,
+            seq=self._seq,
+            future=asyncio.get_running_loop().create_future(),
+            task=asyncio.current_task(),
+            enqueued_at=now,
+            deadline=now + timedelta(seconds=timeout) if timeout is not None else None
+        )
+        self._queue.append(waiter)
+        self._update_preempt_flag()
+        
+        position = self._ordered_queue().index(waiter) + 1
+        logger.info(
+            f"🔒 [{locked_by}] Waiting for Chrome lock... "
+            f"(position {position}/{len(self._queue)}, priority {priority.name}, held by {self._status.locked_by})"
+        )
+        
+        try:
+            # wait() (unlike wait_for) never cancels the future, so a grant
+            # racing the deadline or a cancellation can be detected below
+            await asyncio.wait({waiter.future}, timeout=timeout)
+        except asyncio.CancelledError:
+            if waiter.future.done():
+                # Granted just as we were cancelled - pass it on
+                self.release()
+            else:
+                self._remove_waiter(waiter)
+            raise
+        
+        if not waiter.future.done():
+            self._remove_waiter(waiter)
+            self._record_timeout(operation)
+            logger.warning(f"⌛ [{locked_by}] Gave up waiting for Chrome lock after {timeout:.0f}s")
+            raise ChromeLockTimeout(f"Chrome lock not available within {timeout:.0f}s (held by {self._status.locked_by})")
+        
+        waited_seconds = (datetime.now() - waiter.enqueued_at).total_seconds()
+        self._record_wait(operation, waited_seconds)
+        logger.info(f"✅ [{locked_by}] Chrome lock acquired for: {operation} (waited {waited_seconds:.1f}s)")
+    
+    def _remove_waiter(self, waiter: _Waiter) -> None:
+        if waiter in self._queue:
+            self._queue.remove(waiter)
+        waiter.future.cancel()
+        self._update_preempt_flag()
     
     def release(self) -> None:
-        """Release the Chrome lock."""
-        if self._lock.locked():
-            locked_by = self._status.locked_by
-            operation = self._status.operation
-            
-            self._status.is_locked = False
-            self._status.operation = None
-            self._status.started_at = None
-            self._status.current_progress = None
-            self._status.locked_by = None
-            
-            self._lock.release()
-            logger.info(f"🔓 [{locked_by}] Chrome lock released for: {operation}")
+        """Release the Chrome lock (handing it straight to the next waiter, if any)."""
+        if not self._held:
+            return
+        if self._owner is not None and asyncio.current_task() is not self._owner:
+            # e.g. a holder cancelled while re-queued in yield_point(): the lock is someone else's now
+            logger.warning(f"⚠️  Ignoring Chrome lock release from a task that doesn't hold it (held by {self._status.locked_by})")
+            return
+        
+        locked_by = self._status.locked_by
+        operation = self._status.operation
+        held_seconds = (datetime.now() - self._acquired_at).total_seconds()
+        self._hold_history.setdefault(operation, deque(maxlen=HOLD_HISTORY_SIZE)).append(held_seconds)
+        self._record_hold(operation, held_seconds)
+        
+        self._held = False
+        self._status.is_locked = False
+        self._status.operation = None
+        self._status.started_at = None
+        self._status.current_progress = None
+        self._status.locked_by = None
+        self._status.priority = None
+        self._acquired_at = None
+        self._owner = None
+        
+        logger.info(f"🔓 [{locked_by}] Chrome lock released for: {operation}")
+        
+        for waiter in self._ordered_queue():
+            self._queue.remove(waiter)
+            if waiter.future.done():
+                continue
+            self._grant(waiter.operation, waiter.locked_by, waiter.priority, waiter.task)
+            waiter.future.set_result(True)
+            return
+        
+        self._update_preempt_flag()
+    
+    def should_yield(self) -> bool:
+        """Whether a queued waiter outranks the current holder."""
+        return self._preempt_requested.is_set()
+    
+    async def yield_point(self) -> bool:
+        """
+        Let higher-priority waiters run, then take the lock back.
+        
+        Call only from the holder, at a point where Chrome is not mid-action
+        (e.g. between handles). A no-op when nobody outranks the holder.
+        
+        Returns:
+            True if the lock was handed over and re-acquired
+        """
+        if not self._held or not self.should_yield():
+            return False
+        
+        operation = self._status.operation
+        locked_by = self._status.locked_by
+        priority = self._status.priority
+        progress = self._status.current_progress
+        
+        logger.info(f"⏸️  [{locked_by}] Yielding Chrome lock to higher-priority work")
+        self.release()
+        await self.acquire(operation=operation, locked_by=locked_by, priority=priority)
+        self._status.current_progress = progress
+        return True
+    
+    async def wait_for_yield_request(self) -> None:
+        """Block until a queued waiter outranks the current holder."""
+        await self._preempt_requested.wait()
     
     def update_progress(self, progress: str) -> None:
         """
@@ -102,30 +337,192 @@ class ChromeLockManager:
             self._status.current_progress = progress
             logger.debug(f"📊 Progress update: {progress}")
     
+    def _summary_bucket(self, operation: str) -> Dict[str, float]:
+        """Pending DB totals for an operation in the current UTC hour."""
+        window_start = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        return self._pending_summary.setdefault((operation, window_start), {
+            "acquisitions": 0,
+            "timeouts": 0,
+            "total_wait_seconds": 0.0,
+            "max_wait_seconds": 0.0,
+            "total_hold_seconds": 0.0,
+            "max_hold_seconds": 0.0,
+        })
+    
+    def _record_wait(self, operation: str, seconds: float) -> None:
+        self._telemetry.setdefault(operation, _OperationTelemetry()).wait.record(seconds)
+        bucket = self._summary_bucket(operation)
+        bucket["acquisitions"] += 1
+        bucket["total_wait_seconds"] += seconds
+        bucket["max_wait_seconds"] = max(bucket["max_wait_seconds"], seconds)
+    
+    def _record_hold(self, operation: str, seconds: float) -> None:
+        self._telemetry.setdefault(operation, _OperationTelemetry()).hold.record(seconds)
+        bucket = self._summary_bucket(operation)
+        bucket["total_hold_seconds"] += seconds
+        bucket["max_hold_seconds"] = max(bucket["max_hold_seconds"], seconds)
+    
+    def _record_timeout(self, operation: str) -> None:
+        self._telemetry.setdefault(operation, _OperationTelemetry()).timeouts += 1
+        self._summary_bucket(operation)["timeouts"] += 1
+    
+    def take_pending_summary(self) -> Dict[Tuple[str, datetime], Dict[str, float]]:
+        """Hand over (and forget) the hourly totals recorded since the last call."""
+        pending, self._pending_summary = self._pending_summary, {}
+        return pending
+    
+    def get_telemetry_dict(self) -> Dict[str, Any]:
+        """
+        Wait/hold histograms per operation type since startup.
+        
+        A yield_point() hand-over counts as a release plus a fresh acquire,
+        so a long scrape shows up as several holds.
+        
+        Returns:
+            dict: Per operation - wait and hold histograms, deadline timeouts,
+            and its share of total browser hold time
+        """
+        total_hold = sum(t.hold.total for t in self._telemetry.values())
+        return {
+            operation: {
+                "wait": telemetry.wait.get_status_dict(),
+                "hold": telemetry.hold.get_status_dict(),
+                "timeouts": telemetry.timeouts,
+                "hold_share": round(telemetry.hold.total / total_hold, 3) if total_hold else None,
+            }
+            for operation, telemetry in self._telemetry.items()
+        }
+    
+    def _hold_estimate(self, operation: str) -> float:
+        """Mean recent hold time of an operation (seconds)."""
+        history = self._hold_history.get(operation)
+        if not history:
+            return DEFAULT_HOLD_ESTIMATE_SECONDS
+        return sum(history) / len(history)
+    
     def get_status_dict(self) -> Dict[str, Any]:
         """
         Get lock status as dictionary for API responses.
         
         Returns:
-            dict: Status information including lock state, operation, progress, etc.
+            dict: Status information including lock state, operation, progress,
+            and the wait queue with each waiter's position and expected wait
         """
         status = self.status
+        now = datetime.now()
         elapsed_seconds = None
         
         if status.started_at:
-            elapsed_seconds = int((datetime.now() - status.started_at).total_seconds())
+            elapsed_seconds = int((now - status.started_at).total_seconds())
+        
+        # Expected wait: what's left of the current hold plus the holds queued ahead
+        ahead_seconds = 0.0
+        if status.is_locked:
+            ahead_seconds = max(0.0, self._hold_estimate(status.operation) - (elapsed_seconds or 0))
+        
+        queue = []
+        for position, waiter in enumerate(self._ordered_queue(), 1):
+            queue.append({
+                "position": position,
+                "operation": waiter.operation,
+                "locked_by": waiter.locked_by,
+                "priority": waiter.priority.name,
+                "waiting_seconds": int((now - waiter.enqueued_at).total_seconds()),
+                "expected_wait_seconds": int(ahead_seconds),
+                "deadline_in_seconds": int((waiter.deadline - now).total_seconds()) if waiter.deadline else None,
+            })
+            ahead_seconds += self._hold_estimate(waiter.operation)
         
         return {
             "is_locked": status.is_locked,
             "operation": status.operation,
+            "priority": status.priority.name if status.priority else None,
             "started_at": status.started_at.isoformat() if status.started_at else None,
             "elapsed_seconds": elapsed_seconds,
             "current_progress": status.current_progress,
             "locked_by": status.locked_by,
-            "waiters": self._waiters
+            "waiters": len(self._queue),
+            "yield_requested": self.should_yield(),
+            "queue": queue
         }
 
 
+class SharedHold:
+    """
+    One Chrome lock hold shared by several tasks (e.g. parallel scraping tabs).
+    
+    The holding task runs the work through run(); the tasks wrap each stretch
+    of browser activity in `async with hold.busy():` and do their idle time
+    (humanizing delays) outside it. When a higher-priority waiter queues up,
+    new browser activity is held back and, once no task is busy, the lock
+    is handed over with yield_point() and taken back. With a single task this
+    means a publish gets Chrome during the scrape's between-profile pause.
+    """
+    
+    def __init__(self, lock: ChromeLockManager):
+        self.lock = lock
+        self.busy_count = 0
+        self._draining = False
+        self._condition = asyncio.Condition()
+    
+    @asynccontextmanager
+    async def busy(self):
+        """Mark a stretch of browser activity (waits while a hand-over is pending)."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._draining)
+            self.busy_count += 1
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self.busy_count -= 1
+                self._condition.notify_all()
+    
+    @asynccontextmanager
+    async def exclusive(self):
+        """
+        Stop new browser activity and wait for in-flight stretches to finish.
+        
+        For work that needs the whole browser to itself, like handing the
+        lock over or restarting Chromium. Must not be entered from inside busy().
+        """
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._draining)
+            self._draining = True
+            await self._condition.wait_for(lambda: self.busy_count == 0)
+        try:
+            yield
+        finally:
+            async with self._condition:
+                self._draining = False
+                self._condition.notify_all()
+    
+    async def run(self, awaitable: Awaitable[T]) -> T:
+        """
+        Await the shared work, yielding the lock whenever higher-priority work asks.
+        
+        Must be called by the task that acquired the lock.
+        """
+        work = asyncio.ensure_future(awaitable)
+        try:
+            while not work.done():
+                requested = asyncio.ensure_future(self.lock.wait_for_yield_request())
+                try:
+                    await asyncio.wait({work, requested}, return_when=asyncio.FIRST_COMPLETED)
+                finally:
+                    requested.cancel()
+                if work.done():
+                    break
+                
+                async with self.exclusive():
+                    if not work.done():
+                        await self.lock.yield_point()
+        finally:
+            if not work.done():
+                work.cancel()
+        return work.result()
+
+
 # Global singleton instance
 _chrome_lock_manager: Optional[ChromeLockManager] = None
 
@@ -136,3 +533,105 @@ def get_chrome_lock() -> ChromeLockManager:
     if _chrome_lock_manager is None:
         _chrome_lock_manager = ChromeLockManager()
     return _chrome_lock_manager
+
+
+async def flush_lock_telemetry() -> None:
+    """
+    Add the lock's pending hourly totals to chrome_lock_stats and prune old rows.
+    
+    Runs periodically from the scheduler and once at shutdown. Never raises;
+    totals that fail to save are dropped (it's telemetry).
+    """
+    from sqlalchemy import select, delete
+    from app.database import get_session
+    from app.models import ChromeLockStats
+    
+    pending = get_chrome_lock().take_pending_summary()
+    
+    try:
+        async with await get_session() as db:
+            for (operation, window_start), totals in pending.items():
+                result = await db.execute(
+                    select(ChromeLockStats).where(
+                        ChromeLockStats.operation == operation,
+                        ChromeLockStats.window_start == window_start
+                    )
+                )
+                row = result.scalar_one_or_none()
+                if row is None:
+                    row = ChromeLockStats(
+                        operation=operation,
+                        window_start=window_start,
+                        acquisitions=0,
+                        timeouts=0,
+                        total_wait_seconds=0.0,
+                        max_wait_seconds=0.0,
+                        total_hold_seconds=0.0,
+                        max_hold_seconds=0.0
+                    )
+                    db.add(row)
+                
+                row.acquisitions += int(totals["acquisitions"])
+                row.timeouts += int(totals["timeouts"])
+                row.total_wait_seconds += totals["total_wait_seconds"]
+                row.max_wait_seconds = max(row.max_wait_seconds, totals["max_wait_seconds"])
+                row.total_hold_seconds += totals["total_hold_seconds"]
+                row.max_hold_seconds = max(row.max_hold_seconds, totals["max_hold_seconds"])
+            
+            cutoff = datetime.utcnow() - timedelta(days=TELEMETRY_RETENTION_DAYS)
+            await db.execute(delete(ChromeLockStats).where(ChromeLockStats.window_start < cutoff))
+            await db.commit()
+        
+        if pending:
+            logger.debug(f"📊 Saved Chrome lock telemetry for {len(pending)} operation-hours")
+            
+    except Exception as e:
+        logger.warning(f"⚠️  Could not save Chrome lock telemetry: {e}")
+
+
+async def get_lock_telemetry_summary(db, hours: int = 24) -> Dict[str, Any]:
+    """
+    Per-operation lock totals from chrome_lock_stats over the last N hours.
+    
+    Args:
+        db: Database session
+        hours: Window to summarise
+    
+    Returns:
+        dict: Per operation - acquisitions, timeouts, mean/max wait and hold, hold share
+    """
+    from sqlalchemy import select, func
+    from app.models import ChromeLockStats
+    
+    since = datetime.utcnow() - timedelta(hours=hours)
+    result = await db.execute(
+        select(
+            ChromeLockStats.operation,
+            func.sum(ChromeLockStats.acquisitions),
+            func.sum(ChromeLockStats.timeouts),
+            func.sum(ChromeLockStats.total_wait_seconds),
+            func.max(ChromeLockStats.max_wait_seconds),
+            func.sum(ChromeLockStats.total_hold_seconds),
+            func.max(ChromeLockStats.max_hold_seconds)
+        )
+        .where(ChromeLockStats.window_start >= since)
+        .group_by(ChromeLockStats.operation)
+    )
+    rows = result.all()
+    total_hold = sum(row[5] or 0.0 for row in rows)
+    
+    return {
+        "hours": hours,
+        "operations": {
+            operation: {
+                "acquisitions": acquisitions,
+                "timeouts": timeouts,
+                "mean_wait_seconds": round(total_wait / acquisitions, 1) if acquisitions else None,
+                "max_wait_seconds": round(max_wait, 1),
+                "total_hold_seconds": round(total_hold_seconds, 1),
+                "max_hold_seconds": round(max_hold, 1),
+                "hold_share": round(total_hold_seconds / total_hold, 3) if total_hold else None,
+            }
+            for operation, acquisitions, timeouts, total_wait, max_wait, total_hold_seconds, max_hold in rows
+        }
+    }
@@ -42,6 +42,45 @@ class Settings(BaseSettings):
     scraping_lookback_days: int = 7
     scraping_max_posts_per_handle: int = 50
     auto_like_posts: bool = True  # Auto-like original posts during scraping
+    scraping_capture_network: bool = True  # Parse posts from feed JSON responses (DOM selectors as fallback)
+    scraping_block_resources: bool = True  # Abort media/font/analytics requests while scraping
+    scraping_blocked_resource_types: str = "image,media,font"  # Comma-separated Playwright resource types
+    # Handles scraped in parallel (isolated contexts on one browser). 1 scrapes one profile at a time;
+    # set SCRAPING_MAX_CONCURRENT_TABS=2-3 to opt in (more simultaneous traffic from one LinkedIn account)
+    scraping_max_concurrent_tabs: int = 1
+    
+    # Warm Playwright browser shared across operations (recycled after N uses or past the memory ceiling)
+    browser_pool_enabled: bool = True
+    browser_pool_max_operations: int = 50
+    
+    # Chromium memory ceiling: browsers over it are restarted at the next safe point (0 = no limit)
+    browser_max_memory_mb: int = 1500
+    browser_watchdog_interval_seconds: int = 30
+    
+    # Chrome lock: how long a publish waits for the browser before giving up (next 5-min run retries)
+    chrome_lock_publish_timeout_seconds: int = 270
+    
+    # Scrape pipeline configuration
+    pipeline_generation_workers: int = 3  # Concurrent AI generation workers
+    pipeline_queue_size: int = 10  # Bound on posts waiting between stages (backpressure)
+    
+    # AI request concurrency (adapts between min and max on 429s / sustained success)
+    ai_max_concurrency: int = 4
+    ai_min_concurrency: int = 1
+    ai_rate_limit_retries: int = 3
+    ai_batch_size: int = 4  # Posts packed into one completion request (1 = no packing)
+    ai_hedge_requests: bool = False  # Race a second provider when the first passes its p95 latency
+    
+    # Outbound API rate limits (requests per minute, 0 = only honour Retry-After / x-ratelimit-* headers)
+    rate_limit_github_models_per_minute: int = 15
+    rate_limit_copilot_per_minute: int = 60
+    rate_limit_github_api_per_minute: int = 30
+    rate_limit_postal_per_minute: int = 120
+    
+    # AI generation cache (identical prompts reuse the stored completion)
+    ai_cache_enabled: bool = True
+    ai_cache_ttl_days: int = 30
+    ai_cache_max_entries: int = 5000
     
     # Posting intelligence configuration
     daily_post_limit: int = 3
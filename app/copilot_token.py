@@ -0,0 +1,215 @@
+"""Expiry-aware cache for the GitHub Copilot API bearer token."""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Stored next to the main SQLite database (see app/database.py)
+DEFAULT_TOKEN_PATH = Path("./data/copilot_token.json")
+
+# Refresh this long before expiry, so requests never see a lapsed token
+REFRESH_MARGIN_SECONDS = 300
+
+# A token this close to expiry is not handed out at all
+EXPIRY_SKEW_SECONDS = 30
+
+# Assumed lifetime when the exchange response has no expires_at
+DEFAULT_TOKEN_LIFETIME_SECONDS = 25 * 60
+
+# Retry delay after a failed background refresh
+REFRESH_RETRY_SECONDS = 60
+
+
+def _fingerprint(refresh_token: str) -> str:
+    """Short hash tying a persisted token to the refresh token that produced it."""
+    return hashlib.sha256(refresh_token.encode('utf-8')).hexdigest()[:16]
+
+
+class CopilotTokenManager:
+    """
+    Exchanges a GitHub refresh token (ghu_*) for Copilot API bearer tokens.
+    
+    The token's expires_at is tracked and a refresh is scheduled
+    REFRESH_MARGIN_SECONDS before it lapses (or at the server's refresh_in
+    hint, if sooner). Concurrent callers share one in-flight exchange, and
+    the current token is persisted so a restart can reuse it.
+    """
+    
+    def __init__(self, refresh_token: str, token_url: str, path: Optional[Path] = None):
+        """
+        Initialize the token manager.
+        
+        Args:
+            refresh_token: GitHub refresh token (ghu_*)
+            token_url: Copilot token exchange endpoint
+            path: Where to persist the token (default: ./data/copilot_token.json)
+        """
+        self.refresh_token = refresh_token
+        self.token_url = token_url
+        self.path = Path(path) if path else DEFAULT_TOKEN_PATH
+        self.token: Optional[str] = None
+        self.expires_at = 0.0
+        self.refresh_count = 0
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_timer: Optional[asyncio.TimerHandle] = None
+        
+        self._load()
+    
+    @property
+    def is_valid(self) -> bool:
+        """Whether the cached token can still be used."""
+        return bool(self.token) and time.time() < self.expires_at - EXPIRY_SKEW_SECONDS
+    
+    @property
+    def needs_refresh(self) -> bool:
+        """Whether the cached token is inside the refresh margin."""
+        return time.time() >= self.expires_at - REFRESH_MARGIN_SECONDS
+    
+    async def get_token(self) -> Optional[str]:
+        """
+        Get a usable bearer token.
+        
+        A valid token is returned immediately (kicking off a background
+        refresh if it is close to expiry); otherwise the caller waits for
+        the shared exchange.
+        
+        Returns:
+            Bearer token, or None if the exchange failed
+        """
+        if self.is_valid:
+            if self.needs_refresh:
+                self._start_refresh()
+            elif self._refresh_timer is None:
+                # Loaded from disk before the event loop was running
+                self._schedule_refresh(self.expires_at - time.time() - REFRESH_MARGIN_SECONDS)
+            return self.token
+        
+        # shield(): a cancelled caller must not cancel the exchange other callers wait on
+        return await asyncio.shield(self._start_refresh())
+    
+    def invalidate(self) -> None:
+        """Drop the cached token (e.g. after a 401) so the next call re-exchanges."""
+        if self.token:
+            logger.warning("🔑 Copilot bearer token rejected, will re-exchange")
+        self.token = None
+        self.expires_at = 0.0
+    
+    def _start_refresh(self) -> asyncio.Task:
+        """Start an exchange, or return the one already in flight (single-flight)."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._exchange())
+        return self._refresh_task
+    
+    def _schedule_refresh(self, delay: float) -> None:
+        """Arrange a background refresh after delay seconds (replaces any pending one)."""
+        if self._refresh_timer:
+            self._refresh_timer.cancel()
+        self._refresh_timer = asyncio.get_running_loop().call_later(max(0.0, delay), self._start_refresh)
+    
+    async def _exchange(self) -> Optional[str]:
+        """Exchange the refresh token for a new bearer token. Never raises."""
+        from app.http_clients import get_http_client
+        
+        try:
+            logger.info("   Exchanging refresh token for Copilot API bearer token...")
+            
+            headers = {
+                "Authorization": f"token {self.refresh_token}",
+                "Accept": "application/json",
+                "User-Agent": "GitHubCopilotChat/0.11.1"
+            }
+            
+            client = get_http_client("github_api")
+            response = await client.get(
+                self.token_url,
+                headers=headers,
+                timeout=30.0
+            )
+            
+            logger.info(f"   Token exchange: {response.status_code}")
+            
+            data = response.json() if response.status_code == 200 else {}
+            if 'token' not in data:
+                logger.warning(f"   Token exchange failed: {response.text[:200]}")
+                self._schedule_refresh(REFRESH_RETRY_SECONDS)
+                return self.token if self.is_valid else None
+            
+            now = time.time()
+            self.token = data['token']
+            self.expires_at = float(data.get('expires_at') or now + DEFAULT_TOKEN_LIFETIME_SECONDS)
+            self.refresh_count += 1
+            self._save()
+            
+            # Refresh before expiry, or earlier if the server asks for it
+            refresh_delay = self.expires_at - now - REFRESH_MARGIN_SECONDS
+            if data.get('refresh_in'):
+                refresh_delay = min(refresh_delay, float(data['refresh_in']))
+            self._schedule_refresh(refresh_delay)
+            
+            logger.info(
+                f"   ✅ Got Copilot API bearer token (expires in {(self.expires_at - now) / 60:.0f} min, "
+                f"next refresh in {max(0.0, refresh_delay) / 60:.0f} min)"
+            )
+            return self.token
+            
+        except Exception as e:
+            logger.warning(f"   Token exchange error: {e}")
+            self._schedule_refresh(REFRESH_RETRY_SECONDS)
+            return self.token if self.is_valid else None
+    
+    def _load(self) -> None:
+        """Reuse a persisted token if it belongs to this refresh token and hasn't expired."""
+        try:
+            if not self.path.exists():
+                return
+            state = json.loads(self.path.read_text())
+            if state.get('refresh_token_fingerprint') != _fingerprint(self.refresh_token):
+                return
+            
+            self.token = state.get('token')
+            self.expires_at = float(state.get('expires_at') or 0)
+            if self.is_valid:
+                logger.info(f"🔑 Loaded persisted Copilot bearer token (expires in {(self.expires_at - time.time()) / 60:.0f} min)")
+                try:
+                    asyncio.get_running_loop()
+                except RuntimeError:
+                    return  # No loop yet - get_token() schedules the refresh on first use
+                self._schedule_refresh(self.expires_at - time.time() - REFRESH_MARGIN_SECONDS)
+            else:
+                self.token = None
+                self.expires_at = 0.0
+                
+        except Exception as e:
+            logger.warning(f"⚠️  Could not load persisted Copilot token: {e}")
+    
+    def _save(self) -> None:
+        """Persist the current token atomically, readable by the owner only."""
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump({
+                    'token': self.token,
+                    'expires_at': self.expires_at,
+                    'refresh_token_fingerprint': _fingerprint(self.refresh_token),
+                }, f)
+            os.replace(tmp_path, self.path)
+            
+        except Exception as e:
+            logger.warning(f"⚠️  Could not persist Copilot token: {e}")
+    
+    def get_status_dict(self) -> dict:
+        """Token freshness for status endpoints (never includes the token itself)."""
+        return {
+            "has_token": bool(self.token),
+            "expires_in_seconds": round(self.expires_at - time.time()) if self.token else None,
+            "refresh_in_flight": bool(self._refresh_task and not self._refresh_task.done()),
+            "refresh_count": self.refresh_count,
+        }
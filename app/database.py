@@ -2,7 +2,7 @@
 from typing import AsyncGenerator
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy.pool import StaticPool
-from sqlalchemy import event, text
+from sqlalchemy import event, text, inspect
 from .models import Base
 from .config import get_settings
 import logging
@@ -22,6 +22,183 @@ def get_database_url() -> str:
     return "sqlite+aiosqlite:///./data/linkedin_reposter.db"
 
 
+# Columns added after the initial schema. create_all() never alters existing
+# tables, so these are added with ALTER TABLE on startup when missing.
+# (table, column, column DDL, index type: None / "index" / "unique")
+SCHEMA_MIGRATIONS = [
+    ("linkedin_posts", "content_hash", "VARCHAR(64)", "index"),
+    ("linkedin_posts", "activity_urn", "VARCHAR(100)", "unique"),
+    ("monitored_handles", "last_seen_activity_urn", "VARCHAR(100)", None),
+    ("monitored_handles", "last_seen_post_at", "DATETIME", None),
+    ("linkedin_posts", "pending_generation", "BOOLEAN DEFAULT 0", None),
+]
+
+
+def _apply_schema_migrations(sync_conn) -> None:
+    """Add any missing columns/indexes to existing tables (sync, run via run_sync)."""
+    inspector = inspect(sync_conn)
+    
+    for table, column, ddl, index_type in SCHEMA_MIGRATIONS:
+        existing_columns = {col["name"] for col in inspector.get_columns(table)}
+        if column in existing_columns:
+            continue
+        
+        logger.info(f"🔧 Migrating: adding {table}.{column}")
+        sync_conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+        if index_type:
+            unique = "UNIQUE " if index_type == "unique" else ""
+            sync_conn.execute(text(f"CREATE {unique}INDEX IF NOT EXISTS ix_{table}_{column} ON {table} ({column})"))
+
+
+def _backfill_content_hashes(sync_conn) -> None:
+    """Fill linkedin_posts.content_hash for rows inserted before the column existed."""
+    from .utils import content_fingerprint
+    
+    rows = sync_conn.execute(
+        text("SELECT id, original_content FROM linkedin_posts WHERE content_hash IS NULL")
+    ).fetchall()
+    
+    if not rows:
+        return
+    
+    # Posts with no hashable text keep a NULL hash
+    updates = [
+        {"id": row[0], "content_hash": content_hash}
+        for row in rows
+        if (content_hash := content_fingerprint(row[1] or "")) is not None
+    ]
+    if not updates:
+        return
+    
+    sync_conn.execute(
+        text("UPDATE linkedin_posts SET content_hash = :content_hash WHERE id = :id"),
+        updates
+    )
+    logger.info(f"🔧 Backfilled content_hash for {len(updates)} posts")
+
+
+def _backfill_activity_urns(sync_conn) -> None:
+    """Fill linkedin_posts.activity_urn from stored post URLs (first row wins on duplicates)."""
+    from .linkedin_ids import to_activity_urn
+    
+    taken = {
+        row[0] for row in sync_conn.execute(
+            text("SELECT activity_urn FROM linkedin_posts WHERE activity_urn IS NOT NULL")
+        )
+    }
+    rows = sync_conn.execute(
+        text("SELECT id, original_post_url FROM linkedin_posts WHERE activity_urn IS NULL ORDER BY id")
+    ).fetchall()
+    
+    updates = []
+    for post_id, url in rows:
+        urn = to_activity_urn(url)
+        if urn and urn not in taken:
+            taken.add(urn)
+            updates.append({"id": post_id, "activity_urn": urn})
+    
+    if not updates:
+        return
+    
+    sync_conn.execute(
+        text("UPDATE linkedin_posts SET activity_urn = :activity_urn WHERE id = :id"),
+        updates
+    )
+    logger.info(f"🔧 Backfilled activity_urn for {len(updates)} posts")
+
+
+def _backfill_post_dates_from_urns(sync_conn) -> None:
+    """Replace approximate relative-time post dates with the exact time encoded in the activity ID."""
+    from datetime import datetime
+    from .linkedin_ids import activity_timestamp
+    
+    rows = sync_conn.execute(
+        text("SELECT id, activity_urn, original_post_date FROM linkedin_posts WHERE activity_urn IS NOT NULL")
+    ).fetchall()
+    
+    updates = []
+    for post_id, urn, stored_date in rows:
+        exact = activity_timestamp(urn)
+        if exact is None:
+            continue
+        if isinstance(stored_date, str):
+            stored_date = datetime.fromisoformat(stored_date)
+        if stored_date is None or abs((stored_date - exact).total_seconds()) > 1:
+            updates.append({"id": post_id, "original_post_date": exact})
+    
+    if not updates:
+        return
+    
+    sync_conn.execute(
+        text("UPDATE linkedin_posts SET original_post_date = :original_post_date WHERE id = :id"),
+        updates
+    )
+    logger.info(f"🔧 Corrected original_post_date from activity IDs for {len(updates)} posts")
+
+
+def _backfill_scrape_watermarks(sync_conn) -> None:
+    """Seed each handle's scrape watermark with the newest activity URN already stored."""
+    from .linkedin_ids import parse_activity_id, activity_timestamp
+    
+    handles = {
+        row[0] for row in sync_conn.execute(
+            text("SELECT handle FROM monitored_handles WHERE last_seen_activity_urn IS NULL")
+        )
+    }
+    if not handles:
+        return
+    
+    newest = {}
+    for handle, urn in sync_conn.execute(
+        text("SELECT author_handle, activity_urn FROM linkedin_posts WHERE activity_urn IS NOT NULL")
+    ):
+        activity_id = parse_activity_id(urn)
+        if handle in handles and activity_id and activity_id > newest.get(handle, (0, None))[0]:
+            newest[handle] = (activity_id, urn)
+    
+    if not newest:
+        return
+    
+    sync_conn.execute(
+        text(
+            "UPDATE monitored_handles SET last_seen_activity_urn = :urn, last_seen_post_at = :posted_at "
+            "WHERE handle = :handle"
+        ),
+        [{"handle": h, "urn": urn, "posted_at": activity_timestamp(urn)} for h, (_, urn) in newest.items()]
+    )
+    logger.info(f"🔧 Seeded scrape watermarks for {len(newest)} handles")
+
+
+# One-off data backfills for rows stored before a column existed. Each is
+# recorded in schema_backfills once it has run, so later boots skip it
+# instead of rescanning linkedin_posts (new rows get these values on insert).
+BACKFILLS = [
+    _backfill_content_hashes,
+    _backfill_activity_urns,
+    _backfill_post_dates_from_urns,
+    _backfill_scrape_watermarks,
+]
+
+
+def _run_backfills(sync_conn) -> None:
+    """Run each backfill in BACKFILLS that hasn't completed yet (sync, run via run_sync)."""
+    sync_conn.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_backfills (name VARCHAR(100) PRIMARY KEY, completed_at DATETIME)"
+    ))
+    completed = {row[0] for row in sync_conn.execute(text("SELECT name FROM schema_backfills"))}
+    
+    for backfill in BACKFILLS:
+        name = backfill.__name__.lstrip("_")
+        if name in completed:
+            continue
+        
+        backfill(sync_conn)
+        sync_conn.execute(
+            text("INSERT INTO schema_backfills (name, completed_at) VALUES (:name, CURRENT_TIMESTAMP)"),
+            {"name": name}
+        )
+
+
 async def init_db() -> None:
     """Initialize the database engine and create tables."""
     global engine, async_session_maker
@@ -63,6 +240,8 @@ async def init_db() -> None:
         # Enable foreign key constraints for this connection
         await conn.execute(text("PRAGMA foreign_keys=ON"))
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(_apply_schema_migrations)
+        await conn.run_sync(_run_backfills)
     
     logger.info("✅ Database initialized successfully")
 
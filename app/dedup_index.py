@@ -0,0 +1,296 @@
+"""Persistent MinHash/LSH index for scrape-time near-duplicate detection."""
+import hashlib
+import logging
+import random
+import re
+import sqlite3
+import struct
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Stored next to the main SQLite database (see app/database.py)
+DEFAULT_INDEX_PATH = Path("./data/near_duplicate_index.db")
+
+# MinHash parameters
+# 64 permutations split into 32 bands of 2 rows puts the LSH threshold around
+# Jaccard 0.18, so re-scrapes with truncated/edited text still collide while
+# unrelated posts from the same author rarely do.
+NUM_PERMUTATIONS = 64
+NUM_BANDS = 32
+SHINGLE_SIZE = 5
+MAX_CANDIDATES = 10
+
+# Posts written per transaction by bulk_add / fetched per query by sync_index_with_db
+# (also keeps IN (...) lists under SQLite's bound-parameter limit)
+BULK_BATCH_SIZE = 500
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _normalize(text: str) -> str:
+    """Lowercase and collapse whitespace so layout differences don't matter."""
+    return re.sub(r'\s+', ' ', text.lower()).strip()
+
+
+def _shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Split normalized text into overlapping character shingles."""
+    normalized = _normalize(text)
+    if len(normalized) <= size:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + size] for i in range(len(normalized) - size + 1)}
+
+
+def _hash_shingle(shingle: str) -> int:
+    """Stable 32-bit hash of a shingle (Python's hash() is salted per process)."""
+    return int.from_bytes(hashlib.blake2b(shingle.encode('utf-8'), digest_size=4).digest(), 'big')
+
+
+class NearDuplicateIndex:
+    """
+    MinHash signatures + LSH buckets persisted in a small SQLite file.
+    
+    Each post is reduced to a fixed-size MinHash signature over character
+    shingles. The signature is split into bands; posts sharing any band bucket
+    become candidates. Lookups are a single indexed IN query, so the cost is
+    independent of how many posts we've scraped historically.
+    
+    The index only narrows the search - callers still confirm candidates with
+    app.utils.fuzzy_match before treating a post as a duplicate.
+    """
+    
+    def __init__(
+        self,
+        path: Optional[Path] = None,
+        num_permutations: int = NUM_PERMUTATIONS,
+        num_bands: int = NUM_BANDS,
+    ):
+        if num_permutations % num_bands != 0:
+            raise ValueError("num_permutations must be divisible by num_bands")
+        
+        self.path = Path(path) if path else DEFAULT_INDEX_PATH
+        self.num_permutations = num_permutations
+        self.num_bands = num_bands
+        self.rows_per_band = num_permutations // num_bands
+        
+        # Fixed seed so signatures stay comparable across restarts
+        rng = random.Random(1337)
+        self._permutations = [
+            (rng.randint(1, _MERSENNE_PRIME - 1), rng.randint(0, _MERSENNE_PRIME - 1))
+            for _ in range(num_permutations)
+        ]
+        
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._create_schema()
+        
+        logger.info(f"🧬 Near-duplicate index ready: {self.path} ({self.count()} posts indexed)")
+    
+    def _create_schema(self) -> None:
+        """Create index tables if they don't exist."""
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                post_id INTEGER PRIMARY KEY,
+                author_handle TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS lsh_buckets (
+                bucket_key TEXT NOT NULL,
+                author_handle TEXT NOT NULL,
+                post_id INTEGER NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS ix_lsh_buckets_key
+                ON lsh_buckets (author_handle, bucket_key);
+            CREATE INDEX IF NOT EXISTS ix_lsh_buckets_post
+                ON lsh_buckets (post_id);
+        """)
+        self._conn.commit()
+    
+    def signature(self, text: str) -> Tuple[int, ...]:
+        """Compute the MinHash signature of a text."""
+        hashes = [_hash_shingle(s) for s in _shingles(text)]
+        if not hashes:
+            return tuple([_MAX_HASH] * self.num_permutations)
+        
+        return tuple(
+            min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._permutations
+        )
+    
+    def _bucket_keys(self, signature: Tuple[int, ...]) -> List[str]:
+        """Hash each band of the signature into a bucket key."""
+        keys = []
+        for band in range(self.num_bands):
+            start = band * self.rows_per_band
+            rows = signature[start:start + self.rows_per_band]
+            digest = hashlib.blake2b(struct.pack(f'>{len(rows)}I', *rows), digest_size=8).hexdigest()
+            keys.append(f"{band}:{digest}")
+        return keys
+    
+    def _pack(self, signature: Tuple[int, ...]) -> bytes:
+        return struct.pack(f'>{len(signature)}I', *signature)
+    
+    def _unpack(self, blob: bytes) -> Tuple[int, ...]:
+        return struct.unpack(f'>{len(blob) // 4}I', blob)
+    
+    @staticmethod
+    def estimate_similarity(sig1: Tuple[int, ...], sig2: Tuple[int, ...]) -> float:
+        """Estimate Jaccard similarity from two MinHash signatures."""
+        if not sig1 or len(sig1) != len(sig2):
+            return 0.0
+        return sum(1 for a, b in zip(sig1, sig2) if a == b) / len(sig1)
+    
+    def add(self, post_id: int, author_handle: str, content: str) -> None:
+        """Index a post (replaces any existing entry for the same ID)."""
+        self._add_batch([(post_id, author_handle, content)])
+        logger.debug(f"🧬 Indexed post {post_id} from @{author_handle}")
+    
+    def remove(self, post_id: int) -> None:
+        """Drop a post from the index."""
+        with self._conn:
+            self._conn.execute("DELETE FROM lsh_buckets WHERE post_id = ?", (post_id,))
+            self._conn.execute("DELETE FROM signatures WHERE post_id = ?", (post_id,))
+    
+    def query(
+        self,
+        author_handle: str,
+        content: str,
+        max_candidates: int = MAX_CANDIDATES
+    ) -> List[int]:
+        """
+        Find post IDs from the same author that are likely near-duplicates.
+        
+        Args:
+            author_handle: Only posts from this author are considered
+            content: Text of the newly scraped post
+            max_candidates: Cap on returned IDs (best estimated matches first)
+        
+        Returns:
+            Candidate post IDs, most similar first
+        """
+        signature = self.signature(content)
+        keys = self._bucket_keys(signature)
+        placeholders = ",".join("?" * len(keys))
+        
+        rows = self._conn.execute(
+            f"""
+            SELECT s.post_id, s.signature
+            FROM signatures s
+            WHERE s.post_id IN (
+                SELECT DISTINCT post_id FROM lsh_buckets
+                WHERE author_handle = ? AND bucket_key IN ({placeholders})
+            )
+            """,
+            (author_handle, *keys)
+        ).fetchall()
+        
+        scored = sorted(
+            ((self.estimate_similarity(signature, self._unpack(blob)), post_id) for post_id, blob in rows),
+            reverse=True
+        )
+        
+        return [post_id for _, post_id in scored[:max_candidates]]
+    
+    def indexed_post_ids(self) -> set:
+        """Return the set of post IDs currently in the index."""
+        return {row[0] for row in self._conn.execute("SELECT post_id FROM signatures")}
+    
+    def count(self) -> int:
+        """Number of indexed posts."""
+        return self._conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+    
+    def bulk_add(self, posts: Iterable[Tuple[int, str, str]]) -> int:
+        """
+        Index many (post_id, author_handle, content) tuples. Returns count added.
+        
+        Writes BULK_BATCH_SIZE posts per transaction instead of committing
+        once per post.
+        """
+        added = 0
+        batch: List[Tuple[int, str, str]] = []
+        for post in posts:
+            batch.append(post)
+            if len(batch) >= BULK_BATCH_SIZE:
+                added += self._add_batch(batch)
+                batch = []
+        if batch:
+            added += self._add_batch(batch)
+        return added
+    
+    def _add_batch(self, posts: List[Tuple[int, str, str]]) -> int:
+        """Index a batch of posts in a single transaction."""
+        signature_rows = []
+        bucket_rows = []
+        for post_id, author_handle, content in posts:
+            signature = self.signature(content)
+            signature_rows.append((post_id, author_handle, self._pack(signature)))
+            bucket_rows.extend((key, author_handle, post_id) for key in self._bucket_keys(signature))
+        
+        with self._conn:
+            self._conn.executemany(
+                "DELETE FROM lsh_buckets WHERE post_id = ?",
+                [(post_id,) for post_id, _, _ in posts]
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO signatures (post_id, author_handle, signature) VALUES (?, ?, ?)",
+                signature_rows
+            )
+            self._conn.executemany(
+                "INSERT INTO lsh_buckets (bucket_key, author_handle, post_id) VALUES (?, ?, ?)",
+                bucket_rows
+            )
+        return len(posts)
+    
+    def close(self) -> None:
+        """Close the underlying SQLite connection."""
+        self._conn.close()
+
+
+async def sync_index_with_db(db, index: Optional[NearDuplicateIndex] = None) -> int:
+    """
+    Backfill the index with any posts that exist in the database but not in the index.
+    
+    Args:
+        db: Database session
+        index: Index to sync (default: global index)
+    
+    Returns:
+        Number of posts added to the index
+    """
+    from sqlalchemy import select
+    from app.models import LinkedInPost
+    
+    index = index or get_dedup_index()
+    indexed_ids = index.indexed_post_ids()
+    
+    # IDs only - content is fetched just for the posts the index is missing
+    result = await db.execute(select(LinkedInPost.id))
+    missing_ids = [post_id for post_id in result.scalars().all() if post_id not in indexed_ids]
+    
+    if not missing_ids:
+        return 0
+    
+    added = 0
+    for start in range(0, len(missing_ids), BULK_BATCH_SIZE):
+        result = await db.execute(
+            select(LinkedInPost.id, LinkedInPost.author_handle, LinkedInPost.original_content)
+            .where(LinkedInPost.id.in_(missing_ids[start:start + BULK_BATCH_SIZE]))
+        )
+        added += index.bulk_add((row[0], row[1], row[2] or "") for row in result.all())
+    
+    logger.info(f"🧬 Backfilled {added} posts into near-duplicate index")
+    return added
+
+
+# Global singleton instance
+_dedup_index: Optional[NearDuplicateIndex] = None
+
+
+def get_dedup_index() -> NearDuplicateIndex:
+    """Get the global near-duplicate index singleton."""
+    global _dedup_index
+    if _dedup_index is None:
+        _dedup_index = NearDuplicateIndex()
+    return _dedup_index
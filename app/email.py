@@ -6,6 +6,7 @@ from typing import List, Optional
 import httpx
 
 from app.config import get_settings
+from app.http_clients import get_http_client
 from app.models import LinkedInPost, PostVariant, ApprovalRequest
 from app.logging_config import log_api_call, log_operation_error, log_operation_start, log_operation_success
 
@@ -88,37 +89,37 @@ class PostalEmailService:
         logger.debug(f"📤 Postal API endpoint: {self.api_endpoint}")
         logger.debug(f"📤 Email payload: to={to}, from={self.from_email}, subject_length={len(subject)}, html_length={len(html_body)}")
         
-        async with httpx.AsyncClient() as client:
-            try:
-                log_api_call(logger, "POST", self.api_endpoint, url_display="Postal API")
-                
-                response = await client.post(
-                    self.api_endpoint,
-                    headers=headers,
-                    json=payload,
-                    timeout=30.0
-                )
-                
-                log_api_call(logger, "POST", self.api_endpoint, status_code=response.status_code)
-                
-                response.raise_for_status()
-                
-                result = response.json()
-                message_id = result.get('data', {}).get('message_id', 'unknown')
-                
-                log_operation_success(logger, "send_email", message_id=message_id, to=to)
-                logger.info(f"✅ Email sent successfully. Message ID: {message_id}")
-                
-                return result
-                
-            except httpx.HTTPError as e:
-                log_operation_error(logger, "send_email", e, to=to, subject=subject)
-                
-                if hasattr(e, 'response') and e.response:
-                    logger.error(f"   Response status: {e.response.status_code}")
-                    logger.error(f"   Response body: {e.response.text[:500]}")  # First 500 chars
-                
-                raise
+        client = get_http_client("postal")
+        try:
+            log_api_call(logger, "POST", self.api_endpoint, url_display="Postal API")
+            
+            response = await client.post(
+                self.api_endpoint,
+                headers=headers,
+                json=payload,
+                timeout=30.0
+            )
+            
+            log_api_call(logger, "POST", self.api_endpoint, status_code=response.status_code)
+            
+            response.raise_for_status()
+            
+            result = response.json()
+            message_id = result.get('data', {}).get('message_id', 'unknown')
+            
+            log_operation_success(logger, "send_email", message_id=message_id, to=to)
+            logger.info(f"✅ Email sent successfully. Message ID: {message_id}")
+            
+            return result
+            
+        except httpx.HTTPError as e:
+            log_operation_error(logger, "send_email", e, to=to, subject=subject)
+            
+            if hasattr(e, 'response') and e.response:
+                logger.error(f"   Response status: {e.response.status_code}")
+                logger.error(f"   Response body: {e.response.text[:500]}")  # First 500 chars
+            
+            raise
     
     def _build_approval_email_html(
         self,
@@ -0,0 +1,74 @@
+"""Shared, pooled httpx clients for outbound API calls."""
+import importlib.util
+import logging
+from typing import Dict, Optional
+
+import httpx
+
+from app.rate_limit import RateLimitedTransport, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# HTTP/2 needs the optional "h2" package (httpx[http2])
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Each named client talks to a single API host, so pool limits are per host
+DEFAULT_LIMITS = httpx.Limits(
+    max_connections=10,
+    max_keepalive_connections=5,
+    keepalive_expiry=60.0,
+)
+
+# Per-request timeouts passed by callers take precedence
+DEFAULT_TIMEOUT = httpx.Timeout(60.0, connect=10.0)
+
+# AI APIs: 429s are retried by app.ai_batch (under the adaptive semaphore), not the transport
+AI_CLIENT_NAMES = {"github_models", "copilot"}
+
+
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def get_http_client(name: str, timeout: Optional[httpx.Timeout] = None) -> httpx.AsyncClient:
+    """
+    Get (or create) the shared client for an API.
+    
+    Reusing one client keeps connections alive between calls, so repeated
+    requests skip DNS, TCP and TLS setup. Requests are paced by the API's
+    token bucket (see app.rate_limit).
+    
+    Args:
+        name: Client name, one per upstream host (e.g. "github_models", "copilot", "postal")
+        timeout: Default timeout for a newly created client
+    
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    client = _clients.get(name)
+    if client is None or client.is_closed:
+        # Every request goes through the API's shared token bucket
+        transport = RateLimitedTransport(
+            get_rate_limiter(name),
+            httpx.AsyncHTTPTransport(http2=HTTP2_AVAILABLE, limits=DEFAULT_LIMITS),
+            retry_429=name not in AI_CLIENT_NAMES,
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=timeout or DEFAULT_TIMEOUT,
+        )
+        _clients[name] = client
+        logger.debug(f"🔌 Created pooled HTTP client '{name}' (HTTP/2: {HTTP2_AVAILABLE})")
+    return client
+
+
+async def close_http_clients() -> None:
+    """Close every shared client (called from the FastAPI lifespan on shutdown)."""
+    for name, client in list(_clients.items()):
+        try:
+            await client.aclose()
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to close HTTP client '{name}': {e}")
+    
+    if _clients:
+        logger.info(f"✅ Closed {len(_clients)} pooled HTTP clients")
+    _clients.clear()
@@ -0,0 +1,57 @@
+"""Async humanization delays for code running on the event loop.
+
+The sync helpers in app.utils block the calling thread with time.sleep and are
+only safe inside executor threads (the Selenium driver thread). Anything
+awaited from FastAPI handlers, APScheduler jobs or the Playwright scraper must
+use these instead, otherwise a 1-3 minute between-profile pause freezes every
+request and job in the process.
+"""
+import asyncio
+import random
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+async def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
+    """
+    Wait a random amount of time to simulate human behavior without blocking the loop.
+    
+    Args:
+        min_seconds: Minimum delay in seconds
+        max_seconds: Maximum delay in seconds
+    """
+    delay = random.uniform(min_seconds, max_seconds)
+    logger.debug(f"Random delay: {delay:.2f}s")
+    await asyncio.sleep(delay)
+
+
+async def random_short_delay() -> None:
+    """Quick random delay (0.5-1.5 seconds)."""
+    await random_delay(0.5, 1.5)
+
+
+async def random_medium_delay() -> None:
+    """Medium random delay (2-4 seconds)."""
+    await random_delay(2.0, 4.0)
+
+
+async def random_long_delay() -> None:
+    """Long random delay (5-8 seconds)."""
+    await random_delay(5.0, 8.0)
+
+
+async def random_profile_delay() -> None:
+    """
+    Very long random delay for between-profile scraping (1-3 minutes).
+    Makes scraping behavior appear more human by adding realistic pauses.
+    """
+    delay_seconds = random.uniform(60.0, 180.0)  # 1-3 minutes
+    delay_minutes = delay_seconds / 60
+    logger.info(f"⏳ Human-like delay before next profile: {delay_minutes:.1f} minutes")
+    await random_delay(delay_seconds, delay_seconds)
+
+
+async def human_scroll_delay() -> None:
+    """Delay between scroll actions (0.8-2.0 seconds)."""
+    await random_delay(0.8, 2.0)
@@ -8,6 +8,9 @@ from pathlib import Path
 from playwright.async_api import async_playwright, Browser, BrowserContext, Page, TimeoutError as PlaywrightTimeout
 from playwright_stealth import stealth_async
 from app.config import get_settings
+from app.browser_pool import BrowserPool, get_browser_pool, launch_chromium
+from app.linkedin_ids import parse_activity_id, to_activity_urn, activity_url, activity_timestamp
+from app.linkedin_feed import is_feed_response, parse_feed_payload, newest_first
 from app.logging_config import (
     log_operation_start,
     log_operation_success,
@@ -21,6 +24,105 @@ logger = logging.getLogger(__name__)
 SESSION_WARNING_DAYS = 25  # Warn when session is 25 days old (LinkedIn cookies typically last ~30 days)
 SESSION_MAX_AGE_DAYS = 30  # Consider session expired after 30 days
 
+# Tracking/telemetry hosts and endpoints aborted during scrape runs
+BLOCKED_URL_PATTERNS = [
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'px.ads.linkedin.com',
+    'snap.licdn.com',
+    'linkedin.com/li/track',
+    'linkedin.com/realtime/',
+    'sentry.io',
+]
+
+# Post container selectors - LinkedIn's DOM structure varies
+POST_CONTAINER_SELECTORS = [
+    'div[data-id^="urn:li:activity"]',
+    'div.feed-shared-update-v2',
+    'article',
+]
+
+# Content selectors, most specific first
+POST_CONTENT_SELECTORS = [
+    # For company pages - nested structure
+    '.feed-shared-update-v2__description .update-components-text span[dir="ltr"]',
+    '.feed-shared-update-v2__description span[dir="ltr"]',
+    # For simpler layouts
+    '.update-components-text span[dir="ltr"]',
+    '.update-components-text',
+    '.feed-shared-update-v2__description',
+    '.feed-shared-text',
+    'span[dir="ltr"]',
+]
+
+# Timestamp selectors, most specific first
+POST_TIME_SELECTORS = [
+    'time',  # Standard HTML5 time element
+    '.update-components-actor__sub-description time',  # Time within sub-description
+    '.update-components-actor__sub-description > span:last-child',  # Last span in subdesc
+    '.feed-shared-actor__sub-description time',  # Alternative actor description
+    '.feed-shared-actor__sub-description',  # Fallback to whole subdesc
+    '.update-components-actor__sub-description',  # Original fallback
+]
+
+POST_AUTHOR_SELECTOR = '.update-components-actor__name, .feed-shared-actor__name'
+
+# Adaptive scroll loader limits
+MAX_SCROLL_ROUNDS = 25  # Hard cap so an endless feed can't stall a scrape run
+FIRST_POST_TIMEOUT_MS = 15000  # Company pages are JavaScript-heavy and render late
+SCROLL_GROWTH_TIMEOUT_MS = 6000  # No new containers within this window = end of feed
+
+# Activity URNs of the rendered post containers, in document order
+VISIBLE_POST_URNS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map(
+    (el) => el.getAttribute('data-id') || el.getAttribute('data-urn')
+)
+"""
+
+# Walks every post container in one page.evaluate call instead of
+# ~15 query_selector/inner_text round trips per post
+EXTRACT_POSTS_JS = """
+({containerSelectors, contentSelectors, timeSelectors, authorSelector, maxPosts}) => {
+    let containers = [];
+    let matchedSelector = null;
+    for (const selector of containerSelectors) {
+        containers = Array.from(document.querySelectorAll(selector));
+        if (containers.length) {
+            matchedSelector = selector;
+            break;
+        }
+    }
+    
+    const firstText = (root, selectors) => {
+        for (const selector of selectors) {
+            const el = root.querySelector(selector);
+            if (!el) continue;
+            const text = (el.innerText || '').trim();
+            if (text) return {text, selector};
+        }
+        return {text: '', selector: null};
+    };
+    
+    const posts = containers.slice(0, maxPosts).map((el) => {
+        const link = el.querySelector('a[href*="/posts/"], a[href*="/feed/update/"]');
+        const author = el.querySelector(authorSelector);
+        const content = firstText(el, contentSelectors);
+        const time = firstText(el, timeSelectors);
+        return {
+            urn: el.getAttribute('data-id') || el.getAttribute('data-urn'),
+            url: link ? link.href : null,
+            author: author ? (author.innerText || '').trim() : null,
+            content: content.text,
+            content_selector: content.selector,
+            time_text: time.text,
+        };
+    });
+    
+    return {selector: matchedSelector, total: containers.length, posts};
+}
+"""
+
 
 class LinkedInPost:
     """Represents a scraped LinkedIn post."""
@@ -36,6 +138,7 @@ class LinkedInPost:
         comments: int = 0,
     ):
         self.url = url
+        self.activity_urn = to_activity_urn(url)
         self.author_handle = author_handle
         self.author_name = author_name
         self.content = content
@@ -60,12 +163,13 @@ class LinkedInAutomation:
     - Publishing posts to LinkedIn
     """
     
-    def __init__(self, headless: bool = True):
+    def __init__(self, headless: bool = True, browser_pool: Optional[BrowserPool] = None):
         """
         Initialize the LinkedIn automation service.
         
         Args:
             headless: Run browser in headless mode (default: True)
+            browser_pool: Borrow a warm browser from this pool instead of launching one
         """
         import os
         
@@ -75,6 +179,8 @@ class LinkedInAutomation:
         self.page: Optional[Page] = None
         self.playwright = None
         self.is_logged_in = False
+        # False for tabs opened with open_tab() - the browser belongs to the parent session
+        self._owns_browser = True
         
         # Check if DISPLAY is set (VNC mode) - if so, run non-headless
         if os.environ.get('DISPLAY'):
@@ -86,6 +192,13 @@ class LinkedInAutomation:
         self.session_needs_refresh = False
         self.session_expired = False
         
+        # A pooled browser only fits if it runs in the same mode
+        self.browser_pool = browser_pool if browser_pool and browser_pool.headless == self.headless else None
+        
+        # Route handler installed only while scraping (see _block_resources)
+        self._resource_route_handler = None
+        self.blocked_request_count = 0
+        
         # Session storage
         self.session_dir = Path("/app/data/linkedin_session")
         self.session_dir.mkdir(parents=True, exist_ok=True)
@@ -256,8 +369,6 @@ class LinkedInAutomation:
         log_operation_start(logger, "start_browser", headless=self.headless)
         
         try:
-            self.playwright = await async_playwright().start()
-            
             # Check if we have a saved session
             has_session = self.session_file.exists()
             
@@ -298,78 +409,16 @@ class LinkedInAutomation:
                         "No LinkedIn session found. Check your email for setup instructions."
                     )
             
-            # Launch browser with additional evasion flags
-            self.browser = await self.playwright.chromium.launch(
-                headless=self.headless,
-                args=[
-                    '--no-sandbox',
-                    '--disable-setuid-sandbox',
-                    '--disable-dev-shm-usage',
-                    '--disable-blink-features=AutomationControlled',
-                    '--disable-features=IsolateOrigins,site-per-process',
-                    '--disable-site-isolation-trials',
-                    '--disable-web-security',
-                ],
-                chromium_sandbox=False,
-            )
-            
-            # Create browser context with saved session if available
-            context_options = {
-                'user_agent': "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-                'viewport': {'width': 1920, 'height': 1080},
-                'locale': 'en-US',
-                'timezone_id': 'America/Denver',
-            }
+            # Borrow the warm pooled browser, or launch one with additional evasion flags
+            if self.browser_pool:
+                self.browser = await self.browser_pool.checkout()
+            else:
+                self.playwright = await async_playwright().start()
+                self.browser = await launch_chromium(self.playwright, self.headless)
             
             if has_session:
                 logger.info(f"📂 Loading saved session from {self.session_file}")
-                context_options['storage_state'] = str(self.session_file)
-            
-            self.context = await self.browser.new_context(**context_options)
-            
-            # Create a new page
-            self.page = await self.context.new_page()
-            
-            # Apply stealth mode to hide automation signals
-            await stealth_async(self.page)
-            logger.info("🥷 Stealth mode applied to page")
-            
-            # Additional JavaScript evasion techniques
-            await self.page.add_init_script("""
-                // Override navigator.webdriver
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // Override chrome property
-                window.chrome = {
-                    runtime: {}
-                };
-                
-                // Override permissions
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-                
-                // Override plugins length
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                
-                // Override languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-            """)
-            logger.info("🎭 Additional evasion scripts applied")
-            
-            # Set extra HTTP headers to appear more human
-            await self.page.set_extra_http_headers({
-                'Accept-Language': 'en-US,en;q=0.9',
-            })
+            await self._open_context(str(self.session_file) if has_session else None)
             
             # Verify session is valid if requested
             if check_session and has_session:
@@ -379,10 +428,143 @@ class LinkedInAutomation:
                 logger.info("✅ Session loaded from cookie - skipping validation to avoid detection")
                 self.is_logged_in = True
             
-            log_operation_success(logger, "start_browser", has_session=has_session)
+            log_operation_success(logger, "start_browser", has_session=has_session, pooled=bool(self.browser_pool))
             
         except Exception as e:
             log_operation_error(logger, "start_browser", e)
+            # Callers only stop() after a successful start - don't leak the pooled browser
+            if self.browser_pool and self.browser:
+                await self.browser_pool.checkin(self.browser)
+                self.browser = None
+            raise
+    
+    async def _open_context(self, storage_state=None):
+        """
+        Open a browser context and page on self.browser with the evasion setup.
+        
+        Args:
+            storage_state: Session file path or storage-state dict to log in with
+        """
+        # Create browser context with saved session if available
+        context_options = {
+            'user_agent': "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+            'viewport': {'width': 1920, 'height': 1080},
+            'locale': 'en-US',
+            'timezone_id': 'America/Denver',
+        }
+        
+        if storage_state:
+            context_options['storage_state'] = storage_state
+        
+        self.context = await self.browser.new_context(**context_options)
+        
+        # Create a new page
+        self.page = await self.context.new_page()
+        
+        # Apply stealth mode to hide automation signals
+        await stealth_async(self.page)
+        logger.info("🥷 Stealth mode applied to page")
+        
+        # Additional JavaScript evasion techniques
+        await self.page.add_init_script("""
+            // Override navigator.webdriver
+            Object.defineProperty(navigator, 'webdriver', {
+                get: () => undefined
+            });
+            
+            // Override chrome property
+            window.chrome = {
+                runtime: {}
+            };
+            
+            // Override permissions
+            const originalQuery = window.navigator.permissions.query;
+            window.navigator.permissions.query = (parameters) => (
+                parameters.name === 'notifications' ?
+                    Promise.resolve({ state: Notification.permission }) :
+                    originalQuery(parameters)
+            );
+            
+            // Override plugins length
+            Object.defineProperty(navigator, 'plugins', {
+                get: () => [1, 2, 3, 4, 5]
+            });
+            
+            // Override languages
+            Object.defineProperty(navigator, 'languages', {
+                get: () => ['en-US', 'en']
+            });
+        """)
+        logger.info("🎭 Additional evasion scripts applied")
+        
+        # Set extra HTTP headers to appear more human
+        await self.page.set_extra_http_headers({
+            'Accept-Language': 'en-US,en;q=0.9',
+        })
+    
+    async def open_tab(self) -> "LinkedInAutomation":
+        """
+        Open another isolated context on this session's browser for parallel scraping.
+        
+        The tab starts from a copy of this session's storage state (cookies
+        and local storage) but has its own context, page and resource routing,
+        so it can scrape a different handle at the same time. Close it with
+        stop() before stopping this session - the browser stays with this one.
+        
+        Returns:
+            LinkedInAutomation bound to the shared browser
+        """
+        if not self.browser or not self.context:
+            raise Exception("Browser not started. Call start() first.")
+        
+        tab = LinkedInAutomation(headless=self.headless)
+        await tab.attach_to(self)
+        return tab
+    
+    async def attach_to(self, parent: "LinkedInAutomation") -> None:
+        """Open this tab's context on the parent session's (current) browser and login."""
+        self.browser = parent.browser
+        self._owns_browser = False
+        self.is_logged_in = parent.is_logged_in
+        await self._open_context(await parent.context.storage_state())
+    
+    async def close_context(self) -> None:
+        """Close this session's page and context, leaving the browser running."""
+        await self._unblock_resources()
+        if self.page:
+            await self.page.close()
+            self.page = None
+        if self.context:
+            await self.context.close()
+            self.context = None
+    
+    async def restart_browser(self) -> None:
+        """
+        Replace this session's browser with a fresh one, keeping the login.
+        
+        Frees the memory a long run accumulates in Chromium (see
+        app.browser_watchdog). Tabs opened with open_tab() must be closed with
+        close_context() first and re-attached with attach_to() afterwards.
+        """
+        log_operation_start(logger, "restart_browser", pooled=bool(self.browser_pool))
+        
+        try:
+            storage_state = await self.context.storage_state()
+            await self.close_context()
+            
+            browser, self.browser = self.browser, None
+            if self.browser_pool:
+                await self.browser_pool.checkin(browser, recycle=True)
+                self.browser = await self.browser_pool.checkout()
+            else:
+                await browser.close()
+                self.browser = await launch_chromium(self.playwright, self.headless)
+            
+            await self._open_context(storage_state)
+            log_operation_success(logger, "restart_browser")
+            
+        except Exception as e:
+            log_operation_error(logger, "restart_browser", e)
             raise
     
     async def stop(self):
@@ -394,7 +576,13 @@ class LinkedInAutomation:
                 await self.page.close()
             if self.context:
                 await self.context.close()
-            if self.browser:
+            if not self._owns_browser:
+                self.browser = None
+            elif self.browser_pool and self.browser:
+                # Pooled browser stays warm for the next operation
+                await self.browser_pool.checkin(self.browser)
+                self.browser = None
+            elif self.browser:
                 await self.browser.close()
             if self.playwright:
                 await self.playwright.stop()
@@ -541,7 +729,9 @@ class LinkedInAutomation:
         handle: str,
         max_posts: int = 10,
         days_back: int = 7,
-        author_name: Optional[str] = None
+        author_name: Optional[str] = None,
+        known_urns: Optional[set] = None,
+        since_urn: Optional[str] = None
     ) -> List[LinkedInPost]:
         """
         Scrape recent posts from a LinkedIn user.
@@ -550,6 +740,9 @@ class LinkedInAutomation:
             handle: LinkedIn handle (e.g., 'timcool' or full URL)
             max_posts: Maximum number of posts to scrape
             days_back: Only scrape posts from the last N days
+            author_name: Display name from the database
+            known_urns: Activity URNs already stored - scrolling stops once one is visible
+            since_urn: Handle's scrape watermark - posts at or before it are skipped
         
         Returns:
             List of scraped posts
@@ -562,6 +755,8 @@ class LinkedInAutomation:
             days_back=days_back
         )
         
+        response_listener = None
+        
         try:
             if not self.is_logged_in:
                 raise Exception("Not logged in. Please authenticate first.")
@@ -577,66 +772,80 @@ class LinkedInAutomation:
             else:
                 profile_url = f"https://www.linkedin.com/in/{handle}/recent-activity/all/"
             
+            # Capture the feed JSON the page fetches while we load and scroll
+            settings = get_settings()
+            network_posts: Dict[str, Dict[str, Any]] = {}
+            pending_captures: List[asyncio.Task] = []
+            
+            async def capture_feed_response(response):
+                try:
+                    if not is_feed_response(response.url, response.headers.get('content-type')):
+                        return
+                    for raw_post in parse_feed_payload(await response.json(), handle):
+                        network_posts.setdefault(raw_post['urn'], raw_post)
+                except Exception as e:
+                    logger.debug(f"Could not parse feed response {response.url}: {e}")
+            
+            await self._block_resources()
+            
+            if settings.scraping_capture_network:
+                def on_response(response):
+                    pending_captures.append(asyncio.create_task(capture_feed_response(response)))
+                
+                response_listener = on_response
+                self.page.on("response", response_listener)
+            
             log_workflow_step(logger, f"Navigating to {handle}'s profile")
             await self.page.goto(profile_url, wait_until="domcontentloaded", timeout=60000)
             logger.info(f"📍 Navigated to URL: {self.page.url}")
             
-            # Wait longer for company pages to load (JavaScript-heavy)
-            if handle.startswith("company/"):
-                logger.info("⏳ Waiting 10 seconds for company page to fully load...")
-                await asyncio.sleep(10)
-            else:
-                await asyncio.sleep(3)
-            
-            # Scroll to load more posts
-            log_workflow_step(logger, "Scrolling to load posts")
-            for _ in range(3):
-                await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-                await asyncio.sleep(2)
-            
             # Extract posts
             posts = []
             now = datetime.utcnow()
             cutoff_date = now - timedelta(days=days_back)
             
+            # Scroll until we pass the cutoff, hit max_posts or reach known content
+            log_workflow_step(logger, "Scrolling to load posts")
+            since_id = parse_activity_id(since_urn)
+            await self._load_posts_until_cutoff(
+                cutoff_date,
+                max_posts,
+                known_urns or set(),
+                network_posts,
+                since_id
+            )
+            
             log_workflow_step(logger, "Extracting post data")
             
-            # Try to find post elements - LinkedIn's DOM structure varies
-            post_selectors = [
-                'div[data-id^="urn:li:activity"]',
-                'div.feed-shared-update-v2',
-                'article',
-            ]
+            if response_listener:
+                self.page.remove_listener("response", response_listener)
+                response_listener = None
+                await asyncio.gather(*pending_captures, return_exceptions=True)
             
-            post_elements = None
-            for selector in post_selectors:
-                post_elements = await self.page.query_selector_all(selector)
-                if post_elements:
-                    logger.info(f"✅ Found {len(post_elements)} post elements with selector: {selector}")
-                    break
+            if network_posts:
+                # Structured data: URNs and text straight from the feed payloads
+                raw_posts = [p for p in newest_first(list(network_posts.values())) if not p['is_reshare']]
+                raw_posts = raw_posts[:max_posts]
+                logger.info(f"✅ Captured {len(network_posts)} posts from feed responses ({len(raw_posts)} original)")
+            else:
+                if settings.scraping_capture_network:
+                    logger.info("📄 No feed payloads captured, falling back to DOM extraction")
+                raw_posts = await self._extract_posts_from_dom(handle, max_posts)
             
-            if not post_elements:
-                logger.warning("⚠️  No post elements found")
+            if not raw_posts:
                 return []
             
-            # Save page HTML and screenshot for debugging
-            if handle.startswith("company/"):
-                company_name = handle.replace("company/", "").replace("/", "-")
-                html_file = f"/app/data/company_page_{company_name}.html"
-                screenshot_file = f"/app/data/company_page_{company_name}.png"
-                
-                page_html = await self.page.content()
-                with open(html_file, 'w', encoding='utf-8') as f:
-                    f.write(page_html)
-                logger.info(f"💾 Saved company page HTML to {html_file}")
-                
-                await self.page.screenshot(path=screenshot_file, full_page=True)
-                logger.info(f"📸 Saved company page screenshot to {screenshot_file}")
-            
-            for element in post_elements[:max_posts]:
+            already_seen = 0
+            for raw_post in raw_posts:
                 try:
-                    # Extract post data
-                    post_data = await self._extract_post_data(element, handle, author_name)
+                    # Build post from the extracted fields
+                    post_data = self._build_post(raw_post, handle, author_name)
+                    
+                    # At or before the watermark - processed on a previous run
+                    activity_id = parse_activity_id(post_data.activity_urn) if post_data else None
+                    if since_id and activity_id and activity_id <= since_id:
+                        already_seen += 1
+                        continue
                     
                     if post_data:
                         age_days = (now - post_data.post_date).days
@@ -651,6 +860,9 @@ class LinkedInAutomation:
                     logger.warning(f"⚠️  Failed to extract post data: {e}")
                     continue
             
+            if already_seen:
+                logger.info(f"⏭️  Skipped {already_seen} posts at or before the scrape watermark")
+            
             log_operation_success(
                 logger,
                 "scrape_user_posts",
@@ -663,6 +875,10 @@ class LinkedInAutomation:
         except Exception as e:
             log_operation_error(logger, "scrape_user_posts", e)
             raise
+        finally:
+            if response_listener:
+                self.page.remove_listener("response", response_listener)
+            await self._unblock_resources()
     
     async def publish_post(self, content: str) -> bool:
         """
@@ -806,92 +1022,210 @@ class LinkedInAutomation:
         except Exception as e:
             logger.warning(f"⚠️  Failed to save session: {e}")
     
-    async def _extract_post_data(self, element, handle: str, author_name: Optional[str] = None) -> Optional[LinkedInPost]:
+    async def _load_posts_until_cutoff(
+        self,
+        cutoff_date: datetime,
+        max_posts: int,
+        known_urns: set,
+        network_posts: Dict[str, Dict[str, Any]],
+        since_id: Optional[int] = None
+    ) -> str:
         """
-        Extract post data from a post element.
+        Scroll the activity feed only as far as needed.
+        
+        Stops as soon as the bottom-most post is older than the cutoff,
+        max_posts containers are loaded, a post we already have appears, or
+        the bottom-most post is at or before the handle's watermark.
+        Each round waits for the container count to grow instead of sleeping,
+        so quiet handles finish quickly and prolific ones keep loading.
         
         Args:
-            element: The post element
+            cutoff_date: Posts older than this aren't needed
+            max_posts: Stop once this many posts are loaded
+            known_urns: Activity URNs already in the database
+            network_posts: Posts captured from feed responses so far (updated live)
+            since_id: Activity ID of the handle's scrape watermark
+        
+        Returns:
+            Reason scrolling stopped (for logging)
+        """
+        selector = ', '.join(POST_CONTAINER_SELECTORS)
+        
+        try:
+            await self.page.wait_for_selector(selector, timeout=FIRST_POST_TIMEOUT_MS)
+        except PlaywrightTimeout:
+            logger.warning(f"⚠️  No post containers rendered within {FIRST_POST_TIMEOUT_MS // 1000}s")
+            return "no posts rendered"
+        
+        reason = f"reached {MAX_SCROLL_ROUNDS} scroll rounds"
+        
+        for scroll_round in range(MAX_SCROLL_ROUNDS):
+            dom_urns = await self.page.evaluate(VISIBLE_POST_URNS_JS, selector)
+            container_count = len(dom_urns)
+            
+            # Feed payloads can run ahead of rendering - use whichever saw more
+            urns = [to_activity_urn(u) for u in dom_urns]
+            urns = [u for u in urns if u]
+            loaded = max(container_count, len(network_posts))
+            
+            if loaded >= max_posts:
+                reason = f"loaded {loaded} posts (max {max_posts})"
+                break
+            
+            if known_urns and (known_urns.intersection(urns) or known_urns.intersection(network_posts)):
+                reason = "reached a post already in the database"
+                break
+            
+            # Bottom-most post rather than the oldest, so a pinned old post doesn't stop us
+            if since_id and urns and (parse_activity_id(urns[-1]) or 0) <= since_id:
+                reason = "reached the scrape watermark"
+                break
+            
+            bottom_date = activity_timestamp(urns[-1]) if urns else None
+            if bottom_date and bottom_date < cutoff_date:
+                reason = f"passed cutoff ({bottom_date:%Y-%m-%d})"
+                break
+            
+            await self.page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
+            
+            try:
+                await self.page.wait_for_function(
+                    "([selector, count]) => document.querySelectorAll(selector).length > count",
+                    arg=[selector, container_count],
+                    timeout=SCROLL_GROWTH_TIMEOUT_MS
+                )
+            except PlaywrightTimeout:
+                reason = "end of feed (no new posts loaded)"
+                break
+        
+        logger.info(f"📜 Stopped scrolling after {scroll_round + 1} rounds: {reason}")
+        return reason
+    
+    async def _block_resources(self):
+        """
+        Abort media, font and analytics requests on the context while scraping.
+        
+        Scraping only reads text, so images/video/fonts/trackers are pure
+        page-load cost. The route is removed again by _unblock_resources so
+        publishing and manual/VNC sessions see the full page.
+        """
+        if not self.settings.scraping_block_resources or self._resource_route_handler:
+            return
+        
+        blocked_types = {
+            t.strip() for t in self.settings.scraping_blocked_resource_types.split(',') if t.strip()
+        }
+        
+        async def handle_route(route):
+            request = route.request
+            if request.resource_type in blocked_types or any(p in request.url for p in BLOCKED_URL_PATTERNS):
+                self.blocked_request_count += 1
+                await route.abort()
+            else:
+                await route.continue_()
+        
+        self.blocked_request_count = 0
+        self._resource_route_handler = handle_route
+        await self.context.route("**/*", handle_route)
+        logger.debug(f"🚫 Blocking resource types during scrape: {sorted(blocked_types)}")
+    
+    async def _unblock_resources(self):
+        """Remove the scrape-time resource blocking route, if installed."""
+        if not self._resource_route_handler:
+            return
+        
+        try:
+            await self.context.unroute("**/*", self._resource_route_handler)
+            logger.info(f"🚫 Blocked {self.blocked_request_count} media/font/analytics requests during scrape")
+        except Exception as e:
+            logger.warning(f"⚠️  Failed to remove resource blocking route: {e}")
+        finally:
+            self._resource_route_handler = None
+    
+    async def _extract_posts_from_dom(self, handle: str, max_posts: int) -> List[Dict[str, Any]]:
+        """
+        Extract raw posts from the rendered page with EXTRACT_POSTS_JS.
+        
+        Args:
+            handle: The user handle
+            max_posts: Maximum number of post containers to read
+        
+        Returns:
+            Raw post dicts (urn, url, author, content, time_text)
+        """
+        # Extract every post in a single round trip
+        extracted = await self.page.evaluate(EXTRACT_POSTS_JS, {
+            'containerSelectors': POST_CONTAINER_SELECTORS,
+            'contentSelectors': POST_CONTENT_SELECTORS,
+            'timeSelectors': POST_TIME_SELECTORS,
+            'authorSelector': POST_AUTHOR_SELECTOR,
+            'maxPosts': max_posts,
+        })
+        
+        if not extracted['posts']:
+            logger.warning("⚠️  No post elements found")
+            return []
+        
+        logger.info(f"✅ Found {extracted['total']} post elements with selector: {extracted['selector']}")
+        
+        # Save page HTML and screenshot for debugging
+        if handle.startswith("company/"):
+            company_name = handle.replace("company/", "").replace("/", "-")
+            html_file = f"/app/data/company_page_{company_name}.html"
+            screenshot_file = f"/app/data/company_page_{company_name}.png"
+            
+            page_html = await self.page.content()
+            with open(html_file, 'w', encoding='utf-8') as f:
+                f.write(page_html)
+            logger.info(f"💾 Saved company page HTML to {html_file}")
+            
+            await self.page.screenshot(path=screenshot_file, full_page=True)
+            logger.info(f"📸 Saved company page screenshot to {screenshot_file}")
+        
+        return extracted['posts']
+    
+    def _build_post(self, raw_post: Dict[str, Any], handle: str, author_name: Optional[str] = None) -> Optional[LinkedInPost]:
+        """
+        Build a post from the fields returned by EXTRACT_POSTS_JS or parse_feed_payload.
+        
+        Args:
+            raw_post: Dict with urn, url, author, content, time_text
             handle: The user handle
+            author_name: Display name from the database (preferred over scraped name)
         
         Returns:
             LinkedInPost object or None
         """
         try:
-            # Extract post URL
-            post_url = await element.get_attribute("data-id")
-            if not post_url:
-                link = await element.query_selector('a[href*="/posts/"]')
-                if link:
-                    post_url = await link.get_attribute("href")
+            # data-id is a bare URN - store the canonical feed URL instead
+            post_url = activity_url(raw_post.get('urn')) or activity_url(raw_post.get('url')) or raw_post.get('url')
             
             logger.debug(f"🔍 DEBUG: post_url = {post_url}")
             
-            # Extract author name (use provided name or scrape from page)
-            if not author_name:
-                author_elem = await element.query_selector('.update-components-actor__name, .feed-shared-actor__name')
-                author_name = await author_elem.inner_text() if author_elem else "Unknown"
+            # Use provided name or the one scraped from the page
+            author_name = author_name or raw_post.get('author') or "Unknown"
             
             logger.debug(f"🔍 DEBUG: author_name = {author_name}")
             
-            # Extract post content - try multiple selectors
-            content = ""
-            content_selectors = [
-                # For company pages - nested structure
-                '.feed-shared-update-v2__description .update-components-text span[dir="ltr"]',
-                '.feed-shared-update-v2__description span[dir="ltr"]',
-                # For simpler layouts
-                '.update-components-text span[dir="ltr"]',
-                '.update-components-text',
-                '.feed-shared-update-v2__description',
-                '.feed-shared-text',
-                'span[dir="ltr"]',
-            ]
-            
-            for selector in content_selectors:
-                content_elem = await element.query_selector(selector)
-                if content_elem:
-                    content = await content_elem.inner_text()
-                    if content and len(content.strip()) > 0:
-                        logger.info(f"✅ Found content with selector '{selector}'")
-                        logger.debug(f"🔍 DEBUG: Content preview: {content[:100]}")
-                        break
-            
-            if not content or len(content.strip()) == 0:
-                logger.warning(f"⚠️  No content found for post. Tried selectors: {content_selectors}")
+            content = raw_post.get('content') or ""
+            if not content.strip():
+                logger.warning(f"⚠️  No content found for post. Tried selectors: {POST_CONTENT_SELECTORS}")
                 return None
             
-            # Extract timestamp - try multiple selectors
-            time_selectors = [
-                'time',  # Standard HTML5 time element
-                '.update-components-actor__sub-description time',  # Time within sub-description
-                '.update-components-actor__sub-description > span:last-child',  # Last span in subdesc
-                '.feed-shared-actor__sub-description time',  # Alternative actor description
-                '.feed-shared-actor__sub-description',  # Fallback to whole subdesc
-                '.update-components-actor__sub-description',  # Original fallback
-            ]
+            logger.info(f"✅ Found content via {raw_post.get('content_selector') or 'feed payload'}")
+            logger.debug(f"🔍 DEBUG: Content preview: {content[:100]}")
             
-            time_elem = None
-            time_text = ""
-            
-            for selector in time_selectors:
-                time_elem = await element.query_selector(selector)
-                if time_elem:
-                    time_text = await time_elem.inner_text()
-                    time_html = await time_elem.inner_html() if len(time_text) > 100 else ""  # Only get HTML if text is long
-                    logger.info(f"🔍 DEBUG: Found time with selector '{selector}'")
-                    logger.info(f"🔍 DEBUG: time_text = '{time_text}'")
-                    if time_html:
-                        logger.info(f"🔍 DEBUG: time_html (first 200) = '{time_html[:200]}'")
-                    break
-            
-            if not time_elem:
+            time_text = raw_post.get('time_text') or ""
+            if not time_text:
                 logger.warning(f"⚠️  No time element found with any selector")
             
-            # Parse relative time
-            post_date = self._parse_relative_time(time_text)
-            
-            logger.info(f"🔍 DEBUG: parsed post_date = {post_date}")
+            # Exact time from the activity ID; relative text is only a fallback
+            post_date = activity_timestamp(post_url)
+            if post_date:
+                logger.info(f"🔍 DEBUG: post_date from activity ID = {post_date}")
+            else:
+                post_date = self._parse_relative_time(time_text)
+                logger.info(f"🔍 DEBUG: parsed post_date = {post_date}")
             
             return LinkedInPost(
                 url=post_url or f"https://www.linkedin.com/in/{handle}/",
@@ -902,7 +1236,7 @@ class LinkedInAutomation:
             )
             
         except Exception as e:
-            logger.warning(f"⚠️  Error extracting post data: {e}", exc_info=True)
+            logger.warning(f"⚠️  Error building post data: {e}", exc_info=True)
             return None
     
     def _parse_relative_time(self, time_text: str) -> datetime:
@@ -960,5 +1294,10 @@ class LinkedInAutomation:
 
 
 def get_linkedin_service(headless: bool = True) -> LinkedInAutomation:
-    """Get a configured LinkedIn automation service instance."""
-    return LinkedInAutomation(headless=headless)
+    """
+    Get a configured LinkedIn automation service instance.
+    
+    start()/stop() borrow and return the shared warm browser when the browser
+    pool is enabled, instead of launching and closing Chromium each time.
+    """
+    return LinkedInAutomation(headless=headless, browser_pool=get_browser_pool())
@@ -0,0 +1,189 @@
+"""Parse posts out of the Voyager JSON payloads LinkedIn's activity pages fetch."""
+import logging
+import re
+from typing import Any, Dict, List, Optional
+from urllib.parse import unquote
+
+from app.linkedin_ids import parse_activity_id, to_activity_urn
+
+logger = logging.getLogger(__name__)
+
+# Feed payloads come from the Voyager REST and GraphQL endpoints
+FEED_URL_MARKERS = (
+    '/voyager/api/',
+)
+
+# Normalized responses use "application/vnd.linkedin.normalized+json+2.1"
+FEED_CONTENT_TYPE_MARKER = 'json'
+
+# Vanity name in a member or company page link
+_PROFILE_LINK = re.compile(r'linkedin\.com/(?:in|company)/([^/?#]+)', re.IGNORECASE)
+
+
+def is_feed_response(url: str, content_type: Optional[str]) -> bool:
+    """
+    Check whether a network response is a Voyager JSON payload worth parsing.
+    
+    Args:
+        url: Response URL
+        content_type: Value of the content-type header (may be None)
+    
+    Returns:
+        True if the response should be handed to parse_feed_payload
+    """
+    if not content_type or FEED_CONTENT_TYPE_MARKER not in content_type:
+        return False
+    return any(marker in url for marker in FEED_URL_MARKERS)
+
+
+def profile_slug(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a handle ("jane-doe", "company/acme" or a profile URL) to its vanity name.
+    
+    Returns:
+        Lowercase vanity name, or None if there is nothing to match on
+    """
+    if not value:
+        return None
+    
+    value = unquote(value).strip()
+    match = _PROFILE_LINK.search(value)
+    if match:
+        value = match.group(1)
+    elif value.startswith('company/'):
+        value = value[len('company/'):]
+    
+    return value.strip('/').lower() or None
+
+
+def _actor_slug(actor: Any) -> Optional[str]:
+    """Vanity name of an update's actor, from the link on their name."""
+    if not isinstance(actor, dict):
+        return None
+    
+    navigation = actor.get('navigationContext') or {}
+    for candidate in (
+        navigation.get('actionTarget') if isinstance(navigation, dict) else None,
+        actor.get('navigationUrl'),
+    ):
+        if isinstance(candidate, str):
+            match = _PROFILE_LINK.search(unquote(candidate))
+            if match:
+                return match.group(1).lower()
+    return None
+
+
+def _text(value: Any) -> Optional[str]:
+    """Unwrap LinkedIn's TextViewModel ({"text": ...}) nesting into a plain string."""
+    while isinstance(value, dict):
+        value = value.get('text')
+    if isinstance(value, str) and value.strip():
+        return value.strip()
+    return None
+
+
+def _update_urn(entity: Dict[str, Any]) -> Optional[str]:
+    """Find the activity URN on an update entity."""
+    metadata = entity.get('metadata') or entity.get('updateMetadata') or {}
+    for candidate in (
+        metadata.get('backendUrn') if isinstance(metadata, dict) else None,
+        metadata.get('urn') if isinstance(metadata, dict) else None,
+        entity.get('urn'),
+        entity.get('entityUrn'),
+        entity.get('*socialDetail'),
+    ):
+        if isinstance(candidate, str) and parse_activity_id(candidate):
+            return to_activity_urn(candidate)
+    return None
+
+
+def _parse_update(entity: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert one update entity into the raw post dict used by the scraper.
+    
+    Returns:
+        Dict with urn, url, author, content, time_text (same shape as the
+        DOM extraction), or None if the entity isn't an original text post
+    """
+    urn = _update_urn(entity)
+    if not urn:
+        return None
+    
+    content = _text(entity.get('commentary'))
+    if not content:
+        return None
+    
+    actor = entity.get('actor') or {}
+    
+    return {
+        'urn': urn,
+        'url': None,
+        'author': _text(actor.get('name')) if isinstance(actor, dict) else None,
+        'actor_slug': _actor_slug(actor),
+        'content': content,
+        'content_selector': None,
+        # e.g. "2d • Edited • Visible to anyone" - only used if the URN has no timestamp
+        'time_text': (_text(actor.get('subDescription')) or '') if isinstance(actor, dict) else '',
+        'is_reshare': bool(entity.get('resharedUpdate') or entity.get('*resharedUpdate')),
+    }
+
+
+def _walk(node: Any):
+    """Yield every dict in a JSON tree."""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if isinstance(current, dict):
+            yield current
+            stack.extend(current.values())
+        elif isinstance(current, list):
+            stack.extend(current)
+
+
+def parse_feed_payload(payload: Any, handle: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Extract posts from a Voyager response body.
+    
+    Works for both normalized payloads (entities in "included") and nested
+    GraphQL payloads by looking for any object carrying "commentary" text and
+    an activity URN, rather than depending on one exact response shape.
+    
+    A profile page also loads suggested posts, commenters' posts and the
+    originals inside reshares. With handle set, only updates whose actor
+    links to that profile are kept, so other people's posts are never
+    stored under the scraped author.
+    
+    Args:
+        payload: Decoded JSON response
+        handle: Scraped handle or profile URL (see profile_slug)
+    
+    Returns:
+        Raw post dicts, deduplicated by URN
+    """
+    slug = profile_slug(handle)
+    posts: Dict[str, Dict[str, Any]] = {}
+    reshared_urns = set()
+    
+    for entity in _walk(payload):
+        # The original post inside a reshare belongs to someone else
+        reshared = entity.get('resharedUpdate') or entity.get('*resharedUpdate')
+        if isinstance(reshared, dict):
+            reshared_urns.add(_update_urn(reshared))
+        elif isinstance(reshared, str):
+            reshared_urns.add(to_activity_urn(reshared))
+        
+        if 'commentary' not in entity:
+            continue
+        
+        post = _parse_update(entity)
+        if not post or (slug and post['actor_slug'] != slug):
+            continue
+        if post['urn'] not in posts:
+            posts[post['urn']] = post
+    
+    return [post for urn, post in posts.items() if urn not in reshared_urns]
+
+
+def newest_first(posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Sort raw posts by activity ID (i.e. creation time), newest first."""
+    return sorted(posts, key=lambda p: parse_activity_id(p['urn']) or 0, reverse=True)
@@ -0,0 +1,105 @@
+"""Helpers for LinkedIn activity URNs and the URL forms that embed them."""
+import re
+from datetime import datetime, timedelta
+from typing import Optional
+from urllib.parse import unquote
+
+# Activity IDs are snowflake-style: the top 41 bits are milliseconds since the Unix epoch
+_TIMESTAMP_SHIFT = 22
+
+# LinkedIn launched in 2003; anything earlier means we decoded something that isn't an activity ID
+_MIN_ACTIVITY_TIME = datetime(2003, 1, 1)
+
+# Activity IDs are 19-digit integers today; accept anything 15+ digits
+_ACTIVITY_PATTERNS = [
+    # urn:li:activity:7402441752508465152 (data-urn, data-id, feed/update URLs)
+    re.compile(r'urn:li:activity:(\d{15,})'),
+    # /posts/jane-doe_some-title-activity-7402441752508465152-AbCd
+    re.compile(r'[-_]activity[-_](\d{15,})'),
+]
+
+
+def parse_activity_id(value: Optional[str]) -> Optional[int]:
+    """
+    Extract the numeric activity ID from any URN or URL form we store.
+    
+    Handles:
+    - urn:li:activity:<id>
+    - https://www.linkedin.com/feed/update/urn:li:activity:<id>/
+    - URL-encoded variants (urn%3Ali%3Aactivity%3A<id>)
+    - https://www.linkedin.com/posts/<slug>-activity-<id>-<suffix>
+    
+    Args:
+        value: URN or URL string
+    
+    Returns:
+        Activity ID, or None if the value doesn't reference an activity
+        (e.g. fallback profile URLs or share/ugcPost URNs)
+    """
+    if not value:
+        return None
+    
+    decoded = unquote(value)
+    for pattern in _ACTIVITY_PATTERNS:
+        match = pattern.search(decoded)
+        if match:
+            return int(match.group(1))
+    
+    return None
+
+
+def to_activity_urn(value: Optional[str]) -> Optional[str]:
+    """
+    Normalize a URN or URL into the canonical "urn:li:activity:<id>" form.
+    
+    Returns:
+        Canonical URN, or None if no activity ID could be parsed
+    """
+    activity_id = parse_activity_id(value)
+    if activity_id is None:
+        return None
+    return f"urn:li:activity:{activity_id}"
+
+
+def activity_url(value: Optional[str]) -> Optional[str]:
+    """
+    Build the canonical feed URL for an activity URN/URL.
+    
+    Returns:
+        https://www.linkedin.com/feed/update/urn:li:activity:<id>/ or None
+    """
+    urn = to_activity_urn(value)
+    if urn is None:
+        return None
+    return f"https://www.linkedin.com/feed/update/{urn}/"
+
+
+def activity_timestamp(value: Optional[str]) -> Optional[datetime]:
+    """
+    Decode the exact creation time embedded in an activity ID.
+    
+    The first 41 bits of the 64-bit activity ID hold a millisecond Unix
+    timestamp, so the post date can be read straight from the URN instead of
+    approximating it from "2d" / "1w" / "3mo" relative text.
+    
+    Args:
+        value: URN or URL string
+    
+    Returns:
+        Naive UTC datetime (matching datetime.utcnow() used elsewhere), or
+        None if there's no activity ID or it decodes to an implausible date
+    """
+    activity_id = parse_activity_id(value)
+    if activity_id is None:
+        return None
+    
+    timestamp_ms = activity_id >> _TIMESTAMP_SHIFT
+    try:
+        posted_at = datetime(1970, 1, 1) + timedelta(milliseconds=timestamp_ms)
+    except OverflowError:
+        return None
+    
+    if posted_at < _MIN_ACTIVITY_TIME or posted_at > datetime.utcnow() + timedelta(days=1):
+        return None
+    
+    return posted_at
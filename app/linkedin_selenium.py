@@ -17,7 +17,9 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 
+from app.browser_watchdog import get_browser_watchdog
 from app.config import get_settings
+from app.linkedin_ids import to_activity_urn, activity_url, activity_timestamp
 from app.logging_config import (
     log_operation_start,
     log_operation_success,
@@ -41,6 +43,18 @@ logger = logging.getLogger(__name__)
 SESSION_WARNING_DAYS = 25
 SESSION_MAX_AGE_DAYS = 30
 
+# data-urn of every "Feed post number N" article, in document order.
+# Entries line up 1:1 with the BeautifulSoup header list (None when an h2
+# has no article ancestor) so the parse loop can join by index.
+COLLECT_POST_URNS_JS = """
+return Array.from(document.querySelectorAll('h2.visually-hidden'))
+    .filter((h2) => (h2.textContent || '').includes('Feed post number'))
+    .map((h2) => {
+        const article = h2.closest('div[role="article"]');
+        return article ? article.getAttribute('data-urn') : null;
+    });
+"""
+
 
 class LinkedInPost:
     """Represents a scraped LinkedIn post."""
@@ -56,6 +70,7 @@ class LinkedInPost:
         comments: int = 0,
     ):
         self.url = url
+        self.activity_urn = to_activity_urn(url)
         self.author_handle = author_handle
         self.author_name = author_name
         self.content = content
@@ -445,6 +460,30 @@ class LinkedInSeleniumAutomation:
         except Exception as e:
             log_operation_error(logger, "stop_selenium_driver", e)
     
+    async def _recycle_if_over_memory(self) -> None:
+        """
+        Safe point: restart the driver if its Chromium has grown past the memory ceiling.
+        
+        Only this driver's process tree (chromedriver and the Chrome it
+        launched) is measured; cookies are reloaded by _start_driver.
+        """
+        if not self.driver:
+            return
+        
+        watchdog = get_browser_watchdog()
+        try:
+            driver_pid = self.driver.service.process.pid
+        except AttributeError:
+            return
+        
+        if not watchdog.over_limit(driver_pid):
+            return
+        
+        watchdog.record_recycle("selenium")
+        await self.stop()
+        self.driver = None
+        await self.start()
+    
     def _check_for_security_challenge(self) -> bool:
         """
         Check if LinkedIn is showing a security challenge.
@@ -885,6 +924,14 @@ Alternative: Connect via VNC client to localhost:5900
             logger.info("📦 Extracting page HTML for parsing...")
             page_html = self.driver.page_source
             
+            # Collect every post's data-urn from the live DOM in one round trip
+            try:
+                live_urns = self.driver.execute_script(COLLECT_POST_URNS_JS) or []
+                logger.info(f"🔍 Collected {len(live_urns)} post URNs from live DOM")
+            except Exception as e:
+                logger.warning(f"⚠️  Could not collect post URNs: {e}")
+                live_urns = []
+            
             # Save HTML for parsing
             html_file = f"/app/data/linkedin_page_{handle}.html"
             with open(html_file, 'w', encoding='utf-8') as f:
@@ -956,101 +1003,74 @@ Alternative: Connect via VNC client to localhost:5900
                         logger.debug(f"⚠️  Skipping post {idx+1} - no substantial content")
                         continue
                     
-                    # EXTRACT UNIQUE POST URL - Use "Copy link to post" feature
+                    # EXTRACT UNIQUE POST URL - Join to the live DOM URN list by index
                     post_url = None
                     
-                    # Strategy: Find the post element in the actual DOM (not BeautifulSoup) and click "Copy link"
-                    # We need to use Selenium to interact with the live page
-                    try:
-                        # Find all posts in the live DOM by the same "Feed post number" header
-                        # CRITICAL: Must find the article container (3 levels up from h2), not immediate parent
-                        from selenium.webdriver.common.by import By
-                        
-                        # DEBUG: Log current URL and try different selectors
-                        logger.info(f"   🔍 DEBUG: Current URL = {self.driver.current_url}")
-                        
-                        # Try multiple strategies
-                        h2_elements = self.driver.find_elements(By.XPATH, "//h2[contains(@class, 'visually-hidden')]")
-                        logger.info(f"   🔍 DEBUG: Found {len(h2_elements)} h2 elements with visually-hidden class")
-                        
-                        h2_with_text = self.driver.find_elements(By.XPATH, "//h2[contains(., 'Feed post number')]")
-                        logger.info(f"   🔍 DEBUG: Found {len(h2_with_text)} h2 elements containing 'Feed post number'")
-                        
-                        articles = self.driver.find_elements(By.XPATH, "//div[@role='article']")
-                        logger.info(f"   🔍 DEBUG: Found {len(articles)} div elements with role='article'")
-                        
-                        live_posts = self.driver.find_elements(By.XPATH, "//h2[contains(@class, 'visually-hidden') and contains(., 'Feed post number')]/ancestor::div[@role='article']")
-                        
-                        logger.info(f"   🔍 Found {len(live_posts)} live posts in DOM for post {idx+1}")
-                        
-                        if idx < len(live_posts):
-                            live_post = live_posts[idx]
-                            
-                            # Extract the data-urn attribute from the article element
-                            # This contains the LinkedIn activity ID we need for the URL
-                            try:
-                                data_urn = live_post.get_attribute("data-urn")
-                                if data_urn and 'activity:' in data_urn:
-                                    # Format: urn:li:activity:7402441752508465152
-                                    # Convert to: https://www.linkedin.com/feed/update/urn:li:activity:7402441752508465152/
-                                    post_url = f"https://www.linkedin.com/feed/update/{data_urn}/"
-                                    logger.info(f"   ✅ Extracted URL from data-urn: {post_url}")
-                                else:
-                                    logger.warning(f"   ⚠️  No valid data-urn found on post {idx+1}: {data_urn}")
-                            except Exception as urn_err:
-                                logger.warning(f"   ⚠️  Could not extract data-urn: {urn_err}")
+                    if idx < len(live_urns):
+                        data_urn = live_urns[idx]
+                        if to_activity_urn(data_urn):
+                            # Format: urn:li:activity:7402441752508465152
+                            # Convert to: https://www.linkedin.com/feed/update/urn:li:activity:7402441752508465152/
+                            post_url = activity_url(data_urn)
+                            logger.info(f"   ✅ Extracted URL from data-urn: {post_url}")
                         else:
-                            logger.warning(f"   ⚠️  Post index {idx} out of range (only {len(live_posts)} posts)")
-                    except Exception as e:
-                        logger.warning(f"   ⚠️  Error extracting URL via copy link: {e}", exc_info=True)
+                            logger.warning(f"   ⚠️  No valid data-urn found on post {idx+1}: {data_urn}")
+                    else:
+                        logger.warning(f"   ⚠️  Post index {idx} out of range (only {len(live_urns)} posts)")
                     
-                    # Fallback: use profile URL + timestamp if copy link failed
+                    # Fallback: use profile URL + timestamp if no URN was found
                     if not post_url:
                         timestamp = int(datetime.utcnow().timestamp())
                         post_url = f"{profile_url}#post-{timestamp}-{idx}"
-                        logger.warning(f"⚠️  Could not extract URL via copy link for post {idx+1}, using fallback URL")
+                        logger.warning(f"⚠️  Could not extract URL from data-urn for post {idx+1}, using fallback URL")
                     
-                    # EXTRACT POST DATE - Look for relative time text
+                    # EXTRACT POST DATE - Exact time from the activity ID when we have one
                     logger.info(f"   🕐 Starting date extraction for post {idx+1}")
-                    post_date = datetime.utcnow()  # Default fallback
-                    
-                    # Strategy 1: Look for visually-hidden span with "X days ago"
-                    # Find all visually-hidden spans and check their text
-                    time_spans = post_element.find_all('span', class_='visually-hidden')
-                    time_text_found = None
-                    logger.info(f"   🔎 Found {len(time_spans)} visually-hidden spans in post {idx+1}")
-                    for span in time_spans:
-                        text = span.get_text(strip=True)
-                        if text and 'ago' in text.lower():
-                            logger.info(f"     ✅ Found time span: '{text[:50]}'")
-                            # Parse text like "1 day ago • Visible to anyone..." 
-                            if '•' in text:
-                                text = text.split('•')[0].strip()
-                            time_text_found = text
-                            break
+                    post_date = activity_timestamp(post_url)
                     
-                    if time_text_found:
-                        post_date = self._parse_relative_time(time_text_found)
-                        logger.info(f"   📅 Parsed post date: {time_text_found} → {post_date}")
+                    if post_date:
+                        logger.info(f"   📅 Post date from activity ID: {post_date}")
                     else:
-                        logger.info(f"   ⚠️  No 'ago' text found in {len(time_spans)} visually-hidden spans for post {idx+1}")
-                        # Strategy 2: Look for time element or datetime attribute
-                        time_elem = post_element.find('time')
-                        if time_elem:
-                            # Check for datetime attribute (absolute time)
-                            datetime_attr = time_elem.get('datetime')
-                            if datetime_attr:
-                                try:
-                                    post_date = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
-                                    logger.info(f"   📅 Parsed from time element datetime attr: {datetime_attr} → {post_date}")
-                                except Exception as e:
-                                    logger.info(f"   Failed to parse datetime attr: {e}")
-                            else:
-                                # Parse relative text from time element
-                                time_text = time_elem.get_text(strip=True)
-                                if time_text:
-                                    post_date = self._parse_relative_time(time_text)
-                                    logger.info(f"   📅 Parsed from time element text: {time_text} → {post_date}")
+                        # No activity ID - fall back to relative time text
+                        post_date = datetime.utcnow()  # Default fallback
+                        
+                        # Strategy 1: Look for visually-hidden span with "X days ago"
+                        # Find all visually-hidden spans and check their text
+                        time_spans = post_element.find_all('span', class_='visually-hidden')
+                        time_text_found = None
+                        logger.info(f"   🔎 Found {len(time_spans)} visually-hidden spans in post {idx+1}")
+                        for span in time_spans:
+                            text = span.get_text(strip=True)
+                            if text and 'ago' in text.lower():
+                                logger.info(f"     ✅ Found time span: '{text[:50]}'")
+                                # Parse text like "1 day ago • Visible to anyone..." 
+                                if '•' in text:
+                                    text = text.split('•')[0].strip()
+                                time_text_found = text
+                                break
+                        
+                        if time_text_found:
+                            post_date = self._parse_relative_time(time_text_found)
+                            logger.info(f"   📅 Parsed post date: {time_text_found} → {post_date}")
+                        else:
+                            logger.info(f"   ⚠️  No 'ago' text found in {len(time_spans)} visually-hidden spans for post {idx+1}")
+                            # Strategy 2: Look for time element or datetime attribute
+                            time_elem = post_element.find('time')
+                            if time_elem:
+                                # Check for datetime attribute (absolute time)
+                                datetime_attr = time_elem.get('datetime')
+                                if datetime_attr:
+                                    try:
+                                        post_date = datetime.fromisoformat(datetime_attr.replace('Z', '+00:00'))
+                                        logger.info(f"   📅 Parsed from time element datetime attr: {datetime_attr} → {post_date}")
+                                    except Exception as e:
+                                        logger.info(f"   Failed to parse datetime attr: {e}")
+                                else:
+                                    # Parse relative text from time element
+                                    time_text = time_elem.get_text(strip=True)
+                                    if time_text:
+                                        post_date = self._parse_relative_time(time_text)
+                                        logger.info(f"   📅 Parsed from time element text: {time_text} → {post_date}")
                     
                     # Check if post is within the cutoff date (skip if too old)
                     if post_date < cutoff_date:
@@ -1101,6 +1121,9 @@ Alternative: Connect via VNC client to localhost:5900
         log_operation_start(logger, "selenium_scrape_posts", handle=handle, max_posts=max_posts)
         
         try:
+            # Between handles is the safe point to shed a bloated browser
+            await self._recycle_if_over_memory()
+            
             # Run scraping in thread pool
             loop = asyncio.get_event_loop()
             posts = await loop.run_in_executor(
@@ -1,11 +1,12 @@
 """Application entry point with FastAPI."""
 import asyncio
+import json
 import logging
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import List, Optional
 from fastapi import FastAPI, Depends, HTTPException, Query, Request
-from fastapi.responses import JSONResponse, RedirectResponse, Response, HTMLResponse
+from fastapi.responses import JSONResponse, RedirectResponse, Response, HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from sqlalchemy import select, func
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -15,13 +16,19 @@ import time
 from app.config import get_settings
 from app.database import init_db, close_db, get_db
 from app.models import LinkedInPost, PostVariant, ApprovalRequest, PostStatus, VariantStatus, ScheduledPost, ScheduledPostStatus
-from app.email import get_email_service, generate_approval_token
-from app.ai import get_ai_service
+from app.email import get_email_service
+from app.ai import get_ai_service, variant_model
 from app.linkedin import get_linkedin_service
 from app.linkedin_selenium import get_selenium_linkedin_service
 from app.scheduler import get_scheduler
 from app.admin_dashboard import get_dashboard_html
-from app.chrome_lock import get_chrome_lock
+from app.chrome_lock import (
+    get_chrome_lock,
+    LockPriority,
+    ChromeLockTimeout,
+    flush_lock_telemetry,
+    get_lock_telemetry_summary,
+)
 from app.schemas import (
     LinkedInPostResponse,
     LinkedInPostDetailResponse,
@@ -109,11 +116,14 @@ async def _publish_single_scheduled_post(
         await db.commit()
         
         # Attempt to repost using direct URL approach
-        if not post.original_post_url:
+        # Prefer the canonical activity URL - scraped URLs can be fallback profile links
+        from app.linkedin_ids import activity_url
+        post_url = activity_url(post.activity_urn) or post.original_post_url
+        if not post_url:
             raise ValueError(f"Post {post_id} has no original_post_url")
             
         success = await linkedin.repost_by_url(
-            post_url=post.original_post_url,
+            post_url=post_url,
             variant_text=variant.variant_content
         )
         
@@ -212,9 +222,18 @@ async def check_and_publish_posts():
     
     log_operation_start(logger, "check_and_publish_posts")
     
-    # Acquire Chrome lock for posting
+    # Acquire Chrome lock for posting (jumps ahead of queued scrapes; gives up before the next run)
     chrome_lock = get_chrome_lock()
-    await chrome_lock.acquire(operation="posting", locked_by="check_and_publish_posts")
+    try:
+        await chrome_lock.acquire(
+            operation="posting",
+            locked_by="check_and_publish_posts",
+            priority=LockPriority.PUBLISH,
+            timeout=get_settings().chrome_lock_publish_timeout_seconds
+        )
+    except ChromeLockTimeout as e:
+        log_operation_error(logger, "check_and_publish_posts", e)
+        return
     
     try:
         # Get database session
@@ -310,8 +329,6 @@ async def scheduled_scrape_and_process(test_handle: Optional[str] = None):
     operation_name = f"test_scrape_{test_handle}" if test_handle else "scheduled_scrape_and_process"
     log_operation_start(logger, operation_name)
     
-    settings = get_settings()
-    
     # Get database session to fetch monitored handles
     async for db in get_db():
         # Fetch active monitored handles from database
@@ -343,201 +360,27 @@ async def scheduled_scrape_and_process(test_handle: Optional[str] = None):
         
         break  # Just need the first session
     
-    # Import health monitoring
-    from app.health_monitor import update_last_successful_scrape
-    
-    total_scraped = 0
-    total_processed = 0
-    total_failed = 0
-    
-    # Acquire Chrome lock for scraping
-    chrome_lock = get_chrome_lock()
-    await chrome_lock.acquire(operation="scraping", locked_by="scheduled_scrape_and_process")
+    from app.scrape_pipeline import run_scrape_pipeline
     
     try:
-        # Get database session
-        async for db in get_db():
-            try:
-                # Get services (using Playwright for better stability)
-                linkedin = get_linkedin_service()
-                ai_service = get_ai_service()
-                email_service = get_email_service()
-                
-                # Start browser once for all handles
-                await linkedin.start()
-                
-                try:
-                    # Scrape each monitored handle
-                    for idx, monitored_handle in enumerate(monitored_handles):
-                        handle = monitored_handle.handle
-                        display_name = monitored_handle.display_name or "Unknown"
-                        relationship = monitored_handle.relationship
-                        custom_context = monitored_handle.custom_context
-                        
-                        # Update progress
-                        chrome_lock.update_progress(f"Scraping @{handle} ({idx + 1}/{len(monitored_handles)})")
-                        
-                        logger.info(f"📥 Scraping @{handle} ({display_name}, {relationship.value})...")
-                        
-                        try:
-                            # Scrape posts from this handle
-                            posts = await linkedin.scrape_user_posts(
-                                handle=handle,
-                                max_posts=10,  # Check last 10 posts
-                                days_back=7,   # Within last 7 days
-                                author_name=display_name  # Use display name from database
-                            )
-                            
-                            logger.info(f"✅ Scraped {len(posts)} posts from @{handle}")
-                            total_scraped += len(posts)
-                            
-                            # Update last_scraped_at timestamp
-                            from datetime import datetime
-                            monitored_handle.last_scraped_at = datetime.utcnow()
-                            await db.commit()
-                            
-                            # Update health monitoring
-                            await update_last_successful_scrape(db)
-                            
-                            # Process each scraped post
-                            for post_data in posts:
-                                try:
-                                    # Check if we already have this post (fuzzy match on content + author)
-                                    from app.utils import fuzzy_match
-                                    
-                                    existing_posts = await db.execute(
-                                        select(LinkedInPost).where(
-                                            LinkedInPost.author_handle == handle
-                                        )
-                                    )
-                                    existing = existing_posts.scalars().all()
-                                    
-                                    # Check for duplicate using fuzzy matching
-                                    is_duplicate = False
-                                    for existing_post in existing:
-                                        if fuzzy_match(existing_post.original_content, post_data.content, threshold=0.90):
-                                            logger.info(f"⏭️  Skipping duplicate post from @{handle}")
-                                            is_duplicate = True
-                                            break
-                                    
-                                    if is_duplicate:
-                                        continue
-                                    
-                                    # Create new post in database
-                                    new_post = LinkedInPost(
-                                        original_post_url=post_data.url,
-                                        author_handle=handle,
-                                        author_name=post_data.author_name,
-                                        original_content=post_data.content,
-                                        original_post_date=post_data.post_date,
-                                        status=PostStatus.SCRAPED,
-                                        scraped_at=datetime.utcnow()
-                                    )
-                                    db.add(new_post)
-                                    await db.flush()  # Get the ID
-                                    
-                                    logger.info(f"💾 Saved post {new_post.id} from @{handle}")
-                                    
-                                    # Generate AI variants
-                                    logger.info(f"🤖 Generating AI variants for post {new_post.id}...")
-                                    variant_texts = await ai_service.generate_variants(
-                                        original_content=post_data.content,
-                                        author_name=post_data.author_name,
-                                        num_variants=3,
-                                        relationship=relationship.value,
-                                        custom_context=custom_context
-                                    )
-                                    
-                                    # Save variants to database
-                                    variants = []
-                                    for i, variant_text in enumerate(variant_texts, 1):
-                                        variant = PostVariant(
-                                            original_post_id=new_post.id,
-                                            variant_number=i,
-                                            variant_content=variant_text,
-                                            ai_model=settings.ai_model,
-                                            status=VariantStatus.PENDING
-                                        )
-                                        db.add(variant)
-                                        variants.append(variant)
-                                    
-                                    await db.flush()
-                                    
-                                    # Update post status
-                                    new_post.status = PostStatus.VARIANTS_GENERATED
-                                    new_post.variants_generated_at = datetime.utcnow()
-                                    
-                                    logger.info(f"✅ Generated {len(variants)} variants for post {new_post.id}")
-                                    
-                                    # Create approval request
-                                    approval_token = generate_approval_token()
-                                    approval_request = ApprovalRequest(
-                                        original_post_id=new_post.id,
-                                        approval_token=approval_token,
-                                        expires_at=datetime.utcnow() + timedelta(days=7)
-                                    )
-                                    db.add(approval_request)
-                                    await db.flush()
-                                    
-                                    # Send approval email
-                                    logger.info(f"📧 Sending approval email for post {new_post.id}...")
-                                    email_response = await email_service.send_approval_email(
-                                        post=new_post,
-                                        variants=variants,
-                                        approval_token=approval_token
-                                    )
-                                    
-                                    # Update post status
-                                    new_post.status = PostStatus.AWAITING_APPROVAL
-                                    new_post.approval_email_sent_at = datetime.utcnow()
-                                    
-                                    logger.info(f"✅ Sent approval email for post {new_post.id}")
-                                    
-                                    await db.commit()
-                                    total_processed += 1
-                                    
-                                except Exception as e:
-                                    logger.error(f"❌ Failed to process post from @{handle}: {e}")
-                                    await db.rollback()
-                                    total_failed += 1
-                                    continue
-                            
-                        except Exception as e:
-                            logger.error(f"❌ Failed to scrape @{handle}: {e}")
-                            total_failed += 1
-                        
-                        # Add human-like delay between profiles (except after last one)
-                        if idx < len(monitored_handles) - 1:
-                            from app.utils import random_profile_delay
-                            random_profile_delay()
-                
-                finally:
-                    # Stop browser after all handles
-                    await linkedin.stop()
-                
-                logger.info(f"✅ Scheduled scrape complete:")
-                logger.info(f"   📥 Scraped: {total_scraped} posts")
-                logger.info(f"   ✅ Processed: {total_processed} posts")
-                logger.info(f"   ❌ Failed: {total_failed} posts")
-                
-                log_operation_success(
-                    logger,
-                    "scheduled_scrape_and_process",
-                    scraped=total_scraped,
-                    processed=total_processed,
-                    failed=total_failed
-                )
-                
-            finally:
-                await db.close()
-                break  # Only use first session from generator
-                
+        # Chrome lock is held by the scrape stage only
+        stats = await run_scrape_pipeline(monitored_handles)
+        
+        logger.info(f"✅ Scheduled scrape complete:")
+        logger.info(f"   📥 Scraped: {stats.scraped} posts")
+        logger.info(f"   ✅ Processed: {stats.processed} posts")
+        logger.info(f"   ❌ Failed: {stats.failed} posts")
+        
+        log_operation_success(
+            logger,
+            "scheduled_scrape_and_process",
+            scraped=stats.scraped,
+            processed=stats.processed,
+            failed=stats.failed
+        )
+        
     except Exception as e:
         log_operation_error(logger, "scheduled_scrape_and_process", e)
-    finally:
-        # Always release the Chrome lock
-        chrome_lock.release()
-
 
 
 async def cleanup_stale_schedule():
@@ -720,18 +563,47 @@ async def lifespan(app: FastAPI):
         replace_existing=True
     )
     
+    # Persist Chrome lock wait/hold totals every 15 minutes
+    scheduler_instance.add_job(
+        func=lambda: asyncio.create_task(flush_lock_telemetry()),
+        trigger=IntervalTrigger(minutes=15),
+        id='flush_lock_telemetry',
+        name='Save Chrome lock telemetry',
+        replace_existing=True
+    )
+    
     scheduler_instance.start()
     logger.info("✅ Background scheduler started")
     logger.info("   📅 Publishing check: Every 5 minutes")
     logger.info("   📅 Scraping schedule: 5:30 AM and 1:00 PM MST/MDT")
     logger.info("   📅 Cleanup schedule: 3:00 AM MST/MDT (removes DEAD posts >7 days)")
     
+    # Launch the pooled browser now so the first scrape/publish skips the cold start
+    from app.browser_pool import get_browser_pool
+    browser_pool = get_browser_pool()
+    if browser_pool:
+        browser_pool.warm_in_background()
+    
+    # Sample Chromium memory so long runs restart the browser before the OOM killer steps in
+    from app.browser_watchdog import get_browser_watchdog
+    browser_watchdog = get_browser_watchdog()
+    browser_watchdog.start()
+    
     yield
     
     # Cleanup on shutdown
     logger.info("🛑 Shutting down LinkedIn Reposter...")
     scheduler_instance.shutdown()
     logger.info("✅ Background scheduler stopped")
+    
+    from app.http_clients import close_http_clients
+    await close_http_clients()
+    
+    await browser_watchdog.stop()
+    if browser_pool:
+        await browser_pool.close()
+    
+    await flush_lock_telemetry()
     await close_db()
 
 
@@ -1111,24 +983,24 @@ async def admin_regenerate_variants(
     post_id: int,
     db: AsyncSession = Depends(get_db)
 ):
-    """Regenerate AI variants for a post."""
+    """
+    Regenerate AI variants for a post.
+    
+    Variants are streamed from the AI service and saved one at a time. The
+    response is NDJSON: one line per saved variant, then a summary line, so
+    the dashboard shows progress as soon as the first variant exists.
+    """
     log_operation_start(logger, "admin_regenerate_variants", post_id=post_id)
     
     # Get the post
     result = await db.execute(
-        select(LinkedInPost)
-        .options(selectinload(LinkedInPost.variants))
-        .where(LinkedInPost.id == post_id)
+        select(LinkedInPost).where(LinkedInPost.id == post_id)
     )
     post = result.scalar_one_or_none()
     
     if not post:
         raise HTTPException(status_code=404, detail="Post not found")
     
-    # Delete old variants
-    for variant in post.variants:
-        await db.delete(variant)
-    
     # Generate new variants
     ai_service = get_ai_service()
     
@@ -1142,44 +1014,81 @@ async def admin_regenerate_variants(
     relationship = monitored_handle.relationship.value if monitored_handle else None
     custom_context = monitored_handle.custom_context if monitored_handle else None
     
+    variant_stream = ai_service.stream_variants(
+        original_content=post.original_content,
+        author_name=post.author_name,
+        num_variants=3,
+        relationship=relationship,
+        custom_context=custom_context,
+        bypass_cache=True  # Admin asked for fresh output
+    )
+    
+    # Wait for the first variant before answering, so a failed AI call is still a 500
     try:
-        variants = await ai_service.generate_variants(
-            original_content=post.original_content,
-            author_name=post.author_name,
-            num_variants=3,
-            relationship=relationship,
-            custom_context=custom_context
-        )
-        
-        # Create new variant records
-        settings = get_settings()
-        for i, variant_content in enumerate(variants, 1):
-            variant = PostVariant(
-                original_post_id=post.id,
-                variant_number=i,
-                variant_content=variant_content,
-                status=VariantStatus.PENDING,
-                ai_model=settings.ai_model,
-                generation_prompt=f"Regenerated via admin dashboard"
-            )
-            db.add(variant)
-        
-        # Update post status
-        post.status = PostStatus.AWAITING_APPROVAL
-        
-        await db.commit()
-        
-        log_operation_success(logger, "admin_regenerate_variants", post_id=post_id, variants_count=len(variants))
-        
-        return {"success": True, "message": f"Generated {len(variants)} new variants"}
-        
+        first_variant = await variant_stream.__anext__()
+    except StopAsyncIteration:
+        log_operation_error(logger, "admin_regenerate_variants", ValueError("No variants generated"), post_id=post_id)
+        raise HTTPException(status_code=500, detail="Failed to generate variants: no variants returned")
     except Exception as e:
         log_operation_error(logger, "admin_regenerate_variants", e, post_id=post_id)
         raise HTTPException(status_code=500, detail=f"Failed to generate variants: {str(e)}")
+    
+    async def variants_in_order():
+        yield first_variant
+        async for variant_content in variant_stream:
+            yield variant_content
+    
+    async def save_variants():
+        # The request's session is closed once the response starts streaming
+        from app.database import get_session
+        
+        count = 0
+        
+        try:
+            async with await get_session() as stream_db:
+                result = await stream_db.execute(
+                    select(LinkedInPost)
+                    .options(selectinload(LinkedInPost.variants))
+                    .where(LinkedInPost.id == post_id)
+                )
+                stream_post = result.scalar_one()
+                
+                # Old variants are deleted in the same commit as the first new one
+                for variant in stream_post.variants:
+                    await stream_db.delete(variant)
+                
+                # Update post status
+                stream_post.status = PostStatus.AWAITING_APPROVAL
+                
+                async for variant_content in variants_in_order():
+                    count += 1
+                    stream_db.add(PostVariant(
+                        original_post_id=post_id,
+                        variant_number=count,
+                        variant_content=variant_content,
+                        status=VariantStatus.PENDING,
+                        ai_model=variant_model(variant_content),
+                        generation_prompt=f"Regenerated via admin dashboard"
+                    ))
+                    await stream_db.commit()
+                    
+                    yield json.dumps({"variant_number": count, "content": variant_content}) + "\n"
+            
+            log_operation_success(logger, "admin_regenerate_variants", post_id=post_id, variants_count=count)
+            
+            yield json.dumps({"success": True, "message": f"Generated {count} new variants"}) + "\n"
+            
+        except Exception as e:
+            log_operation_error(logger, "admin_regenerate_variants", e, post_id=post_id)
+            yield json.dumps({"success": False, "detail": f"Failed to generate variants: {str(e)}"}) + "\n"
+        finally:
+            await variant_stream.aclose()
+    
+    return StreamingResponse(save_variants(), media_type="application/x-ndjson")
 
 
 @app.get("/admin/status")
-async def admin_status():
+async def admin_status(db: AsyncSession = Depends(get_db)):
     """
     Get current Chrome operation status for admin dashboard.
     
@@ -1189,10 +1098,56 @@ async def admin_status():
         - started_at: When operation started
         - elapsed_seconds: How long operation has been running
         - current_progress: Human-readable progress (e.g., "Processing @handle 3/10")
+        - priority: Queue class of the holder (PUBLISH, MANUAL, SCRAPE)
         - waiters: Number of operations waiting for Chrome lock
+        - queue: Waiters in service order with position and expected wait
+        - telemetry: Per-operation wait/hold histograms since startup
+        - telemetry_24h: Per-operation wait/hold totals for the last 24 hours (from the database)
+        - browser_pool: Warm browser state (null when pooling is disabled)
+        - browser_watchdog: Latest Chromium RSS sample, peak and memory restarts
     """
+    from app.browser_pool import get_browser_pool
+    from app.browser_watchdog import get_browser_watchdog
+    
     chrome_lock = get_chrome_lock()
-    return JSONResponse(content=chrome_lock.get_status_dict())
+    browser_pool = get_browser_pool()
+    return JSONResponse(content={
+        **chrome_lock.get_status_dict(),
+        "telemetry": chrome_lock.get_telemetry_dict(),
+        "telemetry_24h": await get_lock_telemetry_summary(db, hours=24),
+        "browser_pool": browser_pool.get_status_dict() if browser_pool else None,
+        "browser_watchdog": get_browser_watchdog().get_status_dict(),
+    })
+
+
+@app.get("/admin/ai-status")
+async def admin_ai_status():
+    """
+    Get AI provider routing, concurrency and cache status.
+    
+    Returns:
+        - router: Per-provider p50/p95 latency, error rate and cooldown, plus hedging counters
+        - concurrency: Current adaptive concurrency limit and in-flight requests
+        - cache: Generation cache size and hit rate (null when disabled)
+        - copilot_token: Bearer token expiry and refresh state (null without a ghu_ refresh token)
+        - rate_limits: Per-API token bucket level, active pause and total throttled time
+    """
+    from app.ai_batch import get_ai_semaphore
+    from app.ai_cache import get_generation_cache
+    from app.rate_limit import get_rate_limit_status
+    
+    router = get_ai_service()
+    cache = get_generation_cache()
+    copilot_service = dict(router.providers).get("copilot")
+    token_manager = copilot_service.token_manager if copilot_service else None
+    
+    return JSONResponse(content={
+        "router": router.get_status_dict(),
+        "concurrency": get_ai_semaphore().get_status_dict(),
+        "cache": cache.get_status_dict() if cache else None,
+        "copilot_token": token_manager.get_status_dict() if token_manager else None,
+        "rate_limits": get_rate_limit_status(),
+    })
 
 
 @app.post("/admin/posts/{post_id}/reject")
@@ -1263,6 +1218,10 @@ async def admin_delete_post(
     await db.delete(post)
     await db.commit()
     
+    # Keep the near-duplicate index in step with the table
+    from app.dedup_index import get_dedup_index
+    get_dedup_index().remove(post_id)
+    
     log_operation_success(logger, "admin_delete_post", post_id=post_id)
     
     return {"success": True, "message": "Post deleted"}
@@ -1302,9 +1261,17 @@ async def admin_post_now(
     """Manually post a scheduled item immediately to LinkedIn."""
     log_operation_start(logger, "admin_post_now", scheduled_post_id=scheduled_post_id)
     
-    # Acquire Chrome lock for posting (will wait if scraping is in progress)
+    # Acquire Chrome lock for posting (a running scrape yields at its next safe point)
     chrome_lock = get_chrome_lock()
-    await chrome_lock.acquire(operation="posting", locked_by=f"admin_post_now({scheduled_post_id})")
+    try:
+        await chrome_lock.acquire(
+            operation="posting",
+            locked_by=f"admin_post_now({scheduled_post_id})",
+            priority=LockPriority.PUBLISH,
+            timeout=get_settings().chrome_lock_publish_timeout_seconds
+        )
+    except ChromeLockTimeout as e:
+        raise HTTPException(status_code=503, detail=f"Browser busy: {e}")
     
     try:
         # Get the scheduled post with related data
@@ -1373,7 +1340,6 @@ async def _keep_browser_open(url: str):
     logger.info(f"🚀 Background task started for URL: {url}")
     
     from app.linkedin_selenium import LinkedInSeleniumAutomation
-    import time
     
     linkedin = LinkedInSeleniumAutomation(headless=False)  # Non-headless for VNC visibility
     
@@ -1396,7 +1362,7 @@ async def _keep_browser_open(url: str):
             try:
                 # Check if browser is still alive
                 linkedin.driver.title
-                time.sleep(1)
+                await asyncio.sleep(1)
             except Exception as e:
                 logger.info(f"🛑 Browser check failed: {e}")
                 break
@@ -1490,10 +1456,15 @@ async def admin_test_scrape_handle(
     # Run scrape in background for just this handle
     async def scrape_single_handle():
         from app.health_monitor import update_last_successful_scrape
+        from app.scrape_pipeline import known_activity_urns
         from app.utils import fuzzy_match
         
         chrome_lock = get_chrome_lock()
-        await chrome_lock.acquire(operation="test-scraping", locked_by=f"test_scrape_{handle}")
+        await chrome_lock.acquire(
+            operation="test-scraping",
+            locked_by=f"test_scrape_{handle}",
+            priority=LockPriority.MANUAL
+        )
         
         try:
             async for db_session in get_db():
@@ -1512,7 +1483,8 @@ async def admin_test_scrape_handle(
                             handle=handle,
                             max_posts=10,
                             days_back=7,
-                            author_name=display_name
+                            author_name=display_name,
+                            known_urns=await known_activity_urns(db_session, handle)
                         )
                         
                         logger.info(f"✅ TEST: Scraped {len(posts)} posts from @{handle}")
@@ -1537,7 +1509,7 @@ async def admin_test_scrape_handle(
                     break
                     
         finally:
-            await chrome_lock.release()
+            chrome_lock.release()
     
     # Start background task
     asyncio.create_task(scrape_single_handle())
@@ -1792,21 +1764,26 @@ async def admin_regenerate_all_missing(db: AsyncSession = Depends(get_db)):
     
     # Process in background
     async def generate_missing_variants():
+        from app.ai_batch import GenerationRequest, generate_variants_batch
+        
         ai_service = get_ai_service()
         success_count = 0
         failed_count = 0
         
+        # All posts generate concurrently under the shared adaptive semaphore
+        results = await generate_variants_batch(ai_service, [
+            GenerationRequest(
+                original_content=post.original_content,
+                author_name=post.author_name
+            )
+            for post in posts_without_variants
+        ])
+        
         async for db_session in get_db():
-            for post in posts_without_variants:
+            for post, variants in zip(posts_without_variants, results):
                 try:
-                    logger.info(f"🤖 Generating variants for post {post.id} from @{post.author_handle}")
-                    
-                    # Generate 3 variants
-                    variants = await ai_service.generate_variants(
-                        original_content=post.original_content,
-                        author_name=post.author_name,
-                        author_handle=post.author_handle
-                    )
+                    if isinstance(variants, Exception):
+                        raise variants
                     
                     # Save variants to database
                     for i, variant_text in enumerate(variants, 1):
@@ -1814,12 +1791,14 @@ async def admin_regenerate_all_missing(db: AsyncSession = Depends(get_db)):
                             original_post_id=post.id,
                             variant_number=i,
                             variant_content=variant_text,
+                            ai_model=variant_model(variant_text),
                             status=VariantStatus.PENDING
                         )
                         db_session.add(variant)
                     
-                    # Update post status
-                    post.status = PostStatus.AWAITING_APPROVAL
+                    # Update post status (post was loaded by the request's session)
+                    session_post = await db_session.get(LinkedInPost, post.id)
+                    session_post.status = PostStatus.AWAITING_APPROVAL
                     await db_session.commit()
                     
                     success_count += 1
@@ -2499,7 +2478,7 @@ Check it out and let me know what you think!
                 }
                 for i, variant in enumerate(variants)
             ],
-            "model": ai_service.model
+            "model": variant_model(variants[0]) if variants else ai_service.model
         }
         
     except Exception as e:
@@ -2958,8 +2937,33 @@ async def linkedin_scrape(
         logger.info(f"✅ Scraped {len(posts)} posts from @{handle}")
         
         # Save new posts to database
+        from app.utils import content_fingerprint
+        
         new_posts_count = 0
         for post_data in posts:
+            # Check if post already exists by activity URN (unique index)
+            activity_urn = post_data.activity_urn
+            if activity_urn:
+                existing = await db.execute(
+                    select(LinkedInPost.id).where(LinkedInPost.activity_urn == activity_urn)
+                )
+                if existing.scalar_one_or_none() is not None:
+                    logger.debug(f"   Post already exists: {activity_urn}")
+                    continue
+            
+            # Check if post already exists by normalized content hash (indexed)
+            content_hash = content_fingerprint(post_data.content)
+            if content_hash is not None:
+                existing = await db.execute(
+                    select(LinkedInPost.id).where(
+                        LinkedInPost.content_hash == content_hash,
+                        LinkedInPost.author_handle == post_data.author_handle
+                    ).limit(1)
+                )
+                if existing.scalar_one_or_none() is not None:
+                    logger.debug(f"   Post already exists (same content): {post_data.url}")
+                    continue
+            
             # Check if post already exists by URL
             existing = await db.execute(
                 select(LinkedInPost).where(LinkedInPost.original_post_url == post_data.url)
@@ -2973,7 +2977,9 @@ async def linkedin_scrape(
                 author_name=post_data.author_name,
                 author_handle=post_data.author_handle,
                 original_content=post_data.content,
+                content_hash=content_hash,
                 original_post_url=post_data.url,
+                activity_urn=activity_urn,
                 original_post_date=post_data.post_date,
                 status=PostStatus.SCRAPED
             )
@@ -3107,13 +3113,21 @@ async def linkedin_repost(
         
         logger.info(f"🔄 Attempting repost (attempt {post.retry_count}/{max_retries})...")
         
-        # Attempt to repost
-        success = await linkedin.repost_with_variant(
-            author_handle=post.author_handle,
-            original_content=post.original_content,
-            variant_text=post.approved_variant_text,
-            fuzzy_threshold=fuzzy_threshold
-        )
+        # Attempt to repost - go straight to the post when we know its activity,
+        # otherwise search the author's feed by fuzzy content match
+        if post.activity_urn:
+            from app.linkedin_ids import activity_url
+            success = await linkedin.repost_by_url(
+                post_url=activity_url(post.activity_urn),
+                variant_text=post.approved_variant_text
+            )
+        else:
+            success = await linkedin.repost_with_variant(
+                author_handle=post.author_handle,
+                original_content=post.original_content,
+                variant_text=post.approved_variant_text,
+                fuzzy_threshold=fuzzy_threshold
+            )
         
         if success:
             # Update post status to POSTED
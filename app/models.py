@@ -1,7 +1,7 @@
 """SQLAlchemy database models for LinkedIn Reposter."""
 from datetime import datetime
 from typing import Optional
-from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer, Enum as SQLEnum
+from sqlalchemy import String, Text, DateTime, Boolean, ForeignKey, Integer, Float, UniqueConstraint, Enum as SQLEnum
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 import enum
 
@@ -90,15 +90,18 @@ class LinkedInPost(Base):
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     
     # Source information
-    original_post_url: Mapped[str] = mapped_column(String(500), index=True, nullable=True)  # Not unique - using fuzzy match instead
+    original_post_url: Mapped[str] = mapped_column(String(500), index=True, nullable=True)  # Not unique - see activity_urn
+    activity_urn: Mapped[Optional[str]] = mapped_column(String(100), unique=True, index=True, nullable=True)  # urn:li:activity:<id> (app.linkedin_ids)
     author_handle: Mapped[str] = mapped_column(String(100), index=True)
     author_name: Mapped[str] = mapped_column(String(200))
     
     # Post content
     original_content: Mapped[str] = mapped_column(Text)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), index=True, nullable=True)  # SHA-256 of normalized content (app.utils.content_fingerprint)
     
     # Metadata
     scraped_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+    pending_generation: Mapped[bool] = mapped_column(Boolean, default=False)  # Stored by the scrape pipeline, variants not saved yet
     original_post_date: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
     # Status tracking
@@ -326,8 +329,35 @@ class MonitoredHandle(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     last_scraped_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     
+    # Incremental scrape watermark: newest post already processed for this handle
+    last_seen_activity_urn: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    last_seen_post_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
+    
     def __repr__(self) -> str:
         status = "active" if self.is_active else "inactive"
         return f"<MonitoredHandle(handle=@{self.handle}, relationship={self.relationship.value}, {status})>"
 
 
+class ChromeLockStats(Base):
+    """Hourly Chrome lock wait/hold totals per operation type (rolling window)."""
+    __tablename__ = "chrome_lock_stats"
+    __table_args__ = (UniqueConstraint("operation", "window_start"),)
+    
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    
+    # Operation type ("scraping", "posting", ...) and the UTC hour it covers
+    operation: Mapped[str] = mapped_column(String(50), index=True)
+    window_start: Mapped[datetime] = mapped_column(DateTime, index=True)
+    
+    # Counters
+    acquisitions: Mapped[int] = mapped_column(Integer, default=0)
+    timeouts: Mapped[int] = mapped_column(Integer, default=0)
+    
+    # Seconds spent queued for the lock / holding it
+    total_wait_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    max_wait_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    total_hold_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    max_hold_seconds: Mapped[float] = mapped_column(Float, default=0.0)
+    
+    def __repr__(self) -> str:
+        return f"<ChromeLockStats(operation={self.operation}, window_start={self.window_start}, acquisitions={self.acquisitions})>"
@@ -0,0 +1,220 @@
+"""Per-provider token buckets and rate-limit header handling for outbound APIs."""
+import asyncio
+import logging
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+import httpx
+
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
+
+# Bucket capacity, in seconds' worth of the steady rate (allows short bursts)
+BURST_SECONDS = 10
+
+# A 429 whose Retry-After is longer than this is returned to the caller instead of waited out
+MAX_RETRY_WAIT_SECONDS = 30.0
+
+# 429 retries done inside the transport before giving up (clients with retry_429 only)
+MAX_429_RETRIES = 2
+
+# Headers announcing remaining quota and when it resets (OpenAI/Azure and GitHub styles)
+REMAINING_HEADERS = ("x-ratelimit-remaining-requests", "x-ratelimit-remaining")
+RESET_HEADERS = ("x-ratelimit-reset-requests", "x-ratelimit-reset")
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|h|m|s)")
+
+
+def parse_wait_seconds(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a rate-limit wait header into seconds from now.
+    
+    Accepts plain seconds ("30"), epoch timestamps ("1733400000", GitHub
+    x-ratelimit-reset), Go-style durations ("1m30s", "250ms", OpenAI) and
+    HTTP dates (Retry-After).
+    
+    Returns:
+        Seconds to wait (never negative), or None if unparseable
+    """
+    if not value:
+        return None
+    value = value.strip()
+    
+    try:
+        number = float(value)
+        # Large values are absolute epoch seconds rather than a delay
+        return max(0.0, number - time.time()) if number > 1e9 else max(0.0, number)
+    except ValueError:
+        pass
+    
+    parts = _DURATION_PART.findall(value)
+    if parts and "".join(n + u for n, u in parts) == value:
+        scale = {"ms": 0.001, "s": 1, "m": 60, "h": 3600}
+        return sum(float(n) * scale[u] for n, u in parts)
+    
+    try:
+        when = parsedate_to_datetime(value)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+def _first_header(headers: httpx.Headers, names) -> Optional[str]:
+    for name in names:
+        if name in headers:
+            return headers[name]
+    return None
+
+
+class TokenBucket:
+    """
+    Token bucket that also honours server-announced pauses.
+    
+    rate_per_minute=0 disables pre-throttling but still applies pauses from
+    Retry-After / x-ratelimit-* headers.
+    """
+    
+    def __init__(self, name: str, rate_per_minute: float):
+        self.name = name
+        self.rate = rate_per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self.throttled_seconds = 0.0
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+    
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+    
+    async def acquire(self) -> None:
+        """Wait until a request may be sent (waiters are served in order)."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif not self.rate:
+                    return
+                else:
+                    self._refill()
+                    if self.tokens >= 1:
+                        self.tokens -= 1
+                        return
+                    wait = (1 - self.tokens) / self.rate
+                
+                self.throttled_seconds += wait
+                await asyncio.sleep(wait)
+    
+    def pause(self, seconds: float, reason: str) -> None:
+        """Hold all requests for seconds (extends, never shortens, a current pause)."""
+        until = time.monotonic() + seconds
+        if until > self.paused_until:
+            self.paused_until = until
+            logger.warning(f"⏸️  {self.name}: pausing requests for {seconds:.1f}s ({reason})")
+    
+    def update_from_headers(self, status_code: int, headers: httpx.Headers) -> Optional[float]:
+        """
+        Adjust the bucket from a response's rate-limit headers.
+        
+        Returns:
+            The Retry-After delay in seconds, if the response carried one
+        """
+        retry_after = parse_wait_seconds(headers.get("retry-after"))
+        if retry_after is not None and (status_code == 429 or status_code == 503):
+            self.pause(retry_after, f"HTTP {status_code} Retry-After")
+        
+        remaining = _first_header(headers, REMAINING_HEADERS)
+        if remaining is not None:
+            try:
+                remaining_count = float(remaining)
+            except ValueError:
+                remaining_count = None
+            
+            if remaining_count is not None:
+                # Never plan to send more than the server says is left
+                self._refill()
+                self.tokens = min(self.tokens, remaining_count)
+                if remaining_count <= 0:
+                    reset = parse_wait_seconds(_first_header(headers, RESET_HEADERS))
+                    if reset:
+                        self.pause(reset, "quota exhausted")
+        
+        return retry_after
+    
+    def get_status_dict(self) -> dict:
+        return {
+            "rate_per_minute": round(self.rate * 60, 1),
+            "tokens": round(self.tokens, 2),
+            "paused_for_seconds": round(max(0.0, self.paused_until - time.monotonic()), 1),
+            "throttled_seconds_total": round(self.throttled_seconds, 1),
+        }
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport that pre-throttles through a TokenBucket and waits out 429s.
+    
+    A 429 with a short Retry-After is retried here after the pause, so the
+    caller just sees a slower successful response; longer waits are returned
+    as the 429 so callers can fail over or back off.
+    
+    With retry_429=False every 429 is returned (the bucket is still paused).
+    AI clients use this: app.ai_batch retries their 429s and shrinks
+    concurrency, and a second retry layer here would multiply upstream
+    attempts and hide short 429s from the adaptive semaphore.
+    """
+    
+    def __init__(self, bucket: TokenBucket, transport: httpx.AsyncBaseTransport, retry_429: bool = True):
+        self.bucket = bucket
+        self.retry_429 = retry_429
+        self._transport = transport
+    
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        for attempt in range(MAX_429_RETRIES + 1):
+            await self.bucket.acquire()
+            response = await self._transport.handle_async_request(request)
+            retry_after = self.bucket.update_from_headers(response.status_code, response.headers)
+            
+            if response.status_code != 429 or not self.retry_429 or attempt == MAX_429_RETRIES:
+                return response
+            if retry_after is None or retry_after > MAX_RETRY_WAIT_SECONDS:
+                return response
+            
+            # The bucket is paused until Retry-After; the next acquire() waits it out
+            await response.aclose()
+            logger.info(f"⏳ {self.bucket.name}: 429, retrying after {retry_after:.1f}s (attempt {attempt + 1})")
+        
+        return response
+    
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+_buckets: Dict[str, TokenBucket] = {}
+
+
+def get_rate_limiter(name: str) -> TokenBucket:
+    """
+    Get the shared bucket for an API (one per pooled client name).
+    
+    Rates come from settings (rate_limit_<name>_per_minute); APIs without a
+    setting only honour server-announced pauses.
+    """
+    bucket = _buckets.get(name)
+    if bucket is None:
+        rate = getattr(get_settings(), f"rate_limit_{name}_per_minute", 0) or 0
+        bucket = TokenBucket(name, rate)
+        _buckets[name] = bucket
+    return bucket
+
+
+def get_rate_limit_status() -> dict:
+    """Status of every bucket created so far."""
+    return {name: bucket.get_status_dict() for name, bucket in _buckets.items()}
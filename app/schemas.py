@@ -56,6 +56,7 @@ class LinkedInPostCreate(LinkedInPostBase):
 class LinkedInPostResponse(LinkedInPostBase):
     """Schema for LinkedIn post response."""
     id: int
+    activity_urn: Optional[str] = None
     scraped_at: datetime
     original_post_date: Optional[datetime] = None
     status: str
@@ -261,6 +262,7 @@ class MonitoredHandleResponse(MonitoredHandleBase):
     is_active: bool
     created_at: datetime
     last_scraped_at: Optional[datetime] = None
+    last_seen_post_at: Optional[datetime] = None
     
     class Config:
         from_attributes = True
@@ -0,0 +1,683 @@
+"""Staged scrape → generate → notify pipeline for scheduled scrapes."""
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from app.config import get_settings
+from app.database import get_session
+from app.models import (
+    LinkedInPost,
+    PostVariant,
+    ApprovalRequest,
+    PostStatus,
+    VariantStatus,
+    MonitoredHandle,
+)
+from app.linkedin_ids import parse_activity_id, activity_timestamp
+from app.logging_config import (
+    log_operation_start,
+    log_operation_success,
+    log_operation_error,
+)
+
+logger = logging.getLogger(__name__)
+
+# Queue sentinel telling a stage there is no more work
+_DONE = None
+
+# Start offset between parallel scraping tabs (tab N waits N to N+1 times this before its first profile)
+TAB_STAGGER_SECONDS = 20.0
+
+# Posts queued for generation by a pipeline run that is still running
+_in_flight_post_ids: Set[int] = set()
+
+
+@dataclass
+class PipelinePost:
+    """A newly stored post travelling from the scrape stage to generation and email."""
+    post_id: int
+    handle: str
+    author_name: str
+    content: str
+    activity_urn: Optional[str]
+    relationship: Optional[str] = None
+    custom_context: Optional[str] = None
+    approval_token: Optional[str] = None
+
+
+@dataclass
+class PipelineStats:
+    """Counters reported when the pipeline finishes."""
+    scraped: int = 0
+    processed: int = 0
+    failed: int = 0
+    # Per handle: every scraped post, and URNs that didn't make it through all stages
+    scraped_posts: Dict[int, list] = field(default_factory=dict)
+    failed_urns: Set[Optional[str]] = field(default_factory=set)
+    # Posts this run queued for generation (released from _in_flight_post_ids when it ends)
+    queued_post_ids: Set[int] = field(default_factory=set)
+
+
+async def known_activity_urns(db: AsyncSession, handle: str) -> set:
+    """Activity URNs already stored for a handle (lets the scraper stop scrolling early)."""
+    result = await db.execute(
+        select(LinkedInPost.activity_urn).where(
+            LinkedInPost.author_handle == handle,
+            LinkedInPost.activity_urn.isnot(None)
+        )
+    )
+    return set(result.scalars().all())
+
+
+def advance_scrape_watermark(monitored_handle: MonitoredHandle, posts: list, failed_urns: set) -> None:
+    """
+    Move a handle's scrape watermark up to the newest processed post.
+    
+    Walks scraped posts oldest-first and stops at the first one that failed to
+    process, so a post whose variant generation failed is retried next run.
+    """
+    current_id = parse_activity_id(monitored_handle.last_seen_activity_urn) or 0
+    newer = sorted(
+        (parse_activity_id(p.activity_urn), p.activity_urn)
+        for p in posts
+        if (parse_activity_id(p.activity_urn) or 0) > current_id
+    )
+    
+    for _, urn in newer:
+        if urn in failed_urns:
+            break
+        monitored_handle.last_seen_activity_urn = urn
+        monitored_handle.last_seen_post_at = activity_timestamp(urn)
+
+
+async def _is_duplicate(db: AsyncSession, dedup_index, handle: str, post_data, content_hash: Optional[str]) -> bool:
+    """Check URN, exact content hash, then LSH candidates + fuzzy match."""
+    from app.utils import fuzzy_match
+    
+    # Fastest path: same LinkedIn activity (unique activity_urn index)
+    if post_data.activity_urn:
+        urn_match = await db.execute(
+            select(LinkedInPost.id).where(LinkedInPost.activity_urn == post_data.activity_urn)
+        )
+        if urn_match.scalar_one_or_none() is not None:
+            logger.info(f"⏭️  Skipping duplicate post from @{handle} ({post_data.activity_urn})")
+            return True
+    
+    # Fast path: byte-identical re-scrapes hit the content_hash index.
+    # Posts with no hashable text have no fingerprint and skip straight to LSH.
+    if content_hash is not None:
+        exact_match = await db.execute(
+            select(LinkedInPost.id).where(
+                LinkedInPost.content_hash == content_hash,
+                LinkedInPost.author_handle == handle
+            ).limit(1)
+        )
+        if exact_match.scalar_one_or_none() is not None:
+            logger.info(f"⏭️  Skipping duplicate post from @{handle} (exact content match)")
+            return True
+    
+    # Only fuzzy-match against LSH candidates, not the author's full history
+    candidate_ids = dedup_index.query(handle, post_data.content)
+    if not candidate_ids:
+        return False
+    
+    existing_posts = await db.execute(
+        select(LinkedInPost).where(
+            LinkedInPost.id.in_(candidate_ids),
+            LinkedInPost.author_handle == handle
+        )
+    )
+    for existing_post in existing_posts.scalars().all():
+        if fuzzy_match(existing_post.original_content, post_data.content, threshold=0.90):
+            logger.info(f"⏭️  Skipping duplicate post from @{handle}")
+            return True
+    
+    return False
+
+
+async def _discard_post(item: PipelinePost, stats: PipelineStats) -> None:
+    """
+    Delete a post that failed generation or notification.
+    
+    Matches the old all-or-nothing transaction: the post, its variants and
+    approval request disappear, so the next scrape picks it up again.
+    """
+    from app.dedup_index import get_dedup_index
+    
+    stats.failed += 1
+    stats.failed_urns.add(item.activity_urn)
+    
+    try:
+        async with await get_session() as db:
+            result = await db.execute(
+                select(LinkedInPost)
+                .options(selectinload(LinkedInPost.variants), selectinload(LinkedInPost.approval_request))
+                .where(LinkedInPost.id == item.post_id)
+            )
+            post = result.scalar_one_or_none()
+            if post:
+                await db.delete(post)
+                await db.commit()
+        get_dedup_index().remove(item.post_id)
+    except Exception as e:
+        logger.error(f"❌ Failed to discard post {item.post_id}: {e}")
+
+
+async def _scrape_handle(
+    db: AsyncSession,
+    linkedin,
+    monitored_handle: MonitoredHandle,
+    dedup_index,
+    generate_queue: asyncio.Queue,
+    stats: PipelineStats
+) -> None:
+    """Scrape one handle on a browser tab, store its new posts and queue them for generation."""
+    from app.health_monitor import update_last_successful_scrape
+    from app.utils import content_fingerprint
+    
+    settings = get_settings()
+    handle = monitored_handle.handle
+    display_name = monitored_handle.display_name or "Unknown"
+    relationship = monitored_handle.relationship
+    
+    logger.info(f"📥 Scraping @{handle} ({display_name}, {relationship.value})...")
+    
+    try:
+        # Scrape posts from this handle
+        posts = await linkedin.scrape_user_posts(
+            handle=handle,
+            max_posts=settings.scraping_max_posts_per_handle,
+            days_back=settings.scraping_lookback_days,
+            author_name=display_name,  # Use display name from database
+            known_urns=await known_activity_urns(db, handle),
+            since_urn=monitored_handle.last_seen_activity_urn
+        )
+        
+        logger.info(f"✅ Scraped {len(posts)} posts from @{handle}")
+        stats.scraped += len(posts)
+        stats.scraped_posts[monitored_handle.id] = posts
+        
+        # Update last_scraped_at timestamp
+        tracked_handle = await db.get(MonitoredHandle, monitored_handle.id)
+        tracked_handle.last_scraped_at = datetime.utcnow()
+        await db.commit()
+        
+        # Update health monitoring
+        await update_last_successful_scrape(db)
+        
+        # Store new posts and hand them to the generation workers
+        for post_data in posts:
+            try:
+                content_hash = content_fingerprint(post_data.content)
+                if await _is_duplicate(db, dedup_index, handle, post_data, content_hash):
+                    continue
+                
+                # Create new post in database
+                new_post = LinkedInPost(
+                    original_post_url=post_data.url,
+                    activity_urn=post_data.activity_urn,
+                    author_handle=handle,
+                    author_name=post_data.author_name,
+                    original_content=post_data.content,
+                    content_hash=content_hash,
+                    original_post_date=post_data.post_date,
+                    status=PostStatus.SCRAPED,
+                    pending_generation=True,
+                    scraped_at=datetime.utcnow()
+                )
+                db.add(new_post)
+                await db.commit()
+                dedup_index.add(new_post.id, handle, post_data.content)
+                
+                logger.info(f"💾 Saved post {new_post.id} from @{handle}")
+                
+                # Blocks when generation falls behind (bounded queue)
+                _in_flight_post_ids.add(new_post.id)
+                stats.queued_post_ids.add(new_post.id)
+                await generate_queue.put(PipelinePost(
+                    post_id=new_post.id,
+                    handle=handle,
+                    author_name=post_data.author_name,
+                    content=post_data.content,
+                    activity_urn=post_data.activity_urn,
+                    relationship=relationship.value,
+                    custom_context=monitored_handle.custom_context
+                ))
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to store post from @{handle}: {e}")
+                await db.rollback()
+                stats.failed += 1
+                stats.failed_urns.add(post_data.activity_urn)
+                continue
+                
+    except Exception as e:
+        logger.error(f"❌ Failed to scrape @{handle}: {e}")
+        stats.failed += 1
+
+
+async def _scrape_worker(
+    tab_index: int,
+    linkedin,
+    handle_queue: asyncio.Queue,
+    total_handles: int,
+    hold,
+    restart_browser: Callable[[], Awaitable[None]],
+    dedup_index,
+    generate_queue: asyncio.Queue,
+    stats: PipelineStats
+) -> None:
+    """
+    Scrape handles from the shared queue on one browser tab until it is empty.
+    
+    Pacing is per tab: each tab waits a human-like delay between its own
+    profiles, and tabs after the first start staggered so they don't hit
+    LinkedIn in lockstep. Between profiles is also where an over-ceiling
+    browser gets restarted.
+    """
+    from app.browser_watchdog import get_browser_watchdog
+    from app.humanize import random_delay, random_profile_delay
+    
+    watchdog = get_browser_watchdog()
+    
+    first = True
+    async with await get_session() as db:
+        while True:
+            try:
+                position, monitored_handle = handle_queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            
+            # Idle time stays outside hold.busy(), so the lock can be handed over meanwhile
+            if not first:
+                await random_profile_delay()
+            elif tab_index:
+                await random_delay(TAB_STAGGER_SECONDS * tab_index, TAB_STAGGER_SECONDS * (tab_index + 1))
+            first = False
+            
+            # Safe point: once exclusive() is entered no tab is mid-page
+            if watchdog.over_limit():
+                async with hold.exclusive():
+                    # Another tab may have restarted it while we waited
+                    if watchdog.over_limit():
+                        watchdog.record_recycle("scheduled scrape")
+                        try:
+                            await restart_browser()
+                        except Exception as e:
+                            logger.error(f"❌ Browser restart failed: {e}")
+            
+            async with hold.busy():
+                hold.lock.update_progress(f"Scraping @{monitored_handle.handle} ({position}/{total_handles})")
+                await _scrape_handle(db, linkedin, monitored_handle, dedup_index, generate_queue, stats)
+
+
+async def _scrape_stage(
+    monitored_handles: List[MonitoredHandle],
+    generate_queue: asyncio.Queue,
+    stats: PipelineStats,
+    num_generate_workers: int
+) -> None:
+    """
+    Browser-bound stage: scrape each handle, store new posts, queue them for generation.
+    
+    Handles are spread over up to scraping_max_concurrent_tabs isolated
+    contexts on one browser. Holds the Chrome lock only for as long as the
+    browser is in use, and hands it to higher-priority work (publishing)
+    whenever every tab is between profiles.
+    """
+    from app.chrome_lock import get_chrome_lock, LockPriority, SharedHold
+    from app.linkedin import get_linkedin_service
+    from app.dedup_index import get_dedup_index, sync_index_with_db
+    
+    settings = get_settings()
+    chrome_lock = get_chrome_lock()
+    lock_acquired = False
+    
+    try:
+        await chrome_lock.acquire(
+            operation="scraping",
+            locked_by="scheduled_scrape_and_process",
+            priority=LockPriority.SCRAPE
+        )
+        lock_acquired = True
+        
+        # Near-duplicate index narrows dedup to a handful of candidates
+        dedup_index = get_dedup_index()
+        async with await get_session() as db:
+            await sync_index_with_db(db, dedup_index)
+        
+        # Get services (using Playwright for better stability)
+        linkedin = get_linkedin_service()
+        
+        # Start browser once for all handles
+        await linkedin.start()
+        
+        try:
+            handle_queue: asyncio.Queue = asyncio.Queue()
+            for position, monitored_handle in enumerate(monitored_handles, 1):
+                handle_queue.put_nowait((position, monitored_handle))
+            
+            num_tabs = max(1, min(settings.scraping_max_concurrent_tabs, len(monitored_handles)))
+            tabs = [linkedin]
+            try:
+                for _ in range(num_tabs - 1):
+                    tabs.append(await linkedin.open_tab())
+            except Exception as e:
+                logger.warning(f"⚠️  Could not open more scraping tabs ({e}), continuing with {len(tabs)}")
+            
+            if len(tabs) > 1:
+                logger.info(f"🗂️  Scraping {len(monitored_handles)} handles across {len(tabs)} tabs")
+            
+            async def restart_browser():
+                # Tab contexts live on the old browser - move them to the new one
+                for tab in tabs[1:]:
+                    await tab.close_context()
+                await linkedin.restart_browser()
+                for tab in tabs[1:]:
+                    await tab.attach_to(linkedin)
+            
+            hold = SharedHold(chrome_lock)
+            try:
+                await hold.run(asyncio.gather(*(
+                    _scrape_worker(
+                        i, tab, handle_queue, len(monitored_handles), hold, restart_browser,
+                        dedup_index, generate_queue, stats
+                    )
+                    for i, tab in enumerate(tabs)
+                )))
+            finally:
+                for tab in tabs[1:]:
+                    await tab.stop()
+                
+        finally:
+            # Stop browser after all handles
+            await linkedin.stop()
+            
+    finally:
+        # Browser work is done - generation and email continue without the lock.
+        # Workers get their sentinels even when the lock was never acquired.
+        if lock_acquired:
+            chrome_lock.release()
+        for _ in range(num_generate_workers):
+            await generate_queue.put(_DONE)
+
+
+async def _requeue_orphaned_posts(generate_queue: asyncio.Queue, stats: PipelineStats) -> None:
+    """
+    Queue posts the pipeline stored but never generated, e.g. after a crash mid-run.
+    
+    Posts are committed before generation, and dedup matches them on every
+    later scrape, so without this they would never reach approval. Only
+    posts flagged pending_generation by _scrape_handle within the scrape
+    lookback window qualify - posts stored by /linkedin/scrape and older
+    history are left alone.
+    """
+    settings = get_settings()
+    cutoff = datetime.utcnow() - timedelta(days=settings.scraping_lookback_days)
+    
+    async with await get_session() as db:
+        result = await db.execute(
+            select(LinkedInPost).where(
+                LinkedInPost.status == PostStatus.SCRAPED,
+                LinkedInPost.pending_generation.is_(True),
+                LinkedInPost.scraped_at >= cutoff
+            )
+        )
+        orphans = [post for post in result.scalars().all() if post.id not in _in_flight_post_ids]
+        if not orphans:
+            return
+        
+        handles = await db.execute(
+            select(MonitoredHandle).where(
+                MonitoredHandle.handle.in_({post.author_handle for post in orphans})
+            )
+        )
+        monitored_handles = {h.handle: h for h in handles.scalars().all()}
+    
+    logger.info(f"♻️  Re-queueing {len(orphans)} stored posts that never got variants")
+    
+    for post in orphans:
+        monitored_handle = monitored_handles.get(post.author_handle)
+        _in_flight_post_ids.add(post.id)
+        stats.queued_post_ids.add(post.id)
+        await generate_queue.put(PipelinePost(
+            post_id=post.id,
+            handle=post.author_handle,
+            author_name=post.author_name,
+            content=post.original_content,
+            activity_urn=post.activity_urn,
+            relationship=monitored_handle.relationship.value if monitored_handle else None,
+            custom_context=monitored_handle.custom_context if monitored_handle else None
+        ))
+
+
+async def _store_variants(item: PipelinePost, variant_texts: List[str]) -> None:
+    """Save a post's variants and create its approval request."""
+    from app.ai import variant_model
+    from app.email import generate_approval_token
+    
+    async with await get_session() as db:
+        post = await db.get(LinkedInPost, item.post_id)
+        
+        # Save variants to database
+        for i, variant_text in enumerate(variant_texts, 1):
+            db.add(PostVariant(
+                original_post_id=post.id,
+                variant_number=i,
+                variant_content=variant_text,
+                ai_model=variant_model(variant_text),
+                status=VariantStatus.PENDING
+            ))
+        
+        # Update post status
+        post.status = PostStatus.VARIANTS_GENERATED
+        post.pending_generation = False
+        post.variants_generated_at = datetime.utcnow()
+        
+        # Create approval request
+        item.approval_token = generate_approval_token()
+        db.add(ApprovalRequest(
+            original_post_id=post.id,
+            approval_token=item.approval_token,
+            expires_at=datetime.utcnow() + timedelta(days=7)
+        ))
+        await db.commit()
+
+
+async def _generate_worker(
+    worker_id: int,
+    generate_queue: asyncio.Queue,
+    notify_queue: asyncio.Queue,
+    stats: PipelineStats
+) -> None:
+    """
+    AI stage: generate variants and the approval request for queued posts.
+    
+    When generation falls behind, posts already waiting in the queue are
+    taken together (up to ai_batch_size) and packed into one AI request.
+    """
+    from app.ai import get_ai_service
+    from app.ai_batch import GenerationRequest, generate_variants_batch
+    
+    settings = get_settings()
+    ai_service = get_ai_service()
+    batch_size = max(1, settings.ai_batch_size)
+    finished = False
+    
+    while not finished:
+        batch = [await generate_queue.get()]
+        while len(batch) < batch_size and not generate_queue.empty():
+            batch.append(generate_queue.get_nowait())
+        
+        # Each worker gets one sentinel - hand back any taken from other workers
+        sentinels = sum(1 for item in batch if item is _DONE)
+        if sentinels:
+            finished = True
+            batch = [item for item in batch if item is not _DONE]
+            for _ in range(sentinels - 1):
+                await generate_queue.put(_DONE)
+        
+        if not batch:
+            continue
+        
+        logger.info(f"🤖 [worker {worker_id}] Generating AI variants for posts {[item.post_id for item in batch]}...")
+        try:
+            results = await generate_variants_batch(ai_service, [
+                GenerationRequest(
+                    original_content=item.content,
+                    author_name=item.author_name,
+                    num_variants=3,
+                    relationship=item.relationship,
+                    custom_context=item.custom_context
+                )
+                for item in batch
+            ])
+        except Exception as e:
+            # Fail just this batch - the worker keeps draining the queue
+            results = [e] * len(batch)
+        
+        for item, variant_texts in zip(batch, results):
+            try:
+                if isinstance(variant_texts, Exception):
+                    raise variant_texts
+                
+                await _store_variants(item, variant_texts)
+                
+                logger.info(f"✅ Generated {len(variant_texts)} variants for post {item.post_id}")
+                await notify_queue.put(item)
+                
+            except Exception as e:
+                logger.error(f"❌ Failed to generate variants for post {item.post_id} from @{item.handle}: {e}")
+                await _discard_post(item, stats)
+            finally:
+                _in_flight_post_ids.discard(item.post_id)
+
+
+async def _notify_stage(notify_queue: asyncio.Queue, stats: PipelineStats) -> None:
+    """Email stage: send the approval email for each post with variants."""
+    from app.email import get_email_service
+    
+    email_service = get_email_service()
+    
+    while True:
+        item = await notify_queue.get()
+        if item is _DONE:
+            return
+        
+        try:
+            async with await get_session() as db:
+                result = await db.execute(
+                    select(LinkedInPost)
+                    .options(selectinload(LinkedInPost.variants))
+                    .where(LinkedInPost.id == item.post_id)
+                )
+                post = result.scalar_one()
+                variants = sorted(post.variants, key=lambda v: v.variant_number)
+                
+                # Send approval email
+                logger.info(f"📧 Sending approval email for post {post.id}...")
+                await email_service.send_approval_email(
+                    post=post,
+                    variants=variants,
+                    approval_token=item.approval_token
+                )
+                
+                # Update post status
+                post.status = PostStatus.AWAITING_APPROVAL
+                post.approval_email_sent_at = datetime.utcnow()
+                await db.commit()
+            
+            logger.info(f"✅ Sent approval email for post {item.post_id}")
+            stats.processed += 1
+            
+        except Exception as e:
+            logger.error(f"❌ Failed to send approval email for post {item.post_id}: {e}")
+            await _discard_post(item, stats)
+
+
+async def run_scrape_pipeline(monitored_handles: List[MonitoredHandle]) -> PipelineStats:
+    """
+    Scrape handles and process new posts as a three-stage pipeline.
+    
+    1. Scrape (single task, holds the Chrome lock) - stores new posts and
+       pushes them onto a bounded queue
+    2. Generate (worker pool) - AI variants + approval request per post
+    3. Notify (single task) - approval email per post
+    
+    Stages overlap, so the first approval email goes out while later handles
+    are still being scraped, and a slow AI or mail API applies backpressure
+    through the bounded queues instead of stalling the browser.
+    
+    Args:
+        monitored_handles: Handles to scrape
+    
+    Returns:
+        PipelineStats with scraped/processed/failed counts
+    """
+    settings = get_settings()
+    num_workers = max(1, settings.pipeline_generation_workers)
+    stats = PipelineStats()
+    
+    log_operation_start(
+        logger,
+        "run_scrape_pipeline",
+        handles=len(monitored_handles),
+        generation_workers=num_workers
+    )
+    
+    generate_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+    notify_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.pipeline_queue_size)
+    
+    workers = [
+        asyncio.create_task(_generate_worker(i + 1, generate_queue, notify_queue, stats))
+        for i in range(num_workers)
+    ]
+    notifier = asyncio.create_task(_notify_stage(notify_queue, stats))
+    
+    try:
+        # Pick up posts a previous run stored but never generated
+        try:
+            await _requeue_orphaned_posts(generate_queue, stats)
+        except Exception as e:
+            logger.error(f"❌ Failed to re-queue posts without variants: {e}")
+        
+        await _scrape_stage(monitored_handles, generate_queue, stats, num_workers)
+        await asyncio.gather(*workers)
+        await notify_queue.put(_DONE)
+        await notifier
+        
+        # Next run only looks at posts newer than what made it through every stage
+        async with await get_session() as db:
+            for handle_id, posts in stats.scraped_posts.items():
+                monitored_handle = await db.get(MonitoredHandle, handle_id)
+                if monitored_handle:
+                    advance_scrape_watermark(monitored_handle, posts, stats.failed_urns)
+            await db.commit()
+        
+        log_operation_success(
+            logger,
+            "run_scrape_pipeline",
+            scraped=stats.scraped,
+            processed=stats.processed,
+            failed=stats.failed
+        )
+        
+    except Exception as e:
+        log_operation_error(logger, "run_scrape_pipeline", e)
+        raise
+    finally:
+        # Don't leave stage tasks waiting on a queue that will never be fed
+        for task in [*workers, notifier]:
+            if not task.done():
+                task.cancel()
+        
+        # Posts this run didn't finish become eligible for the next run's re-queue
+        _in_flight_post_ids.difference_update(stats.queued_post_ids)
+    
+    return stats
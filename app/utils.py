@@ -1,6 +1,9 @@
 """Utility functions for LinkedIn Reposter."""
+import hashlib
 import random
+import re
 import time
+import unicodedata
 from difflib import SequenceMatcher
 from typing import Optional
 import logging
@@ -53,14 +56,65 @@ def fuzzy_match_score(text1: str, text2: str) -> float:
     return SequenceMatcher(None, normalized1, normalized2).ratio()
 
 
+def normalize_content(text: str) -> str:
+    """
+    Normalize post content for exact-match deduplication.
+    
+    Lowercases, strips hashtags and emoji, and collapses whitespace so
+    re-scrapes of the same post normalize to the same string.
+    
+    Args:
+        text: Post content
+        
+    Returns:
+        Normalized content
+    """
+    text = text.lower()
+    
+    # Drop hashtags entirely (LinkedIn sometimes renders them as "hashtag#Tag" links)
+    text = re.sub(r'(?:hashtag\s*)?#\w+', ' ', text)
+    
+    # Drop emoji/pictographs, variation selectors and zero-width joiners
+    text = ''.join(
+        ch for ch in text
+        if unicodedata.category(ch) not in ('So', 'Sk', 'Cf', 'Cs')
+        and ch not in ('\ufe0e', '\ufe0f')
+    )
+    
+    return re.sub(r'\s+', ' ', text).strip()
+
+
+def content_fingerprint(text: str) -> Optional[str]:
+    """
+    Calculate a SHA-256 fingerprint of normalized post content.
+    
+    Posts that normalize to nothing (hashtag-only, emoji-only) get no
+    fingerprint, otherwise they would all collide on the hash of "".
+    
+    Args:
+        text: Post content
+        
+    Returns:
+        64-character hex digest, or None when there is no content to hash
+    """
+    normalized = normalize_content(text or "")
+    if not normalized:
+        return None
+    return hashlib.sha256(normalized.encode('utf-8')).hexdigest()
+
+
 # ============================================================================
 # HUMANIZATION - Random delays and timing
 # ============================================================================
+# These block the calling thread and must only run in executor threads
+# (e.g. the Selenium driver thread). Async code uses app.humanize.
 
 def random_delay(min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
     """
     Sleep for a random amount of time to simulate human behavior.
     
+    Blocks the calling thread - executor threads only.
+    
     Args:
         min_seconds: Minimum delay in seconds
         max_seconds: Maximum delay in seconds
@@ -0,0 +1,30 @@
+"""Shared pytest fixtures."""
+import asyncio
+import time
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def forbid_blocking_sleep_on_event_loop(monkeypatch):
+    """
+    Fail any time.sleep made on a thread that is running an event loop.
+    
+    The sync humanization helpers in app.utils are for executor threads only;
+    async code has to use app.humanize. This catches regressions in tests
+    without adding a check to every production sleep.
+    """
+    real_sleep = time.sleep
+    
+    def guarded_sleep(seconds):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return real_sleep(seconds)  # No loop in this thread - blocking is fine
+        
+        raise AssertionError(
+            f"time.sleep({seconds}) would block the event loop; await app.humanize "
+            f"or run it in an executor thread"
+        )
+    
+    monkeypatch.setattr(time, "sleep", guarded_sleep)
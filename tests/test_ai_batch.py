@@ -0,0 +1,91 @@
+"""Tests for the adaptive AI semaphore and packed batch generation."""
+import asyncio
+from types import SimpleNamespace
+
+from app import ai_batch
+from app.ai_batch import SUCCESSES_PER_INCREASE, AdaptiveSemaphore, GenerationRequest
+
+
+def test_semaphore_halves_on_rate_limit_and_respects_min():
+    async def scenario():
+        semaphore = AdaptiveSemaphore(initial_limit=8, min_limit=2, max_limit=8)
+        for expected in (4, 2, 2):
+            await semaphore.record_rate_limited()
+            assert semaphore.limit == expected
+    
+    asyncio.run(scenario())
+
+
+def test_semaphore_grows_after_a_success_streak_up_to_max():
+    async def scenario():
+        semaphore = AdaptiveSemaphore(initial_limit=1, max_limit=2)
+        for _ in range(SUCCESSES_PER_INCREASE - 1):
+            await semaphore.record_success()
+        assert semaphore.limit == 1
+        
+        await semaphore.record_success()
+        assert semaphore.limit == 2
+        
+        for _ in range(SUCCESSES_PER_INCREASE * 2):
+            await semaphore.record_success()
+        assert semaphore.limit == 2
+    
+    asyncio.run(scenario())
+
+
+def test_semaphore_rate_limit_resets_the_success_streak():
+    async def scenario():
+        semaphore = AdaptiveSemaphore(initial_limit=2, max_limit=4)
+        for _ in range(SUCCESSES_PER_INCREASE - 1):
+            await semaphore.record_success()
+        await semaphore.record_rate_limited()
+        await semaphore.record_success()
+        assert semaphore.limit == 1
+    
+    asyncio.run(scenario())
+
+
+def test_semaphore_never_exceeds_its_limit():
+    async def scenario():
+        semaphore = AdaptiveSemaphore(initial_limit=2)
+        peak = 0
+        
+        async def work():
+            nonlocal peak
+            async with semaphore:
+                peak = max(peak, semaphore.active)
+                await asyncio.sleep(0.01)
+        
+        await asyncio.gather(*(work() for _ in range(6)))
+        assert peak == 2
+        assert semaphore.active == 0
+    
+    asyncio.run(scenario())
+
+
+class _FakeService:
+    """Packed call answers only the first post; single calls always succeed."""
+    
+    def __init__(self):
+        self.single_calls = []
+    
+    async def generate_variants_multi(self, requests):
+        return [["a1", "a2"]] + [None] * (len(requests) - 1)
+    
+    async def generate_variants(self, original_content, **kwargs):
+        self.single_calls.append(original_content)
+        return [f"{original_content}-{i}" for i in range(kwargs["num_variants"])]
+
+
+def test_batch_regenerates_posts_the_packed_answer_missed(monkeypatch):
+    settings = SimpleNamespace(ai_batch_size=3, ai_rate_limit_retries=0)
+    monkeypatch.setattr(ai_batch, "get_settings", lambda: settings)
+    monkeypatch.setattr(ai_batch, "get_ai_semaphore", lambda: AdaptiveSemaphore(initial_limit=4))
+    
+    service = _FakeService()
+    requests = [GenerationRequest(original_content=name, author_name="A", num_variants=2) for name in "xyz"]
+    
+    results = asyncio.run(ai_batch.generate_variants_batch(service, requests))
+    
+    assert results == [["a1", "a2"], ["y-0", "y-1"], ["z-0", "z-1"]]
+    assert service.single_calls == ["y", "z"]
@@ -0,0 +1,65 @@
+"""Tests for streamed and packed variant parsing in app.ai."""
+import json
+
+import pytest
+
+from app.ai import AIService, VariantStreamParser, parse_batch_variants, parse_stream_line
+
+
+def _sse(content):
+    return "data: " + json.dumps({"choices": [{"delta": {"content": content}}]})
+
+
+def test_parse_stream_line_extracts_content_deltas():
+    assert parse_stream_line(_sse("Hello")) == "Hello"
+    assert parse_stream_line("data: [DONE]") is None
+    assert parse_stream_line(": keep-alive") is None
+    assert parse_stream_line("") is None
+    assert parse_stream_line('data: {"choices": []}') is None
+    assert parse_stream_line('data: {"choices": [{"delta": {"role": "assistant"}}]}') is None
+
+
+def test_stream_parser_splits_on_markers_across_chunks():
+    parser = VariantStreamParser()
+    chunks = ["First variant\n---VAR", "IANT---\nSecond ", "variant\n---VARIANT---\nThird"]
+    
+    completed = [variant for chunk in chunks for variant in parser.feed(chunk)]
+    
+    assert [v.strip() for v in completed] == ["First variant", "Second variant"]
+    assert parser.finish().strip() == "Third"
+    assert parser.finish() == ""
+
+
+def test_parse_variants_drops_labels_and_empty_parts():
+    service = AIService.__new__(AIService)
+    content = "Variant 1:\nFirst text\n---VARIANT---\n\n---VARIANT---\nOption 2: ignored label\nSecond text"
+    
+    assert service._parse_variants(content, 3) == ["First text", "Second text"]
+    assert service._parse_variants(content, 1) == ["First text"]
+
+
+def test_parse_batch_variants_fans_out_by_task_number():
+    content = json.dumps({"posts": [
+        {"task": 2, "variants": ["b1", "b2"]},
+        {"task": 1, "variants": ["a1", " ", "a2", "a3", "a4"]},
+    ]})
+    
+    assert parse_batch_variants(content, [3, 2, 1]) == [["a1", "a2", "a3"], ["b1", "b2"], None]
+
+
+def test_parse_batch_variants_falls_back_to_position_and_strips_fences():
+    content = "```json\n" + json.dumps({"posts": [
+        {"variants": ["a1"]},
+        {"task": "two", "variants": ["b1"]},
+        {"task": 9, "variants": ["ignored"]},
+        "not an entry",
+    ]}) + "\n```"
+    
+    assert parse_batch_variants(content, [1, 1]) == [["a1"], ["b1"]]
+
+
+def test_parse_batch_variants_rejects_non_json():
+    with pytest.raises(ValueError):
+        parse_batch_variants("Here are your variants: ...", [3])
+    with pytest.raises(ValueError):
+        parse_batch_variants(json.dumps({"variants": []}), [3])
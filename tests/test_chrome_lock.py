@@ -0,0 +1,114 @@
+"""Tests for Chrome lock queueing, hand-over and yielding."""
+import asyncio
+
+import pytest
+
+from app.chrome_lock import ChromeLockManager, ChromeLockTimeout, LockPriority, SharedHold
+
+
+def test_waiters_are_served_by_priority_then_fifo():
+    async def scenario():
+        lock = ChromeLockManager()
+        order = []
+        await lock.acquire("holding", "holder")
+        
+        async def waiter(name, priority):
+            await lock.acquire(name, name, priority=priority)
+            order.append(name)
+            lock.release()
+        
+        tasks = []
+        for name, priority in [("scrape", LockPriority.SCRAPE), ("manual-1", LockPriority.MANUAL),
+                               ("publish", LockPriority.PUBLISH), ("manual-2", LockPriority.MANUAL)]:
+            tasks.append(asyncio.create_task(waiter(name, priority)))
+            await asyncio.sleep(0)
+        assert lock.waiters_count == 4
+        
+        lock.release()
+        await asyncio.gather(*tasks)
+        assert order == ["publish", "manual-1", "manual-2", "scrape"]
+        assert not lock.status.is_locked
+    
+    asyncio.run(scenario())
+
+
+def test_release_hands_the_lock_straight_to_the_next_waiter():
+    async def scenario():
+        lock = ChromeLockManager()
+        await lock.acquire("holding", "holder")
+        waiter = asyncio.create_task(lock.acquire("posting", "publisher", priority=LockPriority.PUBLISH))
+        await asyncio.sleep(0)
+        
+        lock.release()
+        # Already granted before the waiter runs, so no one can barge in
+        assert lock.status.locked_by == "publisher"
+        assert lock.waiters_count == 0
+        await waiter
+    
+    asyncio.run(scenario())
+
+
+def test_release_from_another_task_is_ignored():
+    async def release(lock):
+        lock.release()
+    
+    async def scenario():
+        lock = ChromeLockManager()
+        await lock.acquire("holding", "holder")
+        await asyncio.create_task(release(lock))
+        assert lock.status.locked_by == "holder"
+    
+    asyncio.run(scenario())
+
+
+def test_waiter_gives_up_after_its_deadline():
+    async def scenario():
+        lock = ChromeLockManager()
+        await lock.acquire("holding", "holder")
+        
+        with pytest.raises(ChromeLockTimeout):
+            await lock.acquire("posting", "publisher", priority=LockPriority.PUBLISH, timeout=0.01)
+        
+        assert lock.waiters_count == 0
+        assert not lock.should_yield()
+        assert lock.status.locked_by == "holder"
+    
+    asyncio.run(scenario())
+
+
+def test_shared_hold_yields_between_busy_stretches():
+    async def scenario():
+        lock = ChromeLockManager()
+        hold = SharedHold(lock)
+        events = []
+        
+        async def scrape():
+            for i in range(5):
+                async with hold.busy():
+                    events.append(f"busy-start-{i}")
+                    await asyncio.sleep(0.01)
+                    events.append(f"busy-end-{i}")
+                await asyncio.sleep(0.01)
+            return "scraped"
+        
+        async def publish():
+            await asyncio.sleep(0.015)
+            await lock.acquire("posting", "publisher", priority=LockPriority.PUBLISH)
+            events.append("publish")
+            lock.release()
+        
+        await lock.acquire("scraping", "scraper", priority=LockPriority.SCRAPE)
+        publisher = asyncio.create_task(publish())
+        result = await hold.run(scrape())
+        await publisher
+        lock.release()
+        
+        assert result == "scraped"
+        position = events.index("publish")
+        # The publish ran mid-scrape, never inside a busy stretch
+        assert 0 < position < len(events) - 1
+        assert events[position - 1].startswith("busy-end")
+        assert events[position + 1].startswith("busy-start")
+        assert not lock.status.is_locked
+    
+    asyncio.run(scenario())
@@ -0,0 +1,52 @@
+"""Tests for reusing a persisted Copilot bearer token."""
+import asyncio
+import json
+import time
+
+from app.copilot_token import REFRESH_MARGIN_SECONDS, CopilotTokenManager, _fingerprint
+
+
+def _persist(path, expires_in, refresh_token="ghu_test"):
+    path.write_text(json.dumps({
+        "token": "bearer",
+        "expires_at": time.time() + expires_in,
+        "refresh_token_fingerprint": _fingerprint(refresh_token),
+    }))
+
+
+def test_loaded_token_schedules_a_refresh(tmp_path):
+    path = tmp_path / "copilot_token.json"
+    _persist(path, 1200)
+    
+    async def scenario():
+        manager = CopilotTokenManager("ghu_test", "https://api.example.test/token", path)
+        assert manager.token == "bearer"
+        delay = manager._refresh_timer.when() - asyncio.get_running_loop().time()
+        manager._refresh_timer.cancel()
+        return delay
+    
+    assert 1200 - REFRESH_MARGIN_SECONDS - 5 < asyncio.run(scenario()) <= 1200 - REFRESH_MARGIN_SECONDS
+
+
+def test_token_loaded_outside_the_loop_is_scheduled_on_first_use(tmp_path):
+    path = tmp_path / "copilot_token.json"
+    _persist(path, 1200)
+    manager = CopilotTokenManager("ghu_test", "https://api.example.test/token", path)
+    assert manager._refresh_timer is None
+    
+    async def scenario():
+        token = await manager.get_token()
+        scheduled = manager._refresh_timer is not None
+        manager._refresh_timer.cancel()
+        return token, scheduled
+    
+    assert asyncio.run(scenario()) == ("bearer", True)
+
+
+def test_token_from_another_refresh_token_is_ignored(tmp_path):
+    path = tmp_path / "copilot_token.json"
+    _persist(path, 1200, refresh_token="ghu_other")
+    
+    manager = CopilotTokenManager("ghu_test", "https://api.example.test/token", path)
+    assert manager.token is None
+    assert manager._refresh_timer is None
@@ -0,0 +1,37 @@
+"""Tests for the one-off startup backfills."""
+from sqlalchemy import create_engine, text
+
+from app import database
+from app.models import Base
+
+
+def test_backfills_run_once(tmp_path, monkeypatch):
+    calls = []
+    
+    def _backfill_first(sync_conn):
+        calls.append("first")
+    
+    def _backfill_second(sync_conn):
+        calls.append("second")
+    
+    monkeypatch.setattr(database, "BACKFILLS", [_backfill_first, _backfill_second])
+    
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        database._run_backfills(conn)
+        database._run_backfills(conn)
+        completed = [row[0] for row in conn.execute(text("SELECT name FROM schema_backfills ORDER BY name"))]
+    
+    assert calls == ["first", "second"]
+    assert completed == ["backfill_first", "backfill_second"]
+
+
+def test_real_backfills_run_on_an_empty_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    with engine.begin() as conn:
+        Base.metadata.create_all(conn)
+        database._run_backfills(conn)
+        completed = {row[0] for row in conn.execute(text("SELECT name FROM schema_backfills"))}
+    
+    assert completed == {backfill.__name__.lstrip("_") for backfill in database.BACKFILLS}
@@ -0,0 +1,72 @@
+"""Tests for the MinHash/LSH near-duplicate index."""
+from app.dedup_index import BULK_BATCH_SIZE, NearDuplicateIndex
+
+ORIGINAL = (
+    "Three lessons from scaling our on-call rotation: write runbooks before the incident, "
+    "page the owning team directly, and review every alert that fired without action. "
+    "Alert fatigue is a design problem, not a people problem."
+)
+
+UNRELATED = (
+    "Hiring for two senior backend roles in Denver. We work in Go and Postgres, "
+    "ship daily and keep meetings to a minimum. DM me if you're curious."
+)
+
+
+def _index(tmp_path) -> NearDuplicateIndex:
+    return NearDuplicateIndex(path=tmp_path / "index.db")
+
+
+def test_near_duplicate_edits_are_candidates(tmp_path):
+    index = _index(tmp_path)
+    index.add(1, "jane-doe", ORIGINAL)
+    index.add(2, "jane-doe", UNRELATED)
+    
+    truncated = ORIGINAL[:150] + "..."
+    reformatted = ORIGINAL.upper().replace(" ", "\n  ")
+    edited = ORIGINAL.replace("Three lessons", "3 lessons") + " #sre #oncall"
+    
+    for variant in (ORIGINAL, truncated, reformatted, edited):
+        candidates = index.query("jane-doe", variant)
+        assert candidates and candidates[0] == 1, variant
+        assert 2 not in candidates
+
+
+def test_candidates_are_scoped_to_the_author(tmp_path):
+    index = _index(tmp_path)
+    index.add(1, "jane-doe", ORIGINAL)
+    
+    assert index.query("john-smith", ORIGINAL) == []
+
+
+def test_remove_and_replace(tmp_path):
+    index = _index(tmp_path)
+    index.add(1, "jane-doe", ORIGINAL)
+    index.add(1, "jane-doe", UNRELATED)  # Re-adding replaces the old signature and buckets
+    
+    assert index.query("jane-doe", ORIGINAL) == []
+    assert index.query("jane-doe", UNRELATED) == [1]
+    
+    index.remove(1)
+    assert index.count() == 0
+    assert index.query("jane-doe", UNRELATED) == []
+
+
+def test_bulk_add_matches_single_adds(tmp_path):
+    index = _index(tmp_path)
+    # More than one batch, so the last partial batch is written too
+    posts = [(i, "jane-doe", f"Release {i}: fixed the login redirect loop") for i in range(1, BULK_BATCH_SIZE + 21)]
+    
+    assert index.bulk_add(posts) == len(posts)
+    assert index.count() == len(posts)
+    assert index.indexed_post_ids() == {post_id for post_id, _, _ in posts}
+    assert len(posts) in index.query("jane-doe", posts[-1][2], max_candidates=len(posts))
+
+
+def test_similarity_estimate_tracks_overlap(tmp_path):
+    index = _index(tmp_path)
+    original = index.signature(ORIGINAL)
+    
+    assert index.estimate_similarity(original, index.signature(ORIGINAL)) == 1.0
+    assert index.estimate_similarity(original, index.signature(ORIGINAL[:150])) > 0.4
+    assert index.estimate_similarity(original, index.signature(UNRELATED)) < 0.2
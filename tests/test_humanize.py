@@ -0,0 +1,26 @@
+"""Tests for the sync/async humanization delay split."""
+import asyncio
+
+import pytest
+
+from app import humanize, utils
+
+
+def test_sync_delay_on_event_loop_is_caught():
+    async def scrape():
+        utils.random_delay(0, 0)
+    
+    with pytest.raises(AssertionError, match="would block the event loop"):
+        asyncio.run(scrape())
+
+
+def test_sync_delay_in_executor_thread_is_allowed():
+    async def scrape():
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, utils.random_delay, 0, 0)
+    
+    asyncio.run(scrape())
+
+
+def test_async_delay_runs_on_event_loop():
+    asyncio.run(humanize.random_delay(0, 0))
@@ -0,0 +1,58 @@
+"""Tests for app.linkedin_feed against a captured profile activity payload."""
+import json
+from pathlib import Path
+
+from app.linkedin_feed import is_feed_response, parse_feed_payload, profile_slug
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+OWN_POST = "urn:li:activity:7402441752508465152"
+OWN_RESHARE = "urn:li:activity:7401990137724063744"
+RESHARED_ORIGINAL = "urn:li:activity:7401870044130295808"
+OTHER_AUTHOR = "urn:li:activity:7400512389956706304"
+
+
+def _payload():
+    return json.loads((FIXTURES / "voyager_profile_updates.json").read_text())
+
+
+def test_keeps_only_the_scraped_profiles_updates():
+    posts = {post["urn"]: post for post in parse_feed_payload(_payload(), "jane-doe")}
+    
+    assert set(posts) == {OWN_POST, OWN_RESHARE}
+    assert posts[OWN_POST]["author"] == "Jane Doe"
+    assert posts[OWN_POST]["content"].startswith("We shipped the new onboarding flow")
+    assert posts[OWN_POST]["is_reshare"] is False
+
+
+def test_reshare_is_flagged_and_its_original_dropped():
+    posts = {post["urn"]: post for post in parse_feed_payload(_payload(), "jane-doe")}
+    
+    assert posts[OWN_RESHARE]["is_reshare"] is True
+    assert RESHARED_ORIGINAL not in posts
+
+
+def test_other_authors_are_dropped_for_any_handle_form():
+    for handle in ("Jane-Doe", "https://www.linkedin.com/in/jane-doe/recent-activity/all/"):
+        urns = {post["urn"] for post in parse_feed_payload(_payload(), handle)}
+        assert OTHER_AUTHOR not in urns
+        assert OWN_POST in urns
+
+
+def test_company_handle_matches_company_actor():
+    urns = {post["urn"] for post in parse_feed_payload(_payload(), "company/rivera-consulting")}
+    
+    assert urns == {OTHER_AUTHOR}
+
+
+def test_profile_slug_normalizes_handle_forms():
+    assert profile_slug("jane-doe") == "jane-doe"
+    assert profile_slug("company/Acme") == "acme"
+    assert profile_slug("https://www.linkedin.com/in/jane-doe/recent-activity/all/") == "jane-doe"
+    assert profile_slug("") is None
+
+
+def test_is_feed_response_needs_voyager_json():
+    assert is_feed_response("https://www.linkedin.com/voyager/api/graphql?q=x", "application/json")
+    assert not is_feed_response("https://www.linkedin.com/voyager/api/graphql?q=x", "text/html")
+    assert not is_feed_response("https://static.licdn.com/app.js", "application/json")
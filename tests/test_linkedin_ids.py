@@ -0,0 +1,57 @@
+"""Tests for app.linkedin_ids."""
+from datetime import datetime, timedelta
+
+from app.linkedin_ids import activity_timestamp, activity_url, parse_activity_id, to_activity_urn
+
+ACTIVITY_ID = 7402441752508465152
+URN = f"urn:li:activity:{ACTIVITY_ID}"
+
+
+def test_parse_activity_id_accepts_every_stored_form():
+    for value in (
+        URN,
+        f"https://www.linkedin.com/feed/update/{URN}/",
+        f"https://www.linkedin.com/feed/update/urn%3Ali%3Aactivity%3A{ACTIVITY_ID}/",
+        f"https://www.linkedin.com/posts/jane-doe_some-title-activity-{ACTIVITY_ID}-AbCd",
+    ):
+        assert parse_activity_id(value) == ACTIVITY_ID, value
+
+
+def test_parse_activity_id_rejects_non_activity_values():
+    assert parse_activity_id(None) is None
+    assert parse_activity_id("") is None
+    assert parse_activity_id("https://www.linkedin.com/in/jane-doe/") is None
+    assert parse_activity_id(f"urn:li:share:{ACTIVITY_ID}") is None
+    assert parse_activity_id("urn:li:activity:12345") is None
+
+
+def test_to_activity_urn_and_url_are_canonical():
+    url = f"https://www.linkedin.com/posts/jane-doe_title-activity-{ACTIVITY_ID}-AbCd"
+    
+    assert to_activity_urn(url) == URN
+    assert activity_url(url) == f"https://www.linkedin.com/feed/update/{URN}/"
+    assert to_activity_urn("https://www.linkedin.com/in/jane-doe/") is None
+    assert activity_url(None) is None
+
+
+def test_activity_timestamp_decodes_the_snowflake_time():
+    assert activity_timestamp(URN) == datetime(2025, 12, 4, 20, 20, 44, 515000)
+
+
+def test_activity_timestamp_round_trips_a_known_time():
+    posted_at = datetime(2024, 3, 1, 12, 0, 0)
+    millis = int((posted_at - datetime(1970, 1, 1)).total_seconds() * 1000)
+    activity_id = (millis << 22) | 12345  # Low bits are sequence/shard, not time
+    
+    assert activity_timestamp(f"urn:li:activity:{activity_id}") == posted_at
+
+
+def test_activity_timestamp_rejects_implausible_dates():
+    # Decodes to 1970 - before LinkedIn existed
+    assert activity_timestamp("urn:li:activity:123456789012345") is None
+    
+    future = datetime.utcnow() + timedelta(days=30)
+    millis = int((future - datetime(1970, 1, 1)).total_seconds() * 1000)
+    assert activity_timestamp(f"urn:li:activity:{millis << 22}") is None
+    
+    assert activity_timestamp(None) is None
@@ -0,0 +1,136 @@
+"""Tests for 429 handling across the transport and AI batch layers."""
+import asyncio
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app import ai_batch
+from app.ai_batch import AdaptiveSemaphore
+from app.ai_router import AIRouter
+from app.rate_limit import MAX_429_RETRIES, RateLimitedTransport, TokenBucket, parse_wait_seconds
+
+
+def _always_429(attempts: list) -> httpx.MockTransport:
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(429, headers={"retry-after": "0"})
+    return httpx.MockTransport(handler)
+
+
+def test_transport_retries_short_429s():
+    attempts = []
+    transport = RateLimitedTransport(TokenBucket("test", 0), _always_429(attempts))
+    
+    async def call():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return await client.get("https://api.example.test/")
+    
+    response = asyncio.run(call())
+    
+    assert response.status_code == 429
+    assert len(attempts) == MAX_429_RETRIES + 1
+
+
+def test_persistent_ai_429_is_retried_in_one_layer(monkeypatch):
+    settings = SimpleNamespace(ai_rate_limit_retries=3)
+    semaphore = AdaptiveSemaphore(initial_limit=8)
+    monkeypatch.setattr(ai_batch, "get_settings", lambda: settings)
+    monkeypatch.setattr(ai_batch, "get_ai_semaphore", lambda: semaphore)
+    
+    attempts = []
+    transport = RateLimitedTransport(TokenBucket("test", 0), _always_429(attempts), retry_429=False)
+    
+    async def call():
+        async with httpx.AsyncClient(transport=transport) as client:
+            response = await client.post("https://api.example.test/chat/completions")
+            response.raise_for_status()
+    
+    with pytest.raises(httpx.HTTPStatusError):
+        asyncio.run(ai_batch._run_limited(call))
+    
+    # One upstream request per _run_limited attempt, and every 429 reached the semaphore
+    assert len(attempts) == settings.ai_rate_limit_retries + 1
+    assert semaphore.limit == 1
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("30", 30.0),
+    ("-5", 0.0),
+    ("1m30s", 90.0),
+    ("250ms", 0.25),
+    ("1h", 3600.0),
+    ("6m0.5s", 360.5),
+    ("Wed, 21 Oct 2015 07:28:00 GMT", 0.0),
+    ("soon", None),
+    ("1m soon", None),
+    ("", None),
+    (None, None),
+])
+def test_parse_wait_seconds(value, expected):
+    assert parse_wait_seconds(value) == expected
+
+
+def test_parse_wait_seconds_treats_large_values_as_epoch():
+    assert 55 < parse_wait_seconds(str(time.time() + 60)) <= 60
+    assert parse_wait_seconds(str(time.time() - 60)) == 0.0
+
+
+def test_bucket_pause_extends_but_never_shortens():
+    bucket = TokenBucket("test", 60)
+    bucket.pause(30, "first")
+    until = bucket.paused_until
+    
+    bucket.pause(5, "shorter")
+    assert bucket.paused_until == until
+    
+    bucket.pause(60, "longer")
+    assert bucket.paused_until > until
+
+
+def test_bucket_follows_rate_limit_headers():
+    bucket = TokenBucket("test", 600)
+    assert bucket.capacity == 100
+    
+    assert bucket.update_from_headers(200, httpx.Headers({"x-ratelimit-remaining": "3"})) is None
+    assert bucket.tokens <= 3
+    assert bucket.paused_until == 0.0
+    
+    bucket.update_from_headers(200, httpx.Headers({"x-ratelimit-remaining-requests": "0", "x-ratelimit-reset-requests": "20s"}))
+    assert 15 < bucket.paused_until - time.monotonic() <= 20
+
+
+def test_bucket_only_pauses_for_retry_after_on_429_and_503():
+    bucket = TokenBucket("test", 0)
+    assert bucket.update_from_headers(200, httpx.Headers({"retry-after": "10"})) == 10
+    assert bucket.paused_until == 0.0
+    
+    assert bucket.update_from_headers(503, httpx.Headers({"retry-after": "10"})) == 10
+    assert bucket.paused_until > time.monotonic()
+
+
+class _Provider:
+    def __init__(self, status_code):
+        self.status_code = status_code
+    
+    async def generate_variants(self, *args, **kwargs):
+        if self.status_code != 200:
+            request = httpx.Request("POST", "https://api.example.test/chat/completions")
+            response = httpx.Response(self.status_code, request=request)
+            raise httpx.HTTPStatusError("failed", request=request, response=response)
+        return ["variant"]
+
+
+def test_router_reports_429_before_failing_over(monkeypatch):
+    semaphore = AdaptiveSemaphore(initial_limit=8)
+    monkeypatch.setattr(ai_batch, "get_ai_semaphore", lambda: semaphore)
+    
+    router = AIRouter([("primary", _Provider(429)), ("backup", _Provider(200))])
+    assert asyncio.run(router.generate_variants("post")) == ["variant"]
+    assert semaphore.limit == 4
+    
+    # 5xx failovers say nothing about our request rate
+    router = AIRouter([("primary", _Provider(503)), ("backup", _Provider(200))])
+    assert asyncio.run(router.generate_variants("post")) == ["variant"]
+    assert semaphore.limit == 4
@@ -0,0 +1,17 @@
+"""Tests for app.utils."""
+from app.utils import content_fingerprint
+
+
+def test_content_fingerprint_is_stable_across_formatting():
+    first = content_fingerprint("Shipping the new release today! #launch 🚀")
+    second = content_fingerprint("  shipping the NEW release   today!  ")
+    
+    assert first == second
+    assert len(first) == 64
+
+
+def test_content_fingerprint_skips_posts_without_text():
+    assert content_fingerprint("") is None
+    assert content_fingerprint(None) is None
+    assert content_fingerprint("#hiring #python") is None
+    assert content_fingerprint("🎉🎉 🚀") is None